@@ -1,20 +1,30 @@
 import gradio as gr
+import asyncio
 import os
+import re
 from datetime import datetime, timedelta
 import uuid
 import jwt as pyjwt
 
 
 # Import our authentication modules
-from auth.keygen import generate_key_pair
-from auth.cloud_manager_auth import login_cloud_manager_pat, login_tcm_with_jwt
-from auth.uat_config import create_uat_config
-from auth.tableau_auth import login_tableau_cloud
+from auth.keygen import PRIVATE_KEY_PATH, PUBLIC_KEY_PATH, generate_key_pair, key_pool, SUPPORTED_ALGORITHMS
+from auth.key_rotation import rotation_enabled
+from auth.cloud_manager_auth import login_cloud_manager_pat_async, login_tcm_with_jwt_async
+from auth.uat_config import upsert_uat_config_async
+from auth.uat_provisioning import load_manifest, provision_uat_configs
+from testing.bulk_revoke import aiter_bulk_revoke, resolve_targets
+from auth.tableau_auth import login_tableau_cloud_async
+
+from utils.transport import async_transport
+from utils.helpers import SUMMARY_TYPES, config_summary_page
+from utils.rendering import PAGE_SIZE, new_view
 
 # Import managers modules
 from managers.site_manager import SiteManager
 from managers.resource_managers import ResourceManager
 from managers.scope_manager import ScopeManager
+from managers.luid_import import import_luids
 
 # Create instances
 site_manager = SiteManager()
@@ -25,6 +35,10 @@ datasource_manager = ResourceManager('datasource')
 flow_manager = ResourceManager('flow')
 scope_manager = ScopeManager()
 
+# Rows-per-page choices for the summary; each session's summary view starts at the dropdown's value
+SUMMARY_PAGE_SIZES = [25, 50, 100, 250]
+SUMMARY_DEFAULT_PAGE_SIZE = PAGE_SIZE if PAGE_SIZE in SUMMARY_PAGE_SIZES else 50
+
 def create_uat_config_tool():
     
     with gr.Blocks(title="Tableau UAT Configuration Tool", analytics_enabled=False) as app:
@@ -91,6 +105,10 @@ def create_uat_config_tool():
                         
                         # Display sites
                         gr.Markdown("##### 📋 Configured Sites")
+                        with gr.Row():
+                            sites_filter = gr.Textbox(label="Filter", placeholder="Site ID, LUID or scope (Enter to apply)", scale=3)
+                            sites_page = gr.Number(label="Page", value=1, minimum=1, precision=0, scale=1)
+                        sites_view_state = gr.State(new_view())
                         sites_display = gr.HTML(
                             value="<div style='padding: 15px; background: #f8f9fa; border-radius: 8px; border: 2px dashed #dee2e6; text-align: center; color: #6c757d; font-style: italic;'>No sites configured yet</div>"
                         )
@@ -118,6 +136,13 @@ def create_uat_config_tool():
                             info="How long the JWT token will be valid"
                         )
                         
+                        jwt_algorithm = gr.Dropdown(
+                            label="Signing Algorithm",
+                            choices=SUPPORTED_ALGORITHMS,
+                            value="RS256",
+                            info="RS256 uses an RSA-2048 key; ES256 (ECDSA P-256) keys are faster to generate and sign with"
+                        )
+                        
                         gr.Markdown("#### 🎯 Resource Access Control")
                         gr.Markdown(
                             "<small style='color: #6c757d;'>Configure which resources the token can access. Resource IDs (LUIDs) will be added to UAT config, and corresponding scopes will be added to JWT.</small>"
@@ -182,6 +207,10 @@ def create_uat_config_tool():
                                 add_project_btn = gr.Button("➕ Add Project", variant="primary", size="sm", visible=False)
                                 clear_projects_btn = gr.Button("🗑️ Clear All", variant="secondary", size="sm", visible=False)
                             
+                            with gr.Row(visible=False) as projects_view:
+                                projects_filter = gr.Textbox(label="Filter", placeholder="LUID or scope (Enter to apply)", scale=3)
+                                projects_page = gr.Number(label="Page", value=1, minimum=1, precision=0, scale=1)
+                            projects_view_state = gr.State(new_view())
                             projects_display = gr.HTML(project_manager.get_display(), visible=False)
                             project_selector = gr.Radio(choices=[], label="Select to delete", visible=False, show_label=False)
                             delete_project_btn = gr.Button("🗑️ Delete Selected", variant="stop", size="sm", visible=False)
@@ -213,6 +242,10 @@ def create_uat_config_tool():
                                 add_workbook_btn = gr.Button("➕ Add Workbook", variant="primary", size="sm", visible=False)
                                 clear_workbooks_btn = gr.Button("🗑️ Clear All", variant="secondary", size="sm", visible=False)
                             
+                            with gr.Row(visible=False) as workbooks_view:
+                                workbooks_filter = gr.Textbox(label="Filter", placeholder="LUID or scope (Enter to apply)", scale=3)
+                                workbooks_page = gr.Number(label="Page", value=1, minimum=1, precision=0, scale=1)
+                            workbooks_view_state = gr.State(new_view())
                             workbooks_display = gr.HTML(workbook_manager.get_display(), visible=False)
                             workbook_selector = gr.Radio(choices=[], label="Select to delete", visible=False, show_label=False)
                             delete_workbook_btn = gr.Button("🗑️ Delete Selected", variant="stop", size="sm", visible=False)
@@ -244,6 +277,10 @@ def create_uat_config_tool():
                                 add_datasource_btn = gr.Button("➕ Add Datasource", variant="primary", size="sm", visible=False)
                                 clear_datasources_btn = gr.Button("🗑️ Clear All", variant="secondary", size="sm", visible=False)
                             
+                            with gr.Row(visible=False) as datasources_view:
+                                datasources_filter = gr.Textbox(label="Filter", placeholder="LUID or scope (Enter to apply)", scale=3)
+                                datasources_page = gr.Number(label="Page", value=1, minimum=1, precision=0, scale=1)
+                            datasources_view_state = gr.State(new_view())
                             datasources_display = gr.HTML(datasource_manager.get_display(), visible=False)
                             datasource_selector = gr.Radio(choices=[], label="Select to delete", visible=False, show_label=False)
                             delete_datasource_btn = gr.Button("🗑️ Delete Selected", variant="stop", size="sm", visible=False)
@@ -275,12 +312,37 @@ def create_uat_config_tool():
                                 add_flow_btn = gr.Button("➕ Add Flow", variant="primary", size="sm", visible=False)
                                 clear_flows_btn = gr.Button("🗑️ Clear All", variant="secondary", size="sm", visible=False)
                             
+                            with gr.Row(visible=False) as flows_view:
+                                flows_filter = gr.Textbox(label="Filter", placeholder="LUID or scope (Enter to apply)", scale=3)
+                                flows_page = gr.Number(label="Page", value=1, minimum=1, precision=0, scale=1)
+                            flows_view_state = gr.State(new_view())
                             flows_display = gr.HTML(flow_manager.get_display(), visible=False)
                             flow_selector = gr.Radio(choices=[], label="Select to delete", visible=False, show_label=False)
                             delete_flow_btn = gr.Button("🗑️ Delete Selected", variant="stop", size="sm", visible=False)
                         
+                        # Bulk LUID import
+                        with gr.Group():
+                            gr.Markdown("##### 📥 Bulk Import LUIDs")
+                            gr.Markdown(
+                                "<small style='color: #6c757d;'>CSV or JSON rows of type (site, project, workbook, datasource, flow), luid, scope and site_id (required for sites). An empty scope defaults to read.</small>"
+                            )
+                            luid_import_file = gr.File(label="LUID file", file_types=[".csv", ".json"])
+                            luid_import_btn = gr.Button("📥 Import LUIDs", variant="primary", size="sm")
+                            luid_import_output = gr.JSON(label="Import Report", visible=False)
+                        
                         gr.Markdown("---")
                         gr.Markdown("#### 📋 Current Configuration Summary")
+                        with gr.Row():
+                            summary_filter = gr.Textbox(label="Filter", placeholder="Identifier, LUID or scope (Enter to apply)", scale=3)
+                            summary_type = gr.Dropdown(
+                                label="Type",
+                                choices=["All"] + [key.title() for key, _, _ in SUMMARY_TYPES],
+                                value="All",
+                                scale=1
+                            )
+                            summary_page_size = gr.Dropdown(label="Rows per page", choices=SUMMARY_PAGE_SIZES, value=SUMMARY_DEFAULT_PAGE_SIZE, scale=1)
+                            summary_page = gr.Number(label="Page", value=1, minimum=1, precision=0, scale=1)
+                        summary_view_state = gr.State({"page": 1, "page_size": SUMMARY_DEFAULT_PAGE_SIZE, "query": "", "type_filter": None})
                         config_summary = gr.HTML(
                             value="<div style='padding: 15px; background: #f8f9fa; border-radius: 8px;'><em>Enable resources above to see configuration summary</em></div>"
                         )
@@ -373,6 +435,12 @@ def create_uat_config_tool():
                     visible=True, 
                     open=True
                 )
+
+                # The list is rendered one page at a time from the local mirror
+                with gr.Row():
+                    prev_configs_btn = gr.Button("◀ Previous", size="sm")
+                    configs_page = gr.Number(label="Page", value=1, minimum=1, precision=0)
+                    next_configs_btn = gr.Button("Next ▶", size="sm")
                 
                 with gr.Accordion("📋 cURL Command", open=False):
                     configs_curl = gr.Code(
@@ -383,6 +451,22 @@ def create_uat_config_tool():
                         value="Click 'List All UAT Configurations' to see the cURL command"
                     )
                 
+                # Indexed search over the mirrored configurations
+                with gr.Row():
+                    config_search_value = gr.Textbox(
+                        label="🔎 Find configurations",
+                        placeholder="Issuer, resource LUID, scope, public key PEM / SHA-256 fingerprint or kid",
+                        scale=4
+                    )
+                    config_search_field = gr.Dropdown(
+                        choices=["any", "issuer", "resourceId", "scope", "keyFingerprint", "kid"],
+                        value="any",
+                        label="Field",
+                        scale=1
+                    )
+                config_search_btn = gr.Button("🔎 Search", size="sm")
+                config_search_output = gr.JSON(label="Search Results")
+
                 # Configuration selector for revocation
                 gr.Markdown("##### 🗑️ Revoke Configuration")
                 gr.Markdown(
@@ -417,86 +501,158 @@ def create_uat_config_tool():
                         value=""
                     )
 
+                # Bulk revocation by IDs or filter
+                gr.Markdown("##### 🧹 Bulk Revoke")
+                gr.Markdown(
+                    "<small style='color: #6c757d;'>Revoke many configurations at once, by ID list and/or filter. "
+                    "Keep 'Dry run' checked to preview what would be revoked.</small>"
+                )
+                with gr.Row():
+                    bulk_revoke_ids = gr.Textbox(label="Configuration IDs", placeholder="id1, id2 ... (optional)", lines=2)
+                    with gr.Column():
+                        bulk_revoke_prefix = gr.Textbox(label="Name prefix", placeholder="e.g. test-")
+                        bulk_revoke_issuer = gr.Textbox(label="Issuer")
+                        bulk_revoke_before = gr.Textbox(label="Created before", placeholder="YYYY-MM-DD")
+                with gr.Row():
+                    bulk_revoke_workers = gr.Slider(minimum=1, maximum=16, value=4, step=1, label="Parallel requests")
+                    bulk_revoke_dry_run = gr.Checkbox(label="Dry run", value=True)
+                bulk_revoke_btn = gr.Button("🧹 Revoke Matching Configurations", variant="stop")
+                bulk_revoke_output = gr.JSON(label="Bulk Revoke Results")
+
+                gr.Markdown("---")
+
+                # Bulk provisioning from a manifest
+                gr.Markdown("## 📦 Bulk Provisioning")
+                gr.Markdown(
+                    "<small style='color: #6c757d;'>Upload a YAML or JSON manifest (name, issuer, public_key / public_key_path, resource_ids, scopes). "
+                    "Existing configurations (409) are reported and skipped.</small>"
+                )
+                with gr.Row():
+                    manifest_file = gr.File(label="Manifest", file_types=[".yaml", ".yml", ".json"])
+                    bulk_workers = gr.Slider(minimum=1, maximum=16, value=4, step=1, label="Parallel requests")
+                    bulk_upsert = gr.Checkbox(label="Update existing configurations (upsert)", value=True)
+                bulk_provision_btn = gr.Button("📦 Provision Configurations", variant="primary")
+                bulk_output = gr.JSON(label="Provisioning Report")
+
         # --- EVENT HANDLER FUNCTIONS ---
+        # Page / filter state lives in each session's gr.State (the managers only hold the data),
+        # so one user's paging or filtering never moves another user's view.
         
-        def add_site_handler(site_id, site_luid, site_scope):
-            """Handle adding a site"""
-            sites_display, site_choices, status_msg = site_manager.add_site(site_id, site_luid, site_scope)
-            selector_visible = bool(site_manager.sites)
-            
-            return (
-                sites_display,
-                gr.Radio(choices=site_choices, visible=selector_visible, show_label=False),
-                gr.Button(visible=selector_visible),
-                status_msg,
-                generate_config_summary()
+        def summary_outputs(summary_view):
+            """The visible page of the configuration summary, its Page number and the updated summary view"""
+            html, page = config_summary_page(
+                site_manager, tenant_manager, project_manager, workbook_manager, datasource_manager, flow_manager,
+                **summary_view
             )
+            return html, gr.Number(value=page), {**summary_view, "page": page}
+        
+        def panel_outputs(manager, result, view=None):
+            """Display, delete selector, delete button and status after a change; plus the Page number and view when paged"""
+            display, choices, status = result
+            visible = bool(manager)
+            outputs = (display, gr.Radio(choices=choices, visible=visible, show_label=False), gr.Button(visible=visible), status)
+            if view is None:
+                return outputs
+            view = manager.shown_view(view)  # stay on the last page when rows go away
+            return (*outputs, gr.Number(value=view["page"]), view)
+        
+        def add_site_handler(site_id, site_luid, site_scope, view, summary_view):
+            """Handle adding a site"""
+            result = site_manager.add_site(site_id, site_luid, site_scope, view)
+            return (*panel_outputs(site_manager, result, view), *summary_outputs(summary_view))
         
-        def delete_site_handler(selected_site):
+        def delete_site_handler(selected_site, view, summary_view):
             """Handle deleting a site"""
-            sites_display, site_choices, status_msg = site_manager.delete_site(selected_site)
-            selector_visible = bool(site_manager.sites)
-            
-            return (
-                sites_display,
-                gr.Radio(choices=site_choices, visible=selector_visible, show_label=False),
-                gr.Button(visible=selector_visible),
-                status_msg,
-                generate_config_summary()
-            )
+            result = site_manager.delete_site(selected_site, view)
+            return (*panel_outputs(site_manager, result, view), *summary_outputs(summary_view))
         
-        def clear_sites_handler():
+        def clear_sites_handler(view, summary_view):
             """Handle clearing all sites"""
-            sites_display, site_choices, status_msg = site_manager.clear_sites()
-            
-            return (
-                sites_display,
-                gr.Radio(choices=[], visible=False, show_label=False),
-                gr.Button(visible=False),
-                status_msg,
-                generate_config_summary()
-            )
+            result = site_manager.clear_sites(view)
+            return (*panel_outputs(site_manager, result, view), *summary_outputs(summary_view))
         
         # Generic handlers for projects, workbooks, datasources, flows
         def create_add_handler(manager):
-            def handler(luid, scope):
-                display, choices, status = manager.add_resource(luid, scope)
-                visible = bool(manager.resources)
-                return (
-                    display,
-                    gr.Radio(choices=choices, visible=visible, show_label=False),
-                    gr.Button(visible=visible),
-                    status,
-                    generate_config_summary()
-                )
+            def handler(luid, scope, view, summary_view):
+                result = manager.add_resource(luid, scope, view)
+                return (*panel_outputs(manager, result, view), *summary_outputs(summary_view))
             return handler
         
         def create_delete_handler(manager):
-            def handler(selected):
-                display, choices, status = manager.delete_resource(selected)
-                visible = bool(manager.resources)
-                return (
-                    display,
-                    gr.Radio(choices=choices, visible=visible, show_label=False),
-                    gr.Button(visible=visible),
-                    status,
-                    generate_config_summary()
-                )
+            def handler(selected, view, summary_view):
+                result = manager.delete_resource(selected, view)
+                return (*panel_outputs(manager, result, view), *summary_outputs(summary_view))
             return handler
         
         def create_clear_handler(manager):
-            def handler():
-                display, choices, status = manager.clear_resources()
+            def handler(view, summary_view):
+                result = manager.clear_resources(view)
+                return (*panel_outputs(manager, result, view), *summary_outputs(summary_view))
+            return handler
+        
+        def create_toggle_handler(manager):
+            """Show/hide a resource section; its display is re-rendered for this session's view"""
+            def handler(enable, view, summary_view):
+                view = manager.shown_view(view)
                 return (
-                    display,
-                    gr.Radio(choices=[], visible=False, show_label=False),
-                    gr.Button(visible=False),
-                    status,
-                    generate_config_summary()
+                    gr.Textbox(visible=enable),  # LUID input
+                    gr.Dropdown(visible=enable),  # Scope dropdown
+                    gr.Button(visible=enable),    # Add button
+                    gr.Button(visible=enable),    # Clear button
+                    gr.HTML(value=manager.get_display(view), visible=enable),  # Display
+                    gr.Row(visible=enable),       # Filter / page controls
+                    gr.Number(value=view["page"]),
+                    view,
+                    *summary_outputs(summary_view)
                 )
             return handler
         
-        def toggle_tenant_inputs(enable, tenant_id):
+        def handle_luid_import(import_file, sites_view, projects_view, workbooks_view, datasources_view, flows_view,
+                               summary_view, projects_on, workbooks_on, datasources_on, flows_on):
+            """Import site and resource LUIDs from a CSV/JSON upload, re-rendering each display and the summary once"""
+            # Enabled state of each section (None = the sites section, which has no toggle)
+            targets = [("site", None), ("project", projects_on), ("workbook", workbooks_on),
+                       ("datasource", datasources_on), ("flow", flows_on)]
+            views = {"site": sites_view, "project": projects_view, "workbook": workbooks_view,
+                     "datasource": datasources_view, "flow": flows_view}
+            if import_file is None:
+                report, updates = {"error": "Upload a CSV or JSON file first"}, {}
+            else:
+                try:
+                    report, updates = import_luids(
+                        import_file.name if hasattr(import_file, "name") else import_file,
+                        {"project": project_manager, "workbook": workbook_manager,
+                         "datasource": datasource_manager, "flow": flow_manager},
+                        site_manager,
+                        views
+                    )
+                except ValueError as e:
+                    report, updates = {"error": str(e)}, {}
+            
+            outputs = []
+            turned_on = False
+            for row_type, enabled in targets:
+                # Turning a section on fires its checkbox's change handler, which re-renders its display
+                # and the summary itself; a checkbox that is already on must not be set again
+                turn_on = row_type in updates and enabled is False
+                turned_on = turned_on or turn_on
+                if row_type in updates:
+                    display, choices, _ = updates[row_type]
+                    outputs += [gr.skip() if turn_on else display,
+                                gr.Radio(choices=choices, visible=bool(choices), show_label=False),
+                                gr.Button(visible=bool(choices))]
+                else:
+                    outputs += [gr.skip()] * 3
+                if enabled is not None:
+                    outputs.append(gr.Checkbox(value=True) if turn_on else gr.skip())
+            
+            status = report.get("error") or "; ".join(result[2] for result in updates.values()) or "Nothing imported"
+            if report.get("rejected"):
+                status += f"; {len(report['rejected'])} row(s) rejected"
+            summary = [gr.skip()] * len(summary_view_outputs) if turned_on else summary_outputs(summary_view)
+            return (*outputs, status, gr.JSON(value=report, visible=True), *summary)
+        
+        def toggle_tenant_inputs(enable, tenant_id, summary_view):
             """Show/hide tenant inputs and populate tenant LUID"""
             return (
                 gr.Textbox(value=tenant_id, visible=enable),
@@ -504,358 +660,178 @@ def create_uat_config_tool():
                 gr.Button(visible=enable),    # Add button
                 gr.Button(visible=enable),    # Clear button
                 gr.HTML(visible=enable),      # Display
-                generate_config_summary()
+                *summary_outputs(summary_view)
             )
         
-        def add_tenant_handler(tenant_luid, tenant_scope_val):
+        def add_tenant_handler(tenant_luid, tenant_scope_val, summary_view):
             """Handle adding tenant scope"""
-            display, choices, status = tenant_manager.add_resource(tenant_luid, tenant_scope_val)
-            visible = bool(tenant_manager.resources)
-            return (
-                display,
-                gr.Radio(choices=choices, visible=visible, show_label=False),
-                gr.Button(visible=visible),
-                status,
-                generate_config_summary()
-            )
+            result = tenant_manager.add_resource(tenant_luid, tenant_scope_val)
+            return (*panel_outputs(tenant_manager, result), *summary_outputs(summary_view))
         
-        def delete_tenant_handler(selected):
+        def delete_tenant_handler(selected, summary_view):
             """Handle deleting tenant scope"""
-            display, choices, status = tenant_manager.delete_resource(selected)
-            visible = bool(tenant_manager.resources)
-            return (
-                display,
-                gr.Radio(choices=choices, visible=visible, show_label=False),
-                gr.Button(visible=visible),
-                status,
-                generate_config_summary()
-            )
+            result = tenant_manager.delete_resource(selected)
+            return (*panel_outputs(tenant_manager, result), *summary_outputs(summary_view))
         
-        def clear_tenants_handler():
+        def clear_tenants_handler(summary_view):
             """Handle clearing all tenant scopes"""
-            display, choices, status = tenant_manager.clear_resources()
-            return (
-                display,
-                gr.Radio(choices=[], visible=False, show_label=False),
-                gr.Button(visible=False),
-                status,
-                generate_config_summary()
-            )
+            result = tenant_manager.clear_resources()
+            return (*panel_outputs(tenant_manager, result), *summary_outputs(summary_view))
         
-        def toggle_projects_inputs(enable):
-            """Show/hide project inputs"""
-            return (
-                gr.Textbox(visible=enable),  # LUID input
-                gr.Dropdown(visible=enable),  # Scope dropdown
-                gr.Button(visible=enable),    # Add button
-                gr.Button(visible=enable),    # Clear button
-                gr.HTML(visible=enable),      # Display
-                generate_config_summary()
-            )
+        def summary_view_handler(query, type_label, page_size, page, summary_view):
+            """Apply the summary filter / type / page size / page"""
+            query = (query or "").strip()
+            type_filter = None if type_label in (None, "All") else type_label.lower()
+            if query != summary_view["query"] or type_filter != summary_view["type_filter"] or page_size != summary_view["page_size"]:
+                page = 1
+            return summary_outputs({"page": int(page or 1), "page_size": page_size, "query": query, "type_filter": type_filter})
         
-        def toggle_workbooks_inputs(enable):
-            """Show/hide workbook inputs"""
-            return (
-                gr.Textbox(visible=enable),  # LUID input
-                gr.Dropdown(visible=enable),  # Scope dropdown
-                gr.Button(visible=enable),    # Add button
-                gr.Button(visible=enable),    # Clear button
-                gr.HTML(visible=enable),      # Display
-                generate_config_summary()
-            )
-        
-        def toggle_datasources_inputs(enable):
-            """Show/hide datasource inputs"""
-            return (
-                gr.Textbox(visible=enable),  # LUID input
-                gr.Dropdown(visible=enable),  # Scope dropdown
-                gr.Button(visible=enable),    # Add button
-                gr.Button(visible=enable),    # Clear button
-                gr.HTML(visible=enable),      # Display
-                generate_config_summary()
-            )
-        
-        def toggle_flows_inputs(enable):
-            """Show/hide flow inputs"""
-            return (
-                gr.Textbox(visible=enable),  # LUID input
-                gr.Dropdown(visible=enable),  # Scope dropdown
-                gr.Button(visible=enable),    # Add button
-                gr.Button(visible=enable),    # Clear button
-                gr.HTML(visible=enable),      # Display
-                generate_config_summary()
-            )
-        
-        def generate_config_summary():
-            """Generate a summary table of the current configuration"""
-            
-            # Collect all resources
-            all_resources = []
-            
-            # Add tenants from tenant manager
-            for tenant in tenant_manager.resources:
-                all_resources.append({
-                    "type": "🏢 Tenant",
-                    "identifier": "Tenant",
-                    "luid": tenant['luid'],
-                    "scope": tenant['scope']
-                })
-            
-            # Add sites
-            for site in site_manager.sites:
-                all_resources.append({
-                    "type": "🌐 Site",
-                    "identifier": site['site_id'],
-                    "luid": site['site_luid'],
-                    "scope": site['scope']
-                })
-            
-            # Add projects
-            for project in project_manager.resources:
-                all_resources.append({
-                    "type": "📁 Project",
-                    "identifier": "Project",
-                    "luid": project['luid'],
-                    "scope": project['scope']
-                })
-            
-            # Add workbooks
-            for workbook in workbook_manager.resources:
-                all_resources.append({
-                    "type": "📊 Workbook",
-                    "identifier": "Workbook",
-                    "luid": workbook['luid'],
-                    "scope": workbook['scope']
-                })
-            
-            # Add datasources
-            for datasource in datasource_manager.resources:
-                all_resources.append({
-                    "type": "🗄️ Datasource",
-                    "identifier": "Datasource",
-                    "luid": datasource['luid'],
-                    "scope": datasource['scope']
-                })
-            
-            # Add flows
-            for flow in flow_manager.resources:
-                all_resources.append({
-                    "type": "🔄 Flow",
-                    "identifier": "Flow",
-                    "luid": flow['luid'],
-                    "scope": flow['scope']
-                })
-            
-            if not all_resources:
-                return """
-                <div style='padding: 20px; background: #f8f9fa; border-radius: 8px; border: 2px dashed #dee2e6; text-align: center;'>
-                    <em style='color: #6c757d;'>No resources configured yet. Add resources above to see the configuration summary.</em>
-                </div>
-                """
-            
-            # Create table
-            html = """
-            <div style='padding: 15px; background: #f8f9fa; border-radius: 8px; border: 1px solid #dee2e6;'>
-                <div style='display: flex; align-items: center; margin-bottom: 15px;'>
-                    <strong style='color: #0d6efd; font-size: 1.1em;'>📋 Configuration Summary</strong>
-                    <span style='margin-left: auto; color: #6c757d; font-size: 0.9em;'>Total: """ + str(len(all_resources)) + """ resource(s)</span>
-                </div>
-                <div style='overflow-x: auto;'>
-                    <table style='width: 100%; border-collapse: collapse; background: white; border-radius: 6px; overflow: hidden;'>
-                        <thead>
-                            <tr style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white;'>
-                                <th style='padding: 12px; text-align: left; font-weight: 600; border-bottom: 2px solid #5a67d8;'>Type</th>
-                                <th style='padding: 12px; text-align: left; font-weight: 600; border-bottom: 2px solid #5a67d8;'>Identifier</th>
-                                <th style='padding: 12px; text-align: left; font-weight: 600; border-bottom: 2px solid #5a67d8;'>LUID (Resource ID)</th>
-                                <th style='padding: 12px; text-align: left; font-weight: 600; border-bottom: 2px solid #5a67d8;'>JWT Scope</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-            """
-            
-            for idx, res in enumerate(all_resources):
-                bg_color = '#ffffff' if idx % 2 == 0 else '#f8f9fa'
-                html += f"""
-                <tr style='background: {bg_color}; transition: background 0.2s;' 
-                    onmouseover="this.style.backgroundColor='#e7f1ff'" 
-                    onmouseout="this.style.backgroundColor='{bg_color}'">
-                    <td style='padding: 12px; border-bottom: 1px solid #e9ecef;'>
-                        <strong>{res['type']}</strong>
-                    </td>
-                    <td style='padding: 12px; border-bottom: 1px solid #e9ecef; color: #495057;'>
-                        {res['identifier']}
-                    </td>
-                    <td style='padding: 12px; border-bottom: 1px solid #e9ecef; font-family: monospace; font-size: 0.85em; color: #6c757d;'>
-                        {res['luid']}
-                    </td>
-                    <td style='padding: 12px; border-bottom: 1px solid #e9ecef;'>
-                        <span style='background: #e7f1ff; padding: 4px 8px; border-radius: 4px; font-size: 0.85em; color: #0d6efd;'>
-                            {res['scope']}
-                        </span>
-                    </td>
-                </tr>
-                """
-            
-            html += """
-                        </tbody>
-                    </table>
-                </div>
-            </div>
-            """
-            
-            return html
+        def create_view_handler(manager):
+            """Filter / page handler for a site or resource display: ships only the visible page"""
+            def handler(query, page, view):
+                display, choices, view = manager.set_view(view, page=page, query=query)
+                visible = bool(manager)
+                return (
+                    display,
+                    gr.Radio(choices=choices, visible=visible, show_label=False),
+                    gr.Number(value=view["page"]),
+                    view
+                )
+            return handler
 
         # --- EVENT HANDLERS ---
         from testing.api_testing import(
              update_curl_commands, 
-             test_tcm_connection, 
-             test_tableau_connection,
-             list_uat_configurations,
-             revoke_uat_configuration
+             test_tcm_connection_async, 
+             test_tableau_connection_async,
+             list_uat_configurations_mirrored,
+             uat_configurations_page,
+             search_uat_configurations,
+             revoke_uat_configuration_async
         )
 
         # Site management
+        site_outputs = [sites_display, site_selector, delete_site_btn, status_output, sites_page, sites_view_state]
+        summary_view_outputs = [config_summary, summary_page, summary_view_state]
         add_site_btn.click(
             fn=add_site_handler,
-            inputs=[site_id_input, site_luid_input, site_scope_input],
-            outputs=[sites_display, site_selector, delete_site_btn, status_output, config_summary]
+            inputs=[site_id_input, site_luid_input, site_scope_input, sites_view_state, summary_view_state],
+            outputs=site_outputs + summary_view_outputs
         )
         
         delete_site_btn.click(
             fn=delete_site_handler,
-            inputs=[site_selector],
-            outputs=[sites_display, site_selector, delete_site_btn, status_output, config_summary]
+            inputs=[site_selector, sites_view_state, summary_view_state],
+            outputs=site_outputs + summary_view_outputs
         )
         
         clear_sites_btn.click(
             fn=clear_sites_handler,
-            outputs=[sites_display, site_selector, delete_site_btn, status_output, config_summary]
+            inputs=[sites_view_state, summary_view_state],
+            outputs=site_outputs + summary_view_outputs
+        )
+        
+        for view_filter, view_page, view_state, manager, display, selector in [
+            (sites_filter, sites_page, sites_view_state, site_manager, sites_display, site_selector),
+            (projects_filter, projects_page, projects_view_state, project_manager, projects_display, project_selector),
+            (workbooks_filter, workbooks_page, workbooks_view_state, workbook_manager, workbooks_display, workbook_selector),
+            (datasources_filter, datasources_page, datasources_view_state, datasource_manager, datasources_display, datasource_selector),
+            (flows_filter, flows_page, flows_view_state, flow_manager, flows_display, flow_selector),
+        ]:
+            view_handler = create_view_handler(manager)
+            view_inputs = [view_filter, view_page, view_state]
+            view_outputs = [display, selector, view_page, view_state]
+            view_filter.submit(fn=view_handler, inputs=view_inputs, outputs=view_outputs)
+            view_page.input(fn=view_handler, inputs=view_inputs, outputs=view_outputs)
+        
+        summary_inputs = [summary_filter, summary_type, summary_page_size, summary_page, summary_view_state]
+        summary_filter.submit(fn=summary_view_handler, inputs=summary_inputs, outputs=summary_view_outputs)
+        summary_type.input(fn=summary_view_handler, inputs=summary_inputs, outputs=summary_view_outputs)
+        summary_page_size.input(fn=summary_view_handler, inputs=summary_inputs, outputs=summary_view_outputs)
+        summary_page.input(fn=summary_view_handler, inputs=summary_inputs, outputs=summary_view_outputs)
+        
+        luid_import_btn.click(
+            fn=handle_luid_import,
+            inputs=[luid_import_file, sites_view_state, projects_view_state, workbooks_view_state,
+                    datasources_view_state, flows_view_state, summary_view_state,
+                    enable_projects, enable_workbooks, enable_datasources, enable_flows],
+            outputs=[
+                sites_display, site_selector, delete_site_btn,
+                projects_display, project_selector, delete_project_btn, enable_projects,
+                workbooks_display, workbook_selector, delete_workbook_btn, enable_workbooks,
+                datasources_display, datasource_selector, delete_datasource_btn, enable_datasources,
+                flows_display, flow_selector, delete_flow_btn, enable_flows,
+                status_output, luid_import_output, *summary_view_outputs
+            ]
         )
         
         # Tenant management
+        tenant_outputs = [tenants_display, tenant_selector, delete_tenant_btn, status_output]
         enable_tenant.change(
             fn=toggle_tenant_inputs,
-            inputs=[enable_tenant, cm_tenant_id],
-            outputs=[tenant_luid_display, tenant_scope, add_tenant_btn, clear_tenants_btn, tenants_display, config_summary]
+            inputs=[enable_tenant, cm_tenant_id, summary_view_state],
+            outputs=[tenant_luid_display, tenant_scope, add_tenant_btn, clear_tenants_btn, tenants_display, *summary_view_outputs]
         )
         
         add_tenant_btn.click(
             fn=add_tenant_handler,
-            inputs=[tenant_luid_display, tenant_scope],
-            outputs=[tenants_display, tenant_selector, delete_tenant_btn, status_output, config_summary]
+            inputs=[tenant_luid_display, tenant_scope, summary_view_state],
+            outputs=tenant_outputs + summary_view_outputs
         )
         
         delete_tenant_btn.click(
             fn=delete_tenant_handler,
-            inputs=[tenant_selector],
-            outputs=[tenants_display, tenant_selector, delete_tenant_btn, status_output, config_summary]
+            inputs=[tenant_selector, summary_view_state],
+            outputs=tenant_outputs + summary_view_outputs
         )
         
         clear_tenants_btn.click(
             fn=clear_tenants_handler,
-            outputs=[tenants_display, tenant_selector, delete_tenant_btn, status_output, config_summary]
-        )
-        
-        # Project management
-        enable_projects.change(
-            fn=toggle_projects_inputs,
-            inputs=[enable_projects],
-            outputs=[project_luid, project_scope, add_project_btn, clear_projects_btn, projects_display, config_summary]
-        )
-        
-        add_project_btn.click(
-            fn=create_add_handler(project_manager),
-            inputs=[project_luid, project_scope],
-            outputs=[projects_display, project_selector, delete_project_btn, status_output, config_summary]
-        )
-        
-        delete_project_btn.click(
-            fn=create_delete_handler(project_manager),
-            inputs=[project_selector],
-            outputs=[projects_display, project_selector, delete_project_btn, status_output, config_summary]
-        )
-        
-        clear_projects_btn.click(
-            fn=create_clear_handler(project_manager),
-            outputs=[projects_display, project_selector, delete_project_btn, status_output, config_summary]
-        )
-        
-        # Workbook management
-        enable_workbooks.change(
-            fn=toggle_workbooks_inputs,
-            inputs=[enable_workbooks],
-            outputs=[workbook_luid, workbook_scope, add_workbook_btn, clear_workbooks_btn, workbooks_display, config_summary]
-        )
-        
-        add_workbook_btn.click(
-            fn=create_add_handler(workbook_manager),
-            inputs=[workbook_luid, workbook_scope],
-            outputs=[workbooks_display, workbook_selector, delete_workbook_btn, status_output, config_summary]
-        )
-        
-        delete_workbook_btn.click(
-            fn=create_delete_handler(workbook_manager),
-            inputs=[workbook_selector],
-            outputs=[workbooks_display, workbook_selector, delete_workbook_btn, status_output, config_summary]
-        )
-        
-        clear_workbooks_btn.click(
-            fn=create_clear_handler(workbook_manager),
-            outputs=[workbooks_display, workbook_selector, delete_workbook_btn, status_output, config_summary]
-        )
-        
-        # Datasource management
-        enable_datasources.change(
-            fn=toggle_datasources_inputs,
-            inputs=[enable_datasources],
-            outputs=[datasource_luid, datasource_scope, add_datasource_btn, clear_datasources_btn, datasources_display, config_summary]
-        )
-        
-        add_datasource_btn.click(
-            fn=create_add_handler(datasource_manager),
-            inputs=[datasource_luid, datasource_scope],
-            outputs=[datasources_display, datasource_selector, delete_datasource_btn, status_output, config_summary]
-        )
-        
-        delete_datasource_btn.click(
-            fn=create_delete_handler(datasource_manager),
-            inputs=[datasource_selector],
-            outputs=[datasources_display, datasource_selector, delete_datasource_btn, status_output, config_summary]
+            inputs=[summary_view_state],
+            outputs=tenant_outputs + summary_view_outputs
         )
         
-        clear_datasources_btn.click(
-            fn=create_clear_handler(datasource_manager),
-            outputs=[datasources_display, datasource_selector, delete_datasource_btn, status_output, config_summary]
-        )
-        
-        # Flow management
-        enable_flows.change(
-            fn=toggle_flows_inputs,
-            inputs=[enable_flows],
-            outputs=[flow_luid, flow_scope, add_flow_btn, clear_flows_btn, flows_display, config_summary]
-        )
-        
-        add_flow_btn.click(
-            fn=create_add_handler(flow_manager),
-            inputs=[flow_luid, flow_scope],
-            outputs=[flows_display, flow_selector, delete_flow_btn, status_output, config_summary]
-        )
-        
-        delete_flow_btn.click(
-            fn=create_delete_handler(flow_manager),
-            inputs=[flow_selector],
-            outputs=[flows_display, flow_selector, delete_flow_btn, status_output, config_summary]
-        )
-        
-        clear_flows_btn.click(
-            fn=create_clear_handler(flow_manager),
-            outputs=[flows_display, flow_selector, delete_flow_btn, status_output, config_summary]
-        )
+        # Project, workbook, datasource and flow management
+        for manager, enable, luid_input, scope_input, add_btn, clear_btn, display, view_row, view_page, view_state, selector, delete_btn in [
+            (project_manager, enable_projects, project_luid, project_scope, add_project_btn, clear_projects_btn,
+             projects_display, projects_view, projects_page, projects_view_state, project_selector, delete_project_btn),
+            (workbook_manager, enable_workbooks, workbook_luid, workbook_scope, add_workbook_btn, clear_workbooks_btn,
+             workbooks_display, workbooks_view, workbooks_page, workbooks_view_state, workbook_selector, delete_workbook_btn),
+            (datasource_manager, enable_datasources, datasource_luid, datasource_scope, add_datasource_btn, clear_datasources_btn,
+             datasources_display, datasources_view, datasources_page, datasources_view_state, datasource_selector, delete_datasource_btn),
+            (flow_manager, enable_flows, flow_luid, flow_scope, add_flow_btn, clear_flows_btn,
+             flows_display, flows_view, flows_page, flows_view_state, flow_selector, delete_flow_btn),
+        ]:
+            resource_outputs = [display, selector, delete_btn, status_output, view_page, view_state]
+            enable.change(
+                fn=create_toggle_handler(manager),
+                inputs=[enable, view_state, summary_view_state],
+                outputs=[luid_input, scope_input, add_btn, clear_btn, display, view_row, view_page, view_state,
+                         *summary_view_outputs]
+            )
+            
+            add_btn.click(
+                fn=create_add_handler(manager),
+                inputs=[luid_input, scope_input, view_state, summary_view_state],
+                outputs=resource_outputs + summary_view_outputs
+            )
+            
+            delete_btn.click(
+                fn=create_delete_handler(manager),
+                inputs=[selector, view_state, summary_view_state],
+                outputs=resource_outputs + summary_view_outputs
+            )
+            
+            clear_btn.click(
+                fn=create_clear_handler(manager),
+                inputs=[view_state, summary_view_state],
+                outputs=resource_outputs + summary_view_outputs
+            )
 
             
-        def run_uat_workflow(cm_tenant_id, cm_pat_secret, cm_pat_login_url, cm_jwt_login_url, cm_uat_configs_url,
+        async def run_uat_workflow(cm_tenant_id, cm_pat_secret, cm_pat_login_url, cm_jwt_login_url, cm_uat_configs_url,
                             tc_pod_url, tc_username, 
-                            jwt_issuer, jwt_expiration, uat_config_name):
+                            jwt_issuer, jwt_expiration, uat_config_name, jwt_algorithm="RS256"):
             """
             Run the complete UAT configuration workflow.
             
@@ -925,16 +901,23 @@ def create_uat_config_tool():
             
             try:
                 # Step 1
-                yield "Step 1: Generating RSA key pair...", {**results}, *get_file_components()
-                key_paths = generate_key_pair()
+                if rotation_enabled() and PRIVATE_KEY_PATH.exists():
+                    # The key rotator owns the signing key; replacing it here would leave its active config on a stale key
+                    key_paths = {"private_key_path": str(PRIVATE_KEY_PATH), "public_key_path": str(PUBLIC_KEY_PATH), "rotated": True}
+                    step_message = "✅ Step 1: Key rotation is enabled, so the rotator's current signing key is used (no new key pair)."
+                else:
+                    yield f"Step 1: Generating {jwt_algorithm} key pair...", {**results}, *get_file_components()
+                    # Key generation is CPU-bound; keep it off the event loop
+                    key_paths = await asyncio.to_thread(generate_key_pair, jwt_algorithm)
+                    step_message = f"✅ Step 1: {jwt_algorithm} key pair generated successfully. Download links are available below."
                 private_key_path = key_paths['private_key_path']
                 public_key_path = key_paths['public_key_path']
                 results["key_generation"] = {"status": "success", "paths": key_paths}
-                yield "✅ Step 1: RSA key pair generated successfully. Download links are available below.", results, *get_file_components()
+                yield step_message, results, *get_file_components()
 
                 # Step 2
                 yield "Step 2: Logging into Cloud Manager with PAT...", results, *get_file_components()
-                session_token = login_cloud_manager_pat()
+                session_token = await login_cloud_manager_pat_async()
                 results["pat_login"] = {"status": "success", "token": session_token[:20] + "..."}
                 yield "✅ Step 2: Successfully logged into Cloud Manager with PAT", results, *get_file_components()
                 
@@ -943,14 +926,16 @@ def create_uat_config_tool():
                 
                 # Note: You'll need to update create_uat_config to accept resource_ids
                 # For now, we'll pass the scopes as before, but show resource_ids in results
-                success, uat_result = create_uat_config(session_token, final_scopes, uat_config_name, resource_ids)
+                # Re-running with the same name updates the existing config (only changed fields) instead of a 409
+                success, uat_result = await upsert_uat_config_async(session_token, final_scopes, uat_config_name, resource_ids)
                 
                 # Add resource IDs to the result for visibility
                 uat_result["resource_ids"] = resource_ids
                 results["uat_config"] = uat_result
                 
                 if success:
-                    yield f"✅ Step 3: UAT configuration '{uat_config_name}' created with {len(resource_ids)} resource(s)", results, *get_file_components()
+                    action = uat_result.get("action", "created")
+                    yield f"✅ Step 3: UAT configuration '{uat_config_name}' {action} with {len(resource_ids)} resource(s)", results, *get_file_components()
                 else:
                     error_msg = f"❌ Step 3 Failed: {uat_result.get('message', 'Unknown error')}"
                     results["uat_config"]["error"] = True
@@ -960,15 +945,21 @@ def create_uat_config_tool():
                 # Step 4 - Generate JWT with custom expiration and scopes
                 yield f"Step 4: Generating JWT (valid for {jwt_expiration} minutes, {len(final_scopes)} scope(s))...", results, *get_file_components()
                 
-                from auth.jwt_builder import build_jwt
+                from auth.token_pool import token_pool
 
-                generated_jwt = build_jwt(jwt_issuer, jwt_expiration, cm_tenant_id, tc_username, final_scopes)
+                # The pool mints a fresh token here (the key was just regenerated) and
+                # keeps it refreshed for the Testing tab buttons
+                generated_jwt = await asyncio.to_thread(
+                    token_pool.get_token, jwt_issuer, jwt_expiration, cm_tenant_id, tc_username, final_scopes
+                )
 
                 results["jwt"] = {
                     "status": "success", 
                     "token": generated_jwt,
                     "expiration_minutes": jwt_expiration,
-                    "scopes": final_scopes
+                    "scopes": final_scopes,
+                    # The pool only hands out tokens that passed local signature/claim checks
+                    "local_verification": "passed"
                 }
 
                 yield f"✅ Step 4: JWT generated successfully (expires in {jwt_expiration} minutes)", results, *get_file_components()
@@ -976,7 +967,7 @@ def create_uat_config_tool():
                 
                 # Step 5
                 yield "Step 5: Testing TCM API login with JWT...", results, *get_file_components()
-                tcm_token = login_tcm_with_jwt(jwt_token=generated_jwt)
+                tcm_token = await login_tcm_with_jwt_async(jwt_token=generated_jwt)
                 results["tcm_login"] = {"status": "success", "token": tcm_token[:20] + "..."}
                 results["curl_commands"] = {
                         "tcm": f"curl -X POST '{cm_jwt_login_url}' -H 'Content-Type: application/json' -d '{{\"token\": \"{generated_jwt}\"}}'"
@@ -997,7 +988,8 @@ def create_uat_config_tool():
                 if site_manager.sites:
                     yield "Step 6: Testing Tableau REST API login with JWT...", results, *get_file_components()
                     site_id = site_manager.sites[0]['site_id']
-                    tableau_token = login_tableau_cloud(jwt_token=generated_jwt, site_id=site_id)
+                    # Always sign in with the freshly minted JWT; this replaces (and signs out) any cached session
+                    tableau_token = await login_tableau_cloud_async(jwt_token=generated_jwt, site_id=site_id, force_refresh=True)
                     results["tableau_login"] = {"status": "success", "token": tableau_token[:20] + "..."}
                     results["debug_info"] = {
                     "decoded_payload": pyjwt.decode(generated_jwt, options={"verify_signature": False}),
@@ -1008,6 +1000,9 @@ def create_uat_config_tool():
                     })
                 else:
                     results["tableau_login"] = {"status": "skipped", "message": "No sites configured"}
+                
+                # Connection reuse across the workflow's Cloud Manager / pod calls
+                results["http_transport"] = async_transport.metrics()
                                 
                 yield "✅ Workflow completed successfully! Check the 'Detailed Results' and 'Testing' tabs.", results, *get_file_components()
 
@@ -1020,7 +1015,7 @@ def create_uat_config_tool():
             fn=run_uat_workflow,
             inputs=[cm_tenant_id, cm_pat_secret, cm_pat_login_url, cm_jwt_login_url, cm_uat_configs_url,
                     tc_pod_url, tc_username, 
-                    jwt_issuer, jwt_expiration, uat_config_name],
+                    jwt_issuer, jwt_expiration, uat_config_name, jwt_algorithm],
             outputs=[status_output, result_output, private_key_file, public_key_file]
         ).then(
             fn=update_curl_commands,
@@ -1028,29 +1023,70 @@ def create_uat_config_tool():
             outputs=[tcm_curl, tc_curl]
         )
         
-        test_tcm_btn.click(fn=test_tcm_connection, inputs=[cm_jwt_login_url, result_output], outputs=[test_tcm_output])
-        test_tc_btn.click(fn=test_tableau_connection, inputs=[tc_pod_url, result_output], outputs=[test_tc_output])
+        test_tcm_btn.click(fn=test_tcm_connection_async, inputs=[cm_jwt_login_url, result_output], outputs=[test_tcm_output])
+        test_tc_btn.click(fn=test_tableau_connection_async, inputs=[tc_pod_url, result_output], outputs=[test_tc_output])
         
-        def handle_list_configs(cm_pat_secret, cm_pat_login_url, cm_uat_configs_url):
-            """List configurations and prepare selector"""
-            configs_data, curl_cmd, config_ids = list_uat_configurations(cm_pat_secret, cm_pat_login_url, cm_uat_configs_url)
-            has_configs = len(config_ids) > 0
-            return (
-                configs_data,
-                curl_cmd,
-                gr.Radio(choices=config_ids, visible=has_configs, show_label=True),
-                gr.Button(visible=has_configs)
-            )
+        async def handle_list_configs(cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, page):
+            """List configurations from the local mirror, then again if the refresh changed anything"""
+            async for configs_data, curl_cmd, config_ids in list_uat_configurations_mirrored(
+                cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, page
+            ):
+                has_configs = len(config_ids) > 0
+                yield (
+                    configs_data,
+                    curl_cmd,
+                    gr.Radio(choices=config_ids, visible=has_configs, show_label=True),
+                    gr.Button(visible=has_configs)
+                )
         
         list_configs_btn.click(
             fn=handle_list_configs,
-            inputs=[cm_pat_secret, cm_pat_login_url, cm_uat_configs_url],
+            inputs=[cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, configs_page],
             outputs=[configs_output, configs_curl, config_selector, revoke_config_btn]
         )
+
+        def handle_config_search(cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, value, field):
+            """Look configurations up in the index (run 'List All UAT Configurations' first to fill it)"""
+            return search_uat_configurations(
+                cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, value, None if field == "any" else field
+            )
+
+        config_search_btn.click(
+            fn=handle_config_search,
+            inputs=[cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, config_search_value, config_search_field],
+            outputs=[config_search_output]
+        )
+        config_search_value.submit(
+            fn=handle_config_search,
+            inputs=[cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, config_search_value, config_search_field],
+            outputs=[config_search_output]
+        )
+
+        def create_configs_page_handler(step):
+            def handler(cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, page):
+                """Render another page of the mirrored configurations"""
+                configs_data, config_ids = uat_configurations_page(
+                    cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, int(page or 1) + step
+                )
+                has_configs = len(config_ids) > 0
+                return (
+                    configs_data,
+                    configs_data.get("page", page),
+                    gr.Radio(choices=config_ids, visible=has_configs, show_label=True),
+                    gr.Button(visible=has_configs)
+                )
+            return handler
+
+        for btn, step in ((prev_configs_btn, -1), (next_configs_btn, 1)):
+            btn.click(
+                fn=create_configs_page_handler(step),
+                inputs=[cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, configs_page],
+                outputs=[configs_output, configs_page, config_selector, revoke_config_btn]
+            )
         
-        def handle_revoke(config_id, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url):
+        async def handle_revoke(config_id, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url):
             """Handle configuration revocation"""
-            result, curl_cmd = revoke_uat_configuration(config_id, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url)
+            result, curl_cmd = await revoke_uat_configuration_async(config_id, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url)
             
             return (
                 result,
@@ -1067,9 +1103,81 @@ def create_uat_config_tool():
             outputs=[revoke_output]
         )
 
+        async def handle_bulk_revoke(ids_text, name_prefix, issuer, created_before, max_workers, dry_run,
+                                     cm_pat_secret, cm_pat_login_url, cm_uat_configs_url):
+            """Preview or revoke the matching configurations, streaming each result as it completes"""
+            if not cm_pat_secret or not cm_pat_login_url or not cm_uat_configs_url:
+                yield {"error": "Please configure Cloud Manager settings first"}
+                return
+            config_ids = [c for c in re.split(r"[,\s]+", ids_text or "") if c]
+            try:
+                targets, error = await asyncio.to_thread(
+                    resolve_targets, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url,
+                    config_ids, name_prefix.strip() or None, issuer.strip() or None, created_before.strip() or None
+                )
+            except Exception as e:
+                yield {"error": str(e)}
+                return
+            if error:
+                yield error
+                return
+            if not targets:
+                yield {"message": "No configurations match. Enter IDs or at least one filter."}
+                return
+            if dry_run:
+                yield {"dry_run": True, "total": len(targets), "would_revoke": targets}
+                return
+
+            results = []
+            async for result in aiter_bulk_revoke(
+                [t["config_id"] for t in targets], cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, int(max_workers)
+            ):
+                results.append(result)
+                yield {"progress": f"{len(results)}/{len(targets)}", "results": results}
+            revoked = sum(1 for r in results if r["status"] == "revoked")
+            yield {"total": len(results), "revoked": revoked, "failed": len(results) - revoked, "results": results}
+
+        bulk_revoke_btn.click(
+            fn=handle_bulk_revoke,
+            inputs=[bulk_revoke_ids, bulk_revoke_prefix, bulk_revoke_issuer, bulk_revoke_before,
+                    bulk_revoke_workers, bulk_revoke_dry_run, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url],
+            outputs=[bulk_revoke_output]
+        )
+
+        async def handle_bulk_provision(manifest, max_workers, upsert, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url):
+            """Provision every config in the uploaded manifest"""
+            if manifest is None:
+                return {"error": "Please upload a manifest file"}
+            path = manifest if isinstance(manifest, str) else manifest.name
+            try:
+                items = load_manifest(path)
+            except (ValueError, OSError) as e:
+                return {"error": f"Invalid manifest: {e}"}
+            reports, summary = await asyncio.to_thread(
+                provision_uat_configs, items, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, int(max_workers), upsert
+            )
+            return {"summary": summary, "results": reports}
+
+        bulk_provision_btn.click(
+            fn=handle_bulk_provision,
+            inputs=[manifest_file, bulk_workers, bulk_upsert, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url],
+            outputs=[bulk_output]
+        )
+
     return app
 
 if __name__ == "__main__":
     if not os.path.exists("keys"): os.makedirs("keys")
+    # Keep fresh key pairs ready so Step 1 of the workflow does not wait on RSA keygen
+    key_pool.start()
+    if os.getenv("JWKS_PORT"):
+        # Publish keys/ as a JWKS so verifiers can resolve the kid stamped on each JWT
+        from auth.jwks import start_jwks_server
+        start_jwks_server(port=int(os.getenv("JWKS_PORT")))
+    # Scheduled signing key rotation, enabled by KEY_ROTATION_BASE_NAME
+    from auth.key_rotation import rotator_from_env
+    key_rotator = rotator_from_env()
+    if key_rotator is not None:
+        key_rotator.start(int(os.getenv("KEY_ROTATION_CHECK_SECONDS", "60")))
     app = create_uat_config_tool()
     app.launch(share=False, theme=gr.themes.Soft())
\ No newline at end of file
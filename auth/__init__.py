@@ -1,4 +1,8 @@
 from .cloud_manager_auth import login_cloud_manager_pat, login_tcm_with_jwt
-from .jwt_builder import build_jwt
-from .tableau_auth import login_tableau_cloud
+from .jwks import build_jwks, key_thumbprint, start_jwks_server
+from .jwt_builder import build_jwt, build_jwts, iter_jwts, TokenTemplate
+from .key_cache import load_signing_key, signing_key_cache_info
+from .token_pool import TokenPool, token_pool
+from .verifier import TokenVerifier, token_verifier
+from .tableau_auth import login_tableau_cloud, RestCredentialsCache, rest_credentials
 from .uat_config import create_uat_config
@@ -1,18 +1,158 @@
 # auth/cloud_manager_auth.py
-import requests
+from utils import transport
+from utils.locks import KeyedLocks
+from utils.transport import async_transport
 import os
+import hashlib
+import time
 from dotenv import load_dotenv
 from auth.jwt_builder import build_jwt
 
 load_dotenv(override=True)
 
+
+def _pat_login(login_url, pat_secret):
+    r = transport.post(
+        login_url,
+        json={"token": pat_secret},
+        headers={"Content-Type": "application/json", "Accept": "application/json"}
+    )
+    r.raise_for_status()
+    session_token = r.json().get("sessionToken")
+    if not session_token:
+        raise ValueError("No session token received from Cloud Manager")
+    return session_token
+
+
+async def _pat_login_async(login_url, pat_secret):
+    r = await async_transport.post(
+        login_url,
+        json={"token": pat_secret},
+        headers={"Content-Type": "application/json", "Accept": "application/json"}
+    )
+    r.raise_for_status()
+    session_token = r.json().get("sessionToken")
+    if not session_token:
+        raise ValueError("No session token received from Cloud Manager")
+    return session_token
+
+
+class SessionCache:
+    """
+    Cloud Manager session tokens shared by every caller, keyed by
+    (PAT login URL, SHA-256 of the PAT secret) so the secret itself is never
+    used as a dictionary key. A token is renewed once it is older than
+    renew_fraction of ttl_seconds; a 401 drops it and retries exactly once.
+    """
+    def __init__(self, ttl_seconds=None, renew_fraction=0.8):
+        self.ttl_seconds = ttl_seconds or int(os.getenv("CLOUD_MANAGER_SESSION_TTL_MINUTES", "30")) * 60
+        self.renew_fraction = renew_fraction
+        self._entries = {}  # key -> (session token, obtained at)
+        self._key_locks = KeyedLocks()  # one login per key, across threads and event loops
+        self.logins = 0
+        self.hits = 0
+
+    @staticmethod
+    def _key(login_url, pat_secret):
+        return (login_url, hashlib.sha256((pat_secret or "").encode("utf-8")).hexdigest())
+
+    def _cached(self, key):
+        entry = self._entries.get(key)
+        if entry and time.time() - entry[1] < self.ttl_seconds * self.renew_fraction:
+            self.hits += 1
+            return entry[0]
+        return None
+
+    def _store(self, key, session_token):
+        self.logins += 1
+        self._entries[key] = (session_token, time.time())
+
+    def _stale_token(self, key, force_refresh, stale_token):
+        # The token a forced refresh replaces: the one given, else the one cached now
+        if not force_refresh or stale_token is not None:
+            return stale_token
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def _reusable(self, key, force_refresh, stale_token):
+        # Checked again once the key's lock is held: a caller that held it may have logged in already
+        session_token = self._cached(key)
+        if force_refresh and session_token == stale_token:
+            return None
+        return session_token
+
+    def get_session_token(self, login_url, pat_secret, force_refresh=False, stale_token=None):
+        """
+        Return a cached session token, logging in with the PAT only when needed.
+        force_refresh logs in again unless another caller has already replaced
+        stale_token (default: the token cached when called) while this one waited.
+        """
+        key = self._key(login_url, pat_secret)
+        stale_token = self._stale_token(key, force_refresh, stale_token)
+        # One login per key at a time; concurrent callers wait and reuse its token
+        with self._key_locks.lock(key):
+            session_token = self._reusable(key, force_refresh, stale_token)
+            if session_token is None:
+                session_token = _pat_login(login_url, pat_secret)
+                self._store(key, session_token)
+            return session_token
+
+    async def get_session_token_async(self, login_url, pat_secret, force_refresh=False, stale_token=None):
+        """Async get_session_token; shares the same cached sessions and per-key locks."""
+        key = self._key(login_url, pat_secret)
+        stale_token = self._stale_token(key, force_refresh, stale_token)
+        async with self._key_locks.lock_async(key):
+            session_token = self._reusable(key, force_refresh, stale_token)
+            if session_token is None:
+                session_token = await _pat_login_async(login_url, pat_secret)
+                self._store(key, session_token)
+            return session_token
+
+    def invalidate(self, login_url, pat_secret):
+        """Forget the session for one PAT."""
+        self._entries.pop(self._key(login_url, pat_secret), None)
+
+    def request_with_session(self, login_url, pat_secret, send):
+        """
+        Call send(session_token) -> response. On a 401 the session is dropped and
+        the call is retried once with a fresh login.
+        Returns a tuple: (response, session_token used)
+        """
+        session_token = self.get_session_token(login_url, pat_secret)
+        response = send(session_token)
+        if response.status_code == 401:
+            session_token = self.get_session_token(login_url, pat_secret, force_refresh=True, stale_token=session_token)
+            response = send(session_token)
+        return response, session_token
+
+    async def request_with_session_async(self, login_url, pat_secret, send):
+        """Async request_with_session: await send(session_token), retrying once on a 401."""
+        session_token = await self.get_session_token_async(login_url, pat_secret)
+        response = await send(session_token)
+        if response.status_code == 401:
+            session_token = await self.get_session_token_async(
+                login_url, pat_secret, force_refresh=True, stale_token=session_token
+            )
+            response = await send(session_token)
+        return response, session_token
+
+    def stats(self):
+        """Return cache counters for monitoring."""
+        return {"sessions": len(self._entries), "logins": self.logins, "hits": self.hits}
+
+
+session_cache = SessionCache()
+
+
 def login_cloud_manager_pat():
     url = os.getenv("CLOUD_MANAGER_PAT_LOGIN_URL")
-    body = {"token": os.getenv("CLOUD_MANAGER_PAT_SECRET")}
+    return session_cache.get_session_token(url, os.getenv("CLOUD_MANAGER_PAT_SECRET"))
 
-    r = requests.post(url, json=body)
-    r.raise_for_status()
-    return r.json()["sessionToken"]
+
+async def login_cloud_manager_pat_async():
+    """Async login_cloud_manager_pat."""
+    url = os.getenv("CLOUD_MANAGER_PAT_LOGIN_URL")
+    return await session_cache.get_session_token_async(url, os.getenv("CLOUD_MANAGER_PAT_SECRET"))
 
 
 def login_tcm_with_jwt(jwt_token):
@@ -33,6 +173,19 @@ def login_tcm_with_jwt(jwt_token):
         "Accept": "application/json"
     }
 
-    r = requests.post(url, json=body, headers=headers)
+    r = transport.post(url, json=body, headers=headers)
     r.raise_for_status()
-    return r.json()["sessionToken"]
\ No newline at end of file
+    return r.json()["sessionToken"]
+
+
+async def login_tcm_with_jwt_async(jwt_token):
+    """Async login_tcm_with_jwt."""
+    url = os.getenv("CLOUD_MANAGER_JWT_LOGIN_URL")
+    headers = {
+        "Content-Type": "application/json",
+        "Accept": "application/json"
+    }
+
+    r = await async_transport.post(url, json={"token": jwt_token}, headers=headers)
+    r.raise_for_status()
+    return r.json()["sessionToken"]
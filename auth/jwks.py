@@ -0,0 +1,176 @@
+# auth/jwks.py
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jwt.algorithms import ECAlgorithm, RSAAlgorithm
+from jwt.utils import base64url_encode
+
+
+KEY_DIR = Path("keys")
+
+# Members hashed for an RFC 7638 thumbprint, per key type
+_THUMBPRINT_MEMBERS = {"RSA": ("e", "kty", "n"), "EC": ("crv", "kty", "x", "y")}
+
+
+def _jwk_dict(public_key):
+    if isinstance(public_key, rsa.RSAPublicKey):
+        jwk = RSAAlgorithm.to_jwk(public_key, as_dict=True)
+        jwk["alg"] = "RS256"
+    elif isinstance(public_key, ec.EllipticCurvePublicKey):
+        jwk = ECAlgorithm.to_jwk(public_key, as_dict=True)
+        jwk["alg"] = "ES256"
+    else:
+        raise ValueError(f"Unsupported public key type: {type(public_key).__name__}")
+    return jwk
+
+
+def key_thumbprint(public_key):
+    """Return the RFC 7638 SHA-256 JWK thumbprint of a public key (used as its kid)."""
+    jwk = _jwk_dict(public_key)
+    members = {name: jwk[name] for name in _THUMBPRINT_MEMBERS[jwk["kty"]]}
+    canonical = json.dumps(members, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64url_encode(hashlib.sha256(canonical).digest()).decode("ascii")
+
+
+def public_jwk(public_key):
+    """Return the public JWK for a key, with its thumbprint kid."""
+    jwk = _jwk_dict(public_key)
+    jwk.pop("key_ops", None)
+    jwk.update({"kid": key_thumbprint(public_key), "use": "sig"})
+    return jwk
+
+
+class KeySet:
+    """
+    The public keys found in key_dir (every *.pem holding a PUBLIC KEY),
+    indexed by thumbprint kid. The set is re-read only when a file in the
+    directory is added, removed or rewritten.
+    """
+    def __init__(self, key_dir=KEY_DIR):
+        self.key_dir = Path(key_dir)
+        self._signature = None
+        self._keys = {}
+        self._document = (b'{"keys":[]}', '"empty"')
+        self._lock = threading.Lock()
+
+    def _dir_signature(self):
+        signature = []
+        for path in sorted(self.key_dir.glob("*.pem")):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            signature.append((path.name, st.st_ino, st.st_size, st.st_mtime_ns))
+        return tuple(signature)
+
+    def _refresh(self):
+        signature = self._dir_signature()
+        with self._lock:
+            if signature == self._signature:
+                return
+        keys = {}
+        for name, *_ in signature:
+            data = (self.key_dir / name).read_bytes()
+            if b"-----BEGIN PUBLIC KEY-----" not in data:
+                continue  # private keys stay out of the key set
+            try:
+                public_key = serialization.load_pem_public_key(data)
+                keys[key_thumbprint(public_key)] = public_key
+            except ValueError:
+                continue
+
+        jwks = {"keys": [public_jwk(key) for _, key in sorted(keys.items())]}
+        body = json.dumps(jwks, separators=(",", ":"), sort_keys=True).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        with self._lock:
+            self._signature = signature
+            self._keys = keys
+            self._document = (body, etag)
+
+    def keys(self):
+        """Return {kid: public key} for every public key in key_dir."""
+        self._refresh()
+        with self._lock:
+            return dict(self._keys)
+
+    def get(self, kid):
+        """Return the public key for kid, or None."""
+        self._refresh()
+        with self._lock:
+            return self._keys.get(kid)
+
+    def document(self):
+        """Return a tuple: (JWKS JSON bytes, ETag)."""
+        self._refresh()
+        with self._lock:
+            return self._document
+
+
+key_set = KeySet()
+
+
+def build_jwks(key_dir=KEY_DIR):
+    """Return the JWKS document (as a dict) for the public keys in key_dir."""
+    keys = key_set if Path(key_dir) == key_set.key_dir else KeySet(key_dir)
+    return json.loads(keys.document()[0])
+
+
+def _make_handler(keys, max_age):
+    class JWKSHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/.well-known/jwks.json", "/jwks.json"):
+                self.send_error(404)
+                return
+
+            body, etag = keys.document()
+            if_none_match = self.headers.get("If-None-Match", "")
+            not_modified = etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+            self.send_response(304 if not_modified else 200)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", f"public, max-age={max_age}")
+            if not_modified:
+                self.end_headers()
+                return
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return JWKSHandler
+
+
+def make_jwks_server(host="0.0.0.0", port=8765, keys=None, max_age=300):
+    """
+    Create an HTTP server for the JWKS at /.well-known/jwks.json.
+    Responses carry an ETag and Cache-Control: max-age, and If-None-Match
+    requests for an unchanged key set get a 304.
+    """
+    return ThreadingHTTPServer((host, port), _make_handler(keys or key_set, max_age))
+
+
+def start_jwks_server(host="0.0.0.0", port=8765, keys=None, max_age=300):
+    """Serve the JWKS on a background thread. Returns the server."""
+    server = make_jwks_server(host, port, keys, max_age)
+    thread = threading.Thread(target=server.serve_forever, name="jwks-server", daemon=True)
+    thread.start()
+    return server
+
+
+if __name__ == "__main__":
+    port = int(os.getenv("JWKS_PORT", "8765"))
+    server = make_jwks_server(port=port)
+    print(f"🔑 Serving JWKS for {KEY_DIR}/ at http://localhost:{port}/.well-known/jwks.json")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -1,30 +1,175 @@
 # auth/jwt_builder.py
 import jwt
+import json
+from jwt.algorithms import get_default_algorithms
+from jwt.utils import base64url_encode
 from datetime import datetime, timedelta
+import os
 import uuid
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from auth.key_cache import load_signing_key, load_signing_key_with_id, algorithm_for_key
+
+# "kid" is added per token: the RFC 7638 thumbprint of the active key, as published in the JWKS
+JWT_HEADERS = {
+    "typ": "JWT",
+}
+TENANT_ID_CLAIM = "https://tableau.com/tenantId"
 
 # In jwt_builder.py, modify the build_jwt function:
 
 def build_jwt(jwt_issuer, jwt_expiration, cm_tenant_id, tc_username, final_scopes):
-    with open("keys/private_key.pem", "r") as f:
-        private_key = f.read()
+    # Parsed once and reused until keys/private_key.pem changes on disk
+    private_key, kid = load_signing_key_with_id()
 
+    # One clock read, so exp - iat is exactly the requested lifetime
+    now = datetime.utcnow()
     payload = {
                     "iss": jwt_issuer, 
-                    "iat": datetime.utcnow(), 
-                    "exp": datetime.utcnow() + timedelta(minutes=int(jwt_expiration)),
+                    "iat": now, 
+                    "exp": now + timedelta(minutes=int(jwt_expiration)),
                     # ❗ REQUIRED by Tableau
-                    "https://tableau.com/tenantId": cm_tenant_id,
+                    TENANT_ID_CLAIM: cm_tenant_id,
                     # Must match usernameClaim in UAT config
                     "email": tc_username,
                     # Must be <= scopes in UAT config
                     "scp": final_scopes, 
                     "jti": str(uuid.uuid4())
                 }
-    headers = {
-        "typ": "JWT",
-        # required ONLY if using JWKS
-        "kid": "kid"
-    }
+    # RS256 or ES256 depending on the key generate_key_pair produced
+    return jwt.encode(payload, private_key, algorithm=algorithm_for_key(private_key),
+                      headers={**JWT_HEADERS, "kid": kid})
+
+
+def _init_mint_worker():
+    # Load the signing key once per worker process; build_jwt then hits the cache
+    load_signing_key()
+
+
+def _mint_one(job):
+    jwt_issuer, cm_tenant_id, tc_username, final_scopes, jwt_expiration = job
+    return build_jwt(jwt_issuer, jwt_expiration, cm_tenant_id, tc_username, final_scopes)
+
+
+def _mint_batch(jobs):
+    return [_mint_one(job) for job in jobs]
+
+
+def iter_jwts(jwt_issuer, cm_tenant_id, token_requests, max_workers=None, chunksize=64, stats=None):
+    """
+    Mint one JWT per (tc_username, final_scopes, jwt_expiration) tuple and yield
+    them in input order. Signing is spread over a process pool of max_workers
+    (None = one per CPU, 1 = sign in this process), in batches of chunksize.
+    At most two batches per worker are in flight, so token_requests is read
+    as the caller consumes tokens and stopping early cancels the rest.
+    If a stats dict is passed it is kept updated with the count, elapsed
+    seconds and tokens per second.
+    """
+    jobs = (
+        (jwt_issuer, cm_tenant_id, username, scopes, expiration)
+        for username, scopes, expiration in token_requests
+    )
+    if stats is None:
+        stats = {}
+    stats.update({"tokens": 0, "seconds": 0.0, "tokens_per_second": 0.0})
+    started = time.perf_counter()
+
+    def record():
+        stats["tokens"] += 1
+        stats["seconds"] = time.perf_counter() - started
+        if stats["seconds"] > 0:
+            stats["tokens_per_second"] = stats["tokens"] / stats["seconds"]
+
+    if max_workers == 1:
+        _init_mint_worker()
+        for job in jobs:
+            token = _mint_one(job)
+            record()
+            yield token
+        return
+
+    window = 2 * (max_workers or os.cpu_count() or 1)
+    batches = iter(lambda: list(islice(jobs, chunksize)), [])
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_mint_worker) as executor:
+        try:
+            for batch in batches:
+                pending.append(executor.submit(_mint_batch, batch))
+                if len(pending) < window:
+                    continue
+                for token in pending.popleft().result():
+                    record()
+                    yield token
+            while pending:
+                for token in pending.popleft().result():
+                    record()
+                    yield token
+        finally:
+            # Caller stopped early (or a batch failed): drop what has not started
+            for future in pending:
+                future.cancel()
+
+
+def build_jwts(jwt_issuer, cm_tenant_id, token_requests, max_workers=None, chunksize=64):
+    """
+    Batch version of build_jwt. Returns a tuple: (tokens, stats) where tokens
+    are in the same order as token_requests.
+    """
+    stats = {}
+    tokens = list(iter_jwts(jwt_issuer, cm_tenant_id, token_requests,
+                            max_workers=max_workers, chunksize=chunksize, stats=stats))
+    return tokens, stats
+
+
+_ALGORITHMS = get_default_algorithms()
+
+
+def _json(value):
+    # Same serialisation PyJWT uses for payloads and headers
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+class TokenTemplate:
+    """
+    Pre-compiled build_jwt for one (issuer, tenant, username, scopes) identity.
+
+    The header and static claims are serialised once; mint() only splices in
+    iat/exp/jti and signs. For the same iat and jti the output is identical
+    to build_jwt's (byte for byte with RS256; ES256 signatures are randomised).
+    """
+    def __init__(self, jwt_issuer, jwt_expiration, cm_tenant_id, tc_username, final_scopes):
+        self.lifetime_seconds = int(jwt_expiration) * 60
+        self._header_segments = {}  # (algorithm, kid) -> encoded header
+
+        # Claims keep build_jwt's insertion order: iss, iat, exp, tenantId, email, scp, jti
+        self._head = b'{"iss":' + _json(jwt_issuer) + b',"iat":'
+        self._static = b"".join([
+            b',"', TENANT_ID_CLAIM.encode(), b'":', _json(cm_tenant_id),
+            b',"email":', _json(tc_username),
+            b',"scp":', _json(final_scopes),
+            b',"jti":',
+        ])
+
+    def _header_segment(self, algorithm, kid):
+        segment = self._header_segments.get((algorithm, kid))
+        if segment is None:
+            header = {"typ": "JWT", "alg": algorithm, **JWT_HEADERS, "kid": kid}
+            segment = base64url_encode(json.dumps(header, separators=(",", ":"), sort_keys=True).encode())
+            self._header_segments[(algorithm, kid)] = segment
+        return segment
 
-    return jwt.encode(payload, private_key, algorithm="RS256", headers=headers)
\ No newline at end of file
+    def mint(self, now=None, jti=None):
+        """Return a signed JWT issued at now (epoch seconds, default: current time)."""
+        issued_at = int(now if now is not None else time.time())
+        payload = b"".join([
+            self._head, str(issued_at).encode(),
+            b',"exp":', str(issued_at + self.lifetime_seconds).encode(),
+            self._static, _json(jti or str(uuid.uuid4())), b"}",
+        ])
+        private_key, kid = load_signing_key_with_id()
+        algorithm = algorithm_for_key(private_key)
+        signing_input = self._header_segment(algorithm, kid) + b"." + base64url_encode(payload)
+        signature = _ALGORITHMS[algorithm].sign(signing_input, private_key)
+        return (signing_input + b"." + base64url_encode(signature)).decode("utf-8")
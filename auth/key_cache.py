@@ -0,0 +1,100 @@
+# auth/key_cache.py
+import os
+import threading
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+from auth.jwks import key_thumbprint
+
+
+PRIVATE_KEY_PATH = Path("keys") / "private_key.pem"
+
+
+class SigningKeyCache:
+    """
+    Keeps parsed private keys in memory so JWT signing does not re-read and
+    re-parse the PEM on every call. An entry is reloaded whenever the file's
+    inode, size or mtime changes (e.g. after generate_key_pair rotates it).
+    The key's thumbprint kid is computed once alongside it.
+    """
+    def __init__(self):
+        self._entries = {}  # path -> (stat signature, key object, kid)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _signature(path):
+        st = os.stat(path)
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def get_with_id(self, path=PRIVATE_KEY_PATH):
+        """Return (private key, kid) for path, loading it only if it changed."""
+        path = str(path)
+        signature = self._signature(path)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[0] == signature:
+                self.hits += 1
+                return entry[1], entry[2]
+
+        with open(path, "rb") as f:
+            key = serialization.load_pem_private_key(f.read(), password=None)
+        kid = key_thumbprint(key.public_key())
+
+        with self._lock:
+            self.misses += 1
+            self._entries[path] = (signature, key, kid)
+        return key, kid
+
+    def get(self, path=PRIVATE_KEY_PATH):
+        """Return the parsed private key for path, loading it only if it changed."""
+        return self.get_with_id(path)[0]
+
+    def invalidate(self, path=None):
+        """Drop one cached key, or all of them when path is None."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(path), None)
+
+    def info(self):
+        """Return hit/miss counters for monitoring."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "cached_keys": len(self._entries)}
+
+
+signing_key_cache = SigningKeyCache()
+
+
+def load_signing_key(path=PRIVATE_KEY_PATH):
+    """Return the cached, pre-parsed signing key."""
+    return signing_key_cache.get(path)
+
+
+def algorithm_for_key(key):
+    """Return the JWS algorithm a private or public key signs/verifies with."""
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return "RS256"
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)) and isinstance(key.curve, ec.SECP256R1):
+        return "ES256"
+    raise ValueError(f"Unsupported signing key type: {type(key).__name__}")
+
+
+def load_signing_key_with_id(path=PRIVATE_KEY_PATH):
+    """Return the cached signing key and its thumbprint kid."""
+    return signing_key_cache.get_with_id(path)
+
+
+def signing_key_version(path=PRIVATE_KEY_PATH):
+    """Return an opaque value that changes whenever the key file is replaced."""
+    return SigningKeyCache._signature(str(path))
+
+
+def signing_key_cache_info():
+    """Return cache hit/miss statistics."""
+    return signing_key_cache.info()
@@ -0,0 +1,85 @@
+# auth/key_pool.py
+import threading
+from collections import deque
+
+
+class KeyPool:
+    """
+    Keeps up to depth freshly generated private keys for one (algorithm,
+    key_size) in memory. A background thread tops the pool up, so taking a
+    key is effectively instant and the slow RSA generation happens between
+    workflow runs instead of during them. Every key is handed out once.
+    """
+    def __init__(self, factory, algorithm="RS256", key_size=2048, depth=2):
+        self.factory = factory  # factory(algorithm, key_size) -> private key
+        self.algorithm = algorithm
+        self.key_size = key_size
+        self.depth = depth
+        self._keys = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self.hits = 0
+        self.misses = 0
+
+    def start(self):
+        """Start the background refill thread (no-op if depth is 0 or it is running)."""
+        if self.depth <= 0 or (self._thread and self._thread.is_alive()):
+            return self
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="key-pool", daemon=True)
+        self._thread.start()
+        self._wakeup.set()
+        return self
+
+    def stop(self):
+        """Stop the refill thread and drop the pooled keys."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        with self._lock:
+            self._keys.clear()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            while not self._stopped.is_set():
+                with self._lock:
+                    if len(self._keys) >= self.depth:
+                        break
+                key = self.factory(self.algorithm, self.key_size)
+                with self._lock:
+                    self._keys.append(key)
+
+    def take(self, algorithm, key_size):
+        """
+        Return a pooled private key matching algorithm/key_size, or None if the
+        pool is for a different key type or currently empty.
+        """
+        if algorithm != self.algorithm or (algorithm == "RS256" and key_size != self.key_size):
+            return None
+        with self._lock:
+            key = self._keys.popleft() if self._keys else None
+            if key is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        # Refill in the background
+        self._wakeup.set()
+        return key
+
+    def stats(self):
+        """Return pool counters for monitoring."""
+        with self._lock:
+            return {
+                "algorithm": self.algorithm,
+                "key_size": self.key_size,
+                "depth": self.depth,
+                "available": len(self._keys),
+                "hits": self.hits,
+                "misses": self.misses,
+                "running": bool(self._thread and self._thread.is_alive()),
+            }
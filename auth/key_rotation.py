@@ -0,0 +1,293 @@
+# auth/key_rotation.py
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+from cryptography.hazmat.primitives import serialization
+
+from auth.cloud_manager_auth import login_cloud_manager_pat
+from auth.jwks import key_thumbprint
+from auth.key_cache import signing_key_cache
+from auth.keygen import KEY_DIR, PRIVATE_KEY_PATH, PUBLIC_KEY_PATH, generate_private_key, key_pool, serialize_key_pair
+from auth.uat_config import create_uat_config, extract_config_id
+from testing.api_testing import revoke_uat_configuration
+
+load_dotenv(override=True)
+
+STATE_PATH = KEY_DIR / "rotation_state.json"
+
+
+def _write_atomic(path, data):
+    # Write next to the target and rename, so readers never see a half-written key
+    tmp_path = Path(f"{path}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _published_key_path(kid):
+    return KEY_DIR / f"public_key.{kid}.pem"
+
+
+def rotation_enabled():
+    """
+    True when KEY_ROTATION_BASE_NAME is set. The rotator then owns
+    keys/private_key.pem and keys/public_key.pem, so nothing else may replace them.
+    """
+    return bool(os.getenv("KEY_ROTATION_BASE_NAME"))
+
+
+class KeyRotator:
+    """
+    Rotates the signing key without invalidating tokens already handed out.
+
+    Each rotation:
+      1. generates a new key and publishes its public key in keys/ (so the JWKS
+         and local verifier already trust it),
+      2. registers it through create_uat_config as '<base_name>-v<N>',
+      3. only once that config exists, atomically swaps keys/private_key.pem and
+         keys/public_key.pem so build_jwt starts signing with the new key,
+      4. schedules the previous config for revocation once every token signed
+         with the old key has expired (max_token_lifetime_minutes + leeway).
+
+    State (version, active config and its key's kid and public key, pending
+    retirements) is kept in keys/rotation_state.json so a restart does not
+    forget a retirement. The key that is replaced is the one recorded in the
+    state, not whatever keys/public_key.pem holds at the time.
+    """
+    def __init__(self, base_name, scopes, resource_ids=None, algorithm="RS256", key_size=2048,
+                 rotation_interval_hours=24, max_token_lifetime_minutes=60, leeway_seconds=60,
+                 active_config_id=None, state_path=STATE_PATH):
+        self.base_name = base_name
+        self.scopes = scopes
+        self.resource_ids = resource_ids
+        self.algorithm = algorithm
+        self.key_size = key_size
+        self.rotation_interval = rotation_interval_hours * 3600
+        self.retire_after = max_token_lifetime_minutes * 60 + leeway_seconds
+        self.state_path = Path(state_path)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self.state = self._load_state()
+        if active_config_id and not self.state.get("active_config_id"):
+            self.state["active_config_id"] = active_config_id
+
+    def _load_state(self):
+        if self.state_path.exists():
+            with open(self.state_path) as f:
+                return json.load(f)
+        # A fresh state counts the interval from when the current key was written, not from 1970
+        try:
+            last_rotation = PRIVATE_KEY_PATH.stat().st_mtime
+        except FileNotFoundError:
+            last_rotation = 0
+        return {"version": 0, "active_config_id": None, "active_kid": None, "active_public_key": None,
+                "last_rotation": last_rotation, "retiring": []}
+
+    def _save_state(self):
+        KEY_DIR.mkdir(exist_ok=True)
+        _write_atomic(self.state_path, json.dumps(self.state, indent=2).encode("utf-8"))
+
+    def _current_public_key(self):
+        try:
+            return serialization.load_pem_public_key(PUBLIC_KEY_PATH.read_bytes())
+        except FileNotFoundError:
+            return None
+
+    def _replaced_key(self):
+        # The key the active config was registered with; before the first rotation, the key on disk
+        if self.state.get("active_kid") and self.state.get("active_public_key"):
+            return self.state["active_kid"], self.state["active_public_key"].encode("utf-8")
+        public_key = self._current_public_key()
+        if public_key is None:
+            return None, None
+        return key_thumbprint(public_key), PUBLIC_KEY_PATH.read_bytes()
+
+    def rotate(self):
+        """Run one rotation. Returns a tuple: (success, details)."""
+        with self._lock:
+            KEY_DIR.mkdir(exist_ok=True)
+            version = self.state["version"] + 1
+            config_name = f"{self.base_name}-v{version}"
+
+            # 1. New key, published before anything signs with it
+            private_key = key_pool.take(self.algorithm, self.key_size) or generate_private_key(self.algorithm, self.key_size)
+            private_pem, public_pem = serialize_key_pair(private_key)
+            new_kid = key_thumbprint(private_key.public_key())
+            published_path = _published_key_path(new_kid)
+            _write_atomic(published_path, public_pem)
+
+            # 2. Register the new key; the old config keeps serving in the meantime
+            try:
+                session_token = login_cloud_manager_pat()
+                success, result = create_uat_config(
+                    session_token, self.scopes, config_name, self.resource_ids, public_key=public_pem.decode("utf-8")
+                )
+            except Exception as e:
+                success, result = False, {"message": f"Exception: {e}"}
+            if not success:
+                published_path.unlink(missing_ok=True)
+                return False, {"config_name": config_name, "error": result.get("message", result.get("error"))}
+
+            try:
+                new_config_id = extract_config_id(json.loads(result.get("response_text") or "{}"))
+            except ValueError:
+                new_config_id = ""
+            if not new_config_id:
+                # Without the new ID the old config could never be retired, so keep signing with the old key.
+                # The version is still used up so the next attempt does not collide with the config just created.
+                published_path.unlink(missing_ok=True)
+                self.state["version"] = version
+                self._save_state()
+                return False, {
+                    "config_name": config_name,
+                    "error": f"Config '{config_name}' was created but its ID is missing from the response; revoke it manually"
+                }
+
+            # 3. Switch signing to the new key; keep the replaced public key published for the overlap
+            old_kid, old_public_pem = self._replaced_key()
+            if old_kid:
+                _write_atomic(_published_key_path(old_kid), old_public_pem)
+            _write_atomic(PUBLIC_KEY_PATH, public_pem)
+            _write_atomic(PRIVATE_KEY_PATH, private_pem)
+            signing_key_cache.invalidate(PRIVATE_KEY_PATH)
+
+            # 4. Retire the previous config once its last token has expired
+            now = time.time()
+            if self.state.get("active_config_id"):
+                self.state["retiring"].append({
+                    "config_id": self.state["active_config_id"],
+                    "kid": old_kid,
+                    "retire_at": now + self.retire_after,
+                })
+            self.state.update({
+                "version": version,
+                "active_config_id": new_config_id,
+                "active_kid": new_kid,
+                "active_public_key": public_pem.decode("utf-8"),
+                "last_rotation": now,
+            })
+            self._save_state()
+            return True, {"config_name": config_name, "config_id": new_config_id, "kid": new_kid}
+
+    def retire_expired(self):
+        """Revoke every retiring config whose tokens have all expired. Returns the revoke results."""
+        results = []
+        with self._lock:
+            now = time.time()
+            remaining = []
+            for entry in self.state["retiring"]:
+                if entry["retire_at"] > now:
+                    remaining.append(entry)
+                    continue
+                result, _ = revoke_uat_configuration(
+                    entry["config_id"],
+                    os.getenv("CLOUD_MANAGER_PAT_SECRET"),
+                    os.getenv("CLOUD_MANAGER_PAT_LOGIN_URL"),
+                    os.getenv("CLOUD_MANAGER_UAT_CONFIGS_URL")
+                )
+                results.append({"config_id": entry["config_id"], **result})
+                if result.get("success"):
+                    if entry.get("kid") and entry["kid"] != self.state.get("active_kid"):
+                        _published_key_path(entry["kid"]).unlink(missing_ok=True)
+                else:
+                    remaining.append(entry)  # try again on the next tick
+            self.state["retiring"] = remaining
+            self._save_state()
+        return results
+
+    def tick(self):
+        """Rotate if the interval has elapsed, then retire anything due."""
+        rotation = None
+        if time.time() - self.state.get("last_rotation", 0) >= self.rotation_interval:
+            rotation = self.rotate()
+        return rotation, self.retire_expired()
+
+    def start(self, check_interval_seconds=60):
+        """Run tick() on a background thread every check_interval_seconds."""
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stopped.clear()
+
+        def run():
+            while not self._stopped.is_set():
+                try:
+                    self.tick()
+                except Exception as e:
+                    print(f"⚠️ Key rotation failed: {e}")
+                self._stopped.wait(check_interval_seconds)
+
+        self._thread = threading.Thread(target=run, name="key-rotation", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the background scheduler."""
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def status(self):
+        """Return a copy of the rotation state."""
+        with self._lock:
+            return json.loads(json.dumps(self.state))
+
+
+def _env_list(name):
+    return [item.strip() for item in (os.getenv(name) or "").split(",") if item.strip()]
+
+
+def rotator_from_env():
+    """
+    Build a KeyRotator from the KEY_ROTATION_* settings, or return None when
+    KEY_ROTATION_BASE_NAME is not set (rotation disabled).
+    """
+    base_name = os.getenv("KEY_ROTATION_BASE_NAME")
+    if not base_name:
+        return None
+    return KeyRotator(
+        base_name,
+        _env_list("KEY_ROTATION_SCOPES"),
+        resource_ids=_env_list("KEY_ROTATION_RESOURCE_IDS") or None,
+        algorithm=os.getenv("KEY_ROTATION_ALGORITHM", "RS256"),
+        key_size=int(os.getenv("KEY_ROTATION_KEY_SIZE", "2048")),
+        rotation_interval_hours=float(os.getenv("KEY_ROTATION_INTERVAL_HOURS", "24")),
+        max_token_lifetime_minutes=int(os.getenv("KEY_ROTATION_MAX_TOKEN_MINUTES", "60")),
+        active_config_id=os.getenv("KEY_ROTATION_ACTIVE_CONFIG_ID"),
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rotate the UAT signing key (configured through KEY_ROTATION_* settings)")
+    parser.add_argument("command", choices=["run", "rotate", "retire", "status"], nargs="?", default="run",
+                        help="run: schedule rotations until interrupted; rotate: rotate now; "
+                             "retire: revoke configs that are due; status: print the rotation state")
+    parser.add_argument("--check-interval", type=int, default=int(os.getenv("KEY_ROTATION_CHECK_SECONDS", "60")),
+                        help="Seconds between scheduler ticks (run only)")
+    args = parser.parse_args()
+
+    rotator = rotator_from_env()
+    if rotator is None:
+        parser.error("KEY_ROTATION_BASE_NAME is not set")
+
+    if args.command == "rotate":
+        success, details = rotator.rotate()
+        print(json.dumps(details, indent=2))
+        raise SystemExit(0 if success else 1)
+    if args.command == "retire":
+        print(json.dumps(rotator.retire_expired(), indent=2))
+    elif args.command == "status":
+        print(json.dumps(rotator.status(), indent=2))
+    else:
+        rotator.start(args.check_interval)
+        print(f"🔄 Rotating '{rotator.base_name}' every {rotator.rotation_interval / 3600:g}h; Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            rotator.stop()
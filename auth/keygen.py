@@ -1,62 +1,105 @@
 # auth/key_gen.py
 
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric import rsa, ec
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.backends import default_backend
 from pathlib import Path
+import os
+from auth.key_cache import signing_key_cache
+from auth.key_pool import KeyPool
 
 
 KEY_DIR = Path("keys")
 PRIVATE_KEY_PATH = KEY_DIR / "private_key.pem"
 PUBLIC_KEY_PATH = KEY_DIR / "public_key.pem"
 
+# JWS algorithms accepted by Tableau UAT that we can generate keys for
+SUPPORTED_ALGORITHMS = ["RS256", "ES256"]
 
-def generate_key_pair():
-    """
-    Generate RSA private/public key pair for Tableau UAT.
-    - Private key: used to sign JWTs
-    - Public key: uploaded to Tableau Cloud Manager
-    """
 
-    KEY_DIR.mkdir(exist_ok=True)
+def generate_private_key(algorithm="RS256", key_size=2048):
+    """Create a new private key for the given JWS algorithm (key_size applies to RSA only)."""
+    if algorithm == "RS256":
+        return rsa.generate_private_key(
+            public_exponent=65537,
+            key_size=key_size,
+            backend=default_backend()
+        )
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1(), backend=default_backend())
+    raise ValueError(f"Unsupported algorithm '{algorithm}'. Choose one of: {', '.join(SUPPORTED_ALGORITHMS)}")
 
-    # 1. Generate private key
-    private_key = rsa.generate_private_key(
-        public_exponent=65537,
-        key_size=2048,
-        backend=default_backend()
-    )
 
-    # 2. Derive public key
+def serialize_key_pair(private_key):
+    """Return (private PEM, public PEM) bytes for a private key."""
+    # Derive public key
     public_key = private_key.public_key()
 
-    # 3. Serialize private key (KEEP SECRET)
+    # Serialize private key (KEEP SECRET)
     private_pem = private_key.private_bytes(
         encoding=serialization.Encoding.PEM,
         format=serialization.PrivateFormat.PKCS8,
         encryption_algorithm=serialization.NoEncryption()
     )
 
-    # 4. Serialize public key (SAFE TO SHARE)
+    # Serialize public key (SAFE TO SHARE)
     public_pem = public_key.public_bytes(
         encoding=serialization.Encoding.PEM,
         format=serialization.PublicFormat.SubjectPublicKeyInfo
     )
+    return private_pem, public_pem
+
+
+# Pre-generated keys for the default key type; started by app.py (KEY_POOL_DEPTH=0 disables it)
+key_pool = KeyPool(
+    generate_private_key,
+    algorithm=os.getenv("KEY_POOL_ALGORITHM", "RS256"),
+    key_size=int(os.getenv("KEY_POOL_KEY_SIZE", "2048")),
+    depth=int(os.getenv("KEY_POOL_DEPTH", "2"))
+)
+
+
+def generate_key_pair(algorithm="RS256", key_size=2048):
+    """
+    Generate private/public key pair for Tableau UAT.
+    - algorithm: RS256 (RSA, key_size bits) or ES256 (ECDSA P-256)
+    - Private key: used to sign JWTs
+    - Public key: uploaded to Tableau Cloud Manager
+    """
+
+    KEY_DIR.mkdir(exist_ok=True)
+
+    # 1. Take a pre-generated private key, or generate one now if the pool has none
+    private_key = key_pool.take(algorithm, key_size) or generate_private_key(algorithm, key_size)
+
+    # 2-4. Derive the public key and serialize both
+    private_pem, public_pem = serialize_key_pair(private_key)
 
     # 5. Write to files
     PRIVATE_KEY_PATH.write_bytes(private_pem)
     PUBLIC_KEY_PATH.write_bytes(public_pem)
 
+    # Drop the cached signing key so the next JWT uses the new one
+    signing_key_cache.invalidate(PRIVATE_KEY_PATH)
+
     return {
         "private_key_path": str(PRIVATE_KEY_PATH),
         "public_key_path": str(PUBLIC_KEY_PATH),
+        "algorithm": algorithm,
     }
 
 
 if __name__ == "__main__":
-    print("🔐 Generating RSA key pair for Tableau Unified Access Tokens...\n")
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate a signing key pair for Tableau Unified Access Tokens")
+    parser.add_argument("--algorithm", choices=SUPPORTED_ALGORITHMS, default="RS256")
+    parser.add_argument("--key-size", type=int, default=2048, help="RSA key size in bits (RS256 only)")
+    args = parser.parse_args()
+
+    print(f"🔐 Generating {args.algorithm} key pair for Tableau Unified Access Tokens...\n")
 
-    paths = generate_key_pair()
+    paths = generate_key_pair(args.algorithm, args.key_size)
 
     print("✅ Keys generated successfully:")
     print(f"   🔑 Private Key: {paths['private_key_path']} (KEEP SECRET)")
@@ -1,31 +1,260 @@
 # auth/tableau_auth.py
-import requests
+from utils import transport
+from utils.locks import KeyedLocks
+from utils.transport import async_transport
 import os
+import threading
+import time
+from collections import OrderedDict
+import jwt as pyjwt
 from dotenv import load_dotenv
 from auth.jwt_builder import build_jwt
 
 load_dotenv(override=True)
 
-def login_tableau_cloud(jwt_token=None):
-    """
-    Logs in to the Tableau REST API using a UAT JWT.
-    Can generate its own JWT or use one passed in for testing.
-    """
-    url = f"{os.getenv('TABLEAU_CLOUD_POD_URL')}/api/3.27/auth/signin"
+REST_API_VERSION = "3.27"
+_JSON_HEADERS = {"Content-Type": "application/json", "Accept": "application/json"}
 
-    # Use the provided token for debugging, or generate a new one
-    token_to_use = jwt_token if jwt_token else build_jwt()
 
-    body = {
+def _signin_body(jwt_token, site_id):
+    return {
         "credentials": {
-            "jwt": token_to_use,
+            "jwt": jwt_token,
             "isUat": True,
             "site": {
-                "contentUrl": os.getenv("TABLEAU_CLOUD_SITE_ID")
+                "contentUrl": site_id
             }
         }
     }
 
-    r = requests.post(url, json=body, headers={"Content-Type": "application/json", "Accept": "application/json"})
+
+def _signin_url(pod_url):
+    return f"{pod_url}/api/{REST_API_VERSION}/auth/signin"
+
+
+def _signout_url(pod_url):
+    return f"{pod_url}/api/{REST_API_VERSION}/auth/signout"
+
+
+class _RestCredentials:
+    __slots__ = ("token", "site_luid", "user_luid", "obtained_at")
+
+    def __init__(self, credentials):
+        self.token = credentials["token"]
+        self.site_luid = credentials.get("site", {}).get("id")
+        self.user_luid = credentials.get("user", {}).get("id")
+        self.obtained_at = time.time()
+
+    def as_dict(self):
+        return {"token": self.token, "site_id": self.site_luid, "user_id": self.user_luid}
+
+
+def _sign_in(pod_url, site_id, jwt_token):
+    r = transport.post(_signin_url(pod_url), json=_signin_body(jwt_token, site_id), headers=_JSON_HEADERS)
+    r.raise_for_status()
+    return _RestCredentials(r.json()["credentials"])
+
+
+async def _sign_in_async(pod_url, site_id, jwt_token):
+    r = await async_transport.post(_signin_url(pod_url), json=_signin_body(jwt_token, site_id), headers=_JSON_HEADERS)
     r.raise_for_status()
-    return r.json()["credentials"]["token"]
\ No newline at end of file
+    return _RestCredentials(r.json()["credentials"])
+
+
+class RestCredentialsCache:
+    """
+    Tableau REST API credentials shared by every caller, keyed by
+    (pod URL, site contentUrl, JWT issuer, JWT user, scope set). The user is
+    the token's email claim (the UAT username) or its sub; a token with
+    neither signs in without being cached. A sign-in is reused
+    until it is older than renew_fraction of ttl_seconds; a 401 drops it and
+    signs in again exactly once. Least recently used sessions beyond max_size,
+    and sessions that are replaced, are signed out on the pod.
+    """
+    def __init__(self, max_size=64, ttl_seconds=None, renew_fraction=0.8):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds or int(os.getenv("TABLEAU_REST_SESSION_TTL_MINUTES", "240")) * 60
+        self.renew_fraction = renew_fraction
+        self._entries = OrderedDict()  # key -> _RestCredentials
+        self._key_locks = KeyedLocks()  # one sign-in per key, across threads and event loops
+        self._lock = threading.Lock()
+        self.signins = 0
+        self.signouts = 0
+        self.hits = 0
+
+    @staticmethod
+    def _key(pod_url, site_id, jwt_token):
+        """Cache key for the token's identity, or None when it names no user."""
+        claims = pyjwt.decode(jwt_token, options={"verify_signature": False})
+        user = claims.get("email") or claims.get("sub")
+        if not user:
+            return None
+        return (pod_url, site_id or "", claims.get("iss"), user, frozenset(claims.get("scp") or []))
+
+    def _stale_token(self, key, force_refresh, stale_token):
+        # The session a forced refresh replaces: the one given, else the one cached now
+        if not force_refresh or stale_token is not None:
+            return stale_token
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry.token if entry else None
+
+    def _reusable(self, key, force_refresh, stale_token):
+        # Checked again once the key's lock is held: a caller that held it may have signed in already
+        entry = self._cached(key)
+        if entry is not None and force_refresh and entry.token == stale_token:
+            return None
+        return entry
+
+    def _cached(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.time() - entry.obtained_at < self.ttl_seconds * self.renew_fraction:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry
+        return None
+
+    def _store(self, key, entry):
+        """Cache entry; returns the (pod URL, credentials) pairs that should be signed out."""
+        stale = []
+        with self._lock:
+            self.signins += 1
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                stale.append((key[0], previous))
+            self._entries[key] = entry
+            while len(self._entries) > self.max_size:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                stale.append((evicted_key[0], evicted))
+        return stale
+
+    def _sign_out(self, stale):
+        for pod_url, entry in stale:
+            try:
+                transport.post(_signout_url(pod_url), headers={**_JSON_HEADERS, "X-Tableau-Auth": entry.token})
+                self.signouts += 1
+            except Exception:
+                pass  # Best effort: the session expires on its own
+
+    async def _sign_out_async(self, stale):
+        for pod_url, entry in stale:
+            try:
+                await async_transport.post(_signout_url(pod_url), headers={**_JSON_HEADERS, "X-Tableau-Auth": entry.token})
+                self.signouts += 1
+            except Exception:
+                pass
+
+    def get_credentials(self, pod_url, site_id, jwt_token, force_refresh=False, stale_token=None):
+        """
+        Return {"token", "site_id", "user_id"} for the site, signing in with
+        jwt_token only when no reusable session is cached. force_refresh signs
+        in again unless another caller has already replaced stale_token
+        (default: the session cached when called) while this one waited.
+        """
+        key = self._key(pod_url, site_id, jwt_token)
+        if key is None:
+            return _sign_in(pod_url, site_id, jwt_token).as_dict()
+        stale_token = self._stale_token(key, force_refresh, stale_token)
+        stale = []
+        # One sign-in per key at a time; concurrent callers wait and reuse its session
+        with self._key_locks.lock(key):
+            entry = self._reusable(key, force_refresh, stale_token)
+            if entry is None:
+                entry = _sign_in(pod_url, site_id, jwt_token)
+                stale = self._store(key, entry)
+        self._sign_out(stale)
+        return entry.as_dict()
+
+    async def get_credentials_async(self, pod_url, site_id, jwt_token, force_refresh=False, stale_token=None):
+        """Async get_credentials; shares the same cached sessions and per-key locks."""
+        key = self._key(pod_url, site_id, jwt_token)
+        if key is None:
+            return (await _sign_in_async(pod_url, site_id, jwt_token)).as_dict()
+        stale_token = self._stale_token(key, force_refresh, stale_token)
+        stale = []
+        async with self._key_locks.lock_async(key):
+            entry = self._reusable(key, force_refresh, stale_token)
+            if entry is None:
+                entry = await _sign_in_async(pod_url, site_id, jwt_token)
+                stale = self._store(key, entry)
+        await self._sign_out_async(stale)
+        return entry.as_dict()
+
+    def request_with_credentials(self, pod_url, site_id, jwt_token, send):
+        """
+        Call send(credentials) -> response, where credentials is the dict from
+        get_credentials (pass credentials["token"] as X-Tableau-Auth). On a 401
+        the session is replaced with a fresh sign-in and the call retried once.
+        Returns a tuple: (response, credentials used)
+        """
+        credentials = self.get_credentials(pod_url, site_id, jwt_token)
+        response = send(credentials)
+        if response.status_code == 401:
+            credentials = self.get_credentials(
+                pod_url, site_id, jwt_token, force_refresh=True, stale_token=credentials["token"]
+            )
+            response = send(credentials)
+        return response, credentials
+
+    async def request_with_credentials_async(self, pod_url, site_id, jwt_token, send):
+        """Async request_with_credentials: await send(credentials), retrying once on a 401."""
+        credentials = await self.get_credentials_async(pod_url, site_id, jwt_token)
+        response = await send(credentials)
+        if response.status_code == 401:
+            credentials = await self.get_credentials_async(
+                pod_url, site_id, jwt_token, force_refresh=True, stale_token=credentials["token"]
+            )
+            response = await send(credentials)
+        return response, credentials
+
+    def clear(self):
+        """Sign out and forget every cached session."""
+        with self._lock:
+            stale = [(key[0], entry) for key, entry in self._entries.items()]
+            self._entries.clear()
+        self._sign_out(stale)
+
+    def stats(self):
+        """Return cache counters for monitoring."""
+        with self._lock:
+            return {
+                "sessions": len(self._entries),
+                "max_size": self.max_size,
+                "signins": self.signins,
+                "signouts": self.signouts,
+                "hits": self.hits,
+            }
+
+
+rest_credentials = RestCredentialsCache()
+
+
+def login_tableau_cloud(jwt_token=None, site_id=None, force_refresh=False):
+    """
+    Logs in to the Tableau REST API using a UAT JWT.
+    Can generate its own JWT or use one passed in for testing.
+    site_id is the site contentUrl (defaults to TABLEAU_CLOUD_SITE_ID).
+    The REST session is cached; force_refresh signs in again even if one is cached.
+    """
+    # Use the provided token for debugging, or generate a new one
+    token_to_use = jwt_token if jwt_token else build_jwt()
+
+    credentials = rest_credentials.get_credentials(
+        os.getenv("TABLEAU_CLOUD_POD_URL"),
+        site_id if site_id is not None else os.getenv("TABLEAU_CLOUD_SITE_ID"),
+        token_to_use,
+        force_refresh=force_refresh
+    )
+    return credentials["token"]
+
+
+async def login_tableau_cloud_async(jwt_token, site_id=None, force_refresh=False):
+    """Async login_tableau_cloud."""
+    credentials = await rest_credentials.get_credentials_async(
+        os.getenv("TABLEAU_CLOUD_POD_URL"),
+        site_id if site_id is not None else os.getenv("TABLEAU_CLOUD_SITE_ID"),
+        jwt_token,
+        force_refresh=force_refresh
+    )
+    return credentials["token"]
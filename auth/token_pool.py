@@ -0,0 +1,136 @@
+# auth/token_pool.py
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from auth.jwt_builder import build_jwt
+from auth.key_cache import signing_key_version
+from auth.verifier import token_verifier
+
+
+class _PooledToken:
+    __slots__ = ("token", "issued_at", "expires_at", "key_version", "refresh")
+
+    def __init__(self, token, issued_at, expires_at, key_version):
+        self.token = token
+        self.issued_at = issued_at
+        self.expires_at = expires_at
+        self.key_version = key_version
+        self.refresh = None  # Future of an in-flight background re-mint
+
+
+class TokenPool:
+    """
+    In-process pool of signed UAT JWTs keyed by (issuer, tenant, username, scope set, lifetime).
+
+    A still-valid token is handed out immediately. Once a token has used up
+    refresh_fraction of its lifetime a replacement is minted in the background,
+    so callers only wait for signing on the very first request for a key (or
+    after the signing key has been replaced). Least recently used entries are
+    evicted beyond max_size.
+
+    When a verifier is given every minted token is checked locally before it
+    is pooled, so a bad key or claim never reaches a caller.
+    """
+    def __init__(self, max_size=256, refresh_fraction=0.75, min_remaining_seconds=5, max_workers=2, verifier=None):
+        self.max_size = max_size
+        self.verifier = verifier
+        self.refresh_fraction = refresh_fraction
+        self.min_remaining_seconds = min_remaining_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="token-pool")
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(jwt_issuer, jwt_expiration, cm_tenant_id, tc_username, final_scopes):
+        return (jwt_issuer, int(jwt_expiration), cm_tenant_id, tc_username, frozenset(final_scopes or []))
+
+    def _mint(self, jwt_issuer, jwt_expiration, cm_tenant_id, tc_username, final_scopes):
+        key_version = signing_key_version()
+        issued_at = time.time()
+        token = build_jwt(jwt_issuer, jwt_expiration, cm_tenant_id, tc_username, list(final_scopes or []))
+        if self.verifier is not None:
+            valid, details = self.verifier.verify(token, issuer=jwt_issuer, tenant_id=cm_tenant_id)
+            if not valid:
+                raise ValueError(f"Minted token failed local verification: {details['error']}")
+        return _PooledToken(token, issued_at, issued_at + int(jwt_expiration) * 60, key_version)
+
+    def _store(self, key, entry):
+        # Caller holds self._lock
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _refresh_done(self, key, old_entry, future):
+        if future.exception() is not None:
+            with self._lock:
+                old_entry.refresh = None
+            return
+        with self._lock:
+            # Only replace the entry the refresh was started for
+            if self._entries.get(key) is old_entry:
+                self._entries[key] = future.result()
+
+    def get_token(self, jwt_issuer, jwt_expiration, cm_tenant_id, tc_username, final_scopes):
+        """Return a valid JWT for the given identity, minting only when none is usable."""
+        key = self._key(jwt_issuer, jwt_expiration, cm_tenant_id, tc_username, final_scopes)
+        key_version = signing_key_version()
+        now = time.time()
+
+        refresh = None
+        with self._lock:
+            entry = self._entries.get(key)
+            usable = (
+                entry is not None
+                and entry.key_version == key_version
+                and entry.expires_at - now > self.min_remaining_seconds
+            )
+            if usable:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                lifetime = entry.expires_at - entry.issued_at
+                if entry.refresh is None and now - entry.issued_at >= lifetime * self.refresh_fraction:
+                    self.refreshes += 1
+                    refresh = entry.refresh = self._executor.submit(
+                        self._mint, jwt_issuer, jwt_expiration, cm_tenant_id, tc_username, final_scopes
+                    )
+            else:
+                self.misses += 1
+
+        if usable:
+            if refresh is not None:
+                # Registered outside the lock: the callback runs inline if the mint already finished
+                refresh.add_done_callback(lambda future, key=key, entry=entry: self._refresh_done(key, entry, future))
+            return entry.token
+
+        fresh = self._mint(jwt_issuer, jwt_expiration, cm_tenant_id, tc_username, final_scopes)
+        with self._lock:
+            self._store(key, fresh)
+        return fresh.token
+
+    def invalidate(self):
+        """Drop every pooled token."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return pool counters for monitoring."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "evictions": self.evictions,
+            }
+
+
+token_pool = TokenPool(verifier=token_verifier)
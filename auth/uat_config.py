@@ -1,22 +1,22 @@
 # auth/uat_config.py
 import requests
+import httpx
+from utils import transport
+from utils.transport import async_transport
+from utils.retry import IDEMPOTENCY_HEADER
 import os
+import uuid
+from urllib.parse import urljoin
 from dotenv import load_dotenv
 
 load_dotenv(override=True)
 
-def create_uat_config(session_token, scopes, config_name, resource_ids=None):
+def build_uat_config_body(public_key, scopes, config_name, resource_ids=None, issuer=None, enabled=True):
     """
-    Creates a UAT configuration. Now accepts scopes, config name, and optional resource_ids.
-    Returns a tuple: (success, response_data)
+    Builds the request body for a UAT configuration.
+    Falls back to the tenant ID from the environment when resource_ids is None,
+    and to JWT_ISSUER when issuer is None.
     """
-    try:
-        with open("keys/public_key.pem") as f:
-            public_key = f.read()
-    except FileNotFoundError:
-        error_msg = "Public key file not found. Did the key generation step fail?"
-        return False, {"error": error_msg}
-
     # Use provided resource_ids or fall back to environment variables
     if resource_ids is None:
         resource_ids = [
@@ -26,44 +26,363 @@ def create_uat_config(session_token, scopes, config_name, resource_ids=None):
     # Filter out None values
     resource_ids = [rid for rid in resource_ids if rid is not None]
 
-    body = {
+    return {
         "name": config_name, # Use the name from the UI
-        "issuer": os.getenv("JWT_ISSUER"),
+        "issuer": issuer or os.getenv("JWT_ISSUER"),
         "publicKey": public_key,
         "usernameClaim": "email",
         "resourceIds": resource_ids,  # Use the provided resource_ids
         "scopes": scopes,
-        "enabled": True
+        "enabled": enabled
     }
 
-    headers = {
+
+def extract_config_id(config):
+    """Return the ID of a UAT configuration dict (handles the nested {'id': {'configId': ...}} shape)."""
+    if not isinstance(config, dict):
+        return ""
+    if isinstance(config.get('id'), dict):
+        return config['id'].get('configId', '')
+    return config.get('configId', config.get('id', ''))
+
+
+def _read_public_key():
+    with open("keys/public_key.pem") as f:
+        return f.read()
+
+
+def _creation_result(r, config_name, response_data):
+    # Shared by the sync and async clients: both responses expose status_code, text and raise_for_status()
+    response_data.update({
+        "status_code": r.status_code,
+        "response_text": r.text
+    })
+
+    if r.status_code == 409: # Conflict - already exists
+        response_data["message"] = f"UAT configuration '{config_name}' likely already exists. This is not a fatal error."
+        return False, response_data
+
+    r.raise_for_status()
+    
+    response_data["message"] = f"UAT configuration '{config_name}' created successfully."
+    return True, response_data
+
+
+def _creation_headers(session_token):
+    # A fresh Idempotency-Key per config lets the transport safely retry the POST
+    # on 429/5xx: a replay of a request the server already handled is de-duplicated
+    return {
         "x-tableau-session-token": session_token,
-        "Content-Type": "application/json"
+        "Content-Type": "application/json",
+        IDEMPOTENCY_HEADER: str(uuid.uuid4())
     }
 
+
+def create_uat_config(session_token, scopes, config_name, resource_ids=None, public_key=None):
+    """
+    Creates a UAT configuration. Now accepts scopes, config name, and optional resource_ids.
+    public_key defaults to the contents of keys/public_key.pem.
+    Returns a tuple: (success, response_data)
+    """
+    if public_key is None:
+        try:
+            public_key = _read_public_key()
+        except FileNotFoundError:
+            error_msg = "Public key file not found. Did the key generation step fail?"
+            return False, {"error": error_msg}
+
+    body = build_uat_config_body(public_key, scopes, config_name, resource_ids)
+
+    headers = _creation_headers(session_token)
+
     url = os.getenv("CLOUD_MANAGER_UAT_CONFIGS_URL")
+    response_data = {"request_body_sent": body}
     
     try:
-        r = requests.post(url, json=body, headers=headers)
-        
-        response_data = {
-            "status_code": r.status_code,
-            "request_body_sent": body,
-            "response_text": r.text
-        }
-
-        if r.status_code == 409: # Conflict - already exists
-            response_data["message"] = f"UAT configuration '{config_name}' likely already exists. This is not a fatal error."
-            return False, response_data
+        r = transport.post(url, json=body, headers=headers)
+        return _creation_result(r, config_name, response_data)
+
+    except requests.exceptions.HTTPError as e:
+        response_data["message"] = f"HTTP Error: {e}"
+        return False, response_data
+    except requests.exceptions.RequestException as e:
+        response_data["message"] = f"Request Exception: {e}"
+        return False, response_data
+
+
+async def create_uat_config_async(session_token, scopes, config_name, resource_ids=None, public_key=None):
+    """Async create_uat_config. Returns a tuple: (success, response_data)"""
+    if public_key is None:
+        try:
+            public_key = _read_public_key()
+        except FileNotFoundError:
+            error_msg = "Public key file not found. Did the key generation step fail?"
+            return False, {"error": error_msg}
+
+    body = build_uat_config_body(public_key, scopes, config_name, resource_ids)
+
+    headers = _creation_headers(session_token)
+
+    url = os.getenv("CLOUD_MANAGER_UAT_CONFIGS_URL")
+    response_data = {"request_body_sent": body}
+
+    try:
+        r = await async_transport.post(url, json=body, headers=headers)
+        return _creation_result(r, config_name, response_data)
+
+    except httpx.HTTPStatusError as e:
+        response_data["message"] = f"HTTP Error: {e}"
+        return False, response_data
+    except httpx.HTTPError as e:
+        response_data["message"] = f"Request Exception: {e}"
+        return False, response_data
+
+
+# --- Paged listing ---
+
+# Where a wrapped list response keeps its configs, and its next-page token
+_PAGE_ITEM_KEYS = ("configurations", "uatConfigurations", "items", "data", "results")
+_PAGE_TOKEN_KEYS = ("nextPageToken", "next_page_token")
+DEFAULT_PAGE_SIZE = int(os.getenv("UAT_LIST_PAGE_SIZE", "0")) or None
+
+
+def uat_config_page_items(data):
+    """The configurations in one page of the list response (a bare list or a wrapped one)."""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for key in _PAGE_ITEM_KEYS:
+            if isinstance(data.get(key), list):
+                return data[key]
+    return []
+
+
+def next_uat_config_page(r, data, url, params):
+    """
+    (url, params) of the page after this one, or None on the last page.
+    Follows a Link rel="next" header, a "next" URL or a next-page token.
+    """
+    link = (r.links or {}).get("next", {}).get("url")
+    if link:
+        return urljoin(url, link), None
+    if isinstance(data, dict):
+        if isinstance(data.get("next"), str) and data["next"]:
+            return urljoin(url, data["next"]), None
+        for key in _PAGE_TOKEN_KEYS:
+            if data.get(key):
+                return url, {**(params or {}), "pageToken": data[key]}
+    return None
+
+
+def iter_uat_config_pages(get, url, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Generator of (response, configs) for each page of the configurations
+    endpoint; get(url, params) sends one GET. A non-200 page is yielded with
+    no configs and ends the iteration, so callers can inspect it (e.g. 304).
+    """
+    params = {"pageSize": page_size} if page_size else None
+    seen = set()
+    while True:
+        r = get(url, params)
+        if r.status_code != 200:
+            yield r, []
+            return
+        data = r.json()
+        yield r, uat_config_page_items(data)
+        following = next_uat_config_page(r, data, url, params)
+        if following is None or repr(following) in seen:
+            return
+        seen.add(repr(following))
+        url, params = following
+
+
+async def aiter_uat_config_pages(get, url, page_size=DEFAULT_PAGE_SIZE):
+    """Async iter_uat_config_pages; get(url, params) is a coroutine function."""
+    params = {"pageSize": page_size} if page_size else None
+    seen = set()
+    while True:
+        r = await get(url, params)
+        if r.status_code != 200:
+            yield r, []
+            return
+        data = r.json()
+        yield r, uat_config_page_items(data)
+        following = next_uat_config_page(r, data, url, params)
+        if following is None or repr(following) in seen:
+            return
+        seen.add(repr(following))
+        url, params = following
+
+
+# --- Upsert: create, or PATCH only the fields that differ ---
+
+UAT_DIFF_FIELDS = ("scopes", "resourceIds", "publicKey", "enabled")
+
+
+def _normalize_field(field, value):
+    if field in ("scopes", "resourceIds"):
+        return sorted(value or [])
+    if field == "publicKey":
+        return "".join((value or "").split())  # ignore PEM line wrapping / trailing newline
+    return value
+
 
+def diff_uat_config(existing, desired):
+    """
+    Field-level diff of an existing UAT configuration against a desired body.
+    List fields compare as sets and PEMs ignore whitespace.
+    Returns {field: {"current": ..., "desired": ...}} for each field in UAT_DIFF_FIELDS that differs.
+    """
+    return {
+        field: {"current": existing.get(field), "desired": desired.get(field)}
+        for field in UAT_DIFF_FIELDS
+        if _normalize_field(field, existing.get(field)) != _normalize_field(field, desired.get(field))
+    }
+
+
+def find_uat_config(configs, config_name):
+    """Return the configuration named config_name from a list of configs, or None."""
+    for config in configs or []:
+        if isinstance(config, dict) and config.get("name") == config_name:
+            return config
+    return None
+
+
+def _read_headers(session_token):
+    return {"Accept": "application/json", "x-tableau-session-token": session_token}
+
+
+def fetch_uat_configs(session_token, url=None, page_size=None):
+    """Return every configuration, following pagination. Raises on a non-200 page."""
+    configs = []
+    pages = iter_uat_config_pages(
+        lambda page_url, params: transport.get(page_url, params=params, headers=_read_headers(session_token)),
+        url or os.getenv("CLOUD_MANAGER_UAT_CONFIGS_URL"),
+        page_size
+    )
+    for r, page in pages:
+        r.raise_for_status()
+        configs.extend(page)
+    return configs
+
+
+async def fetch_uat_configs_async(session_token, url=None, page_size=None):
+    """Async fetch_uat_configs."""
+    configs = []
+    pages = aiter_uat_config_pages(
+        lambda page_url, params: async_transport.get(page_url, params=params, headers=_read_headers(session_token)),
+        url or os.getenv("CLOUD_MANAGER_UAT_CONFIGS_URL"),
+        page_size
+    )
+    async for r, page in pages:
         r.raise_for_status()
-        
-        response_data["message"] = f"UAT configuration '{config_name}' created successfully."
-        return True, response_data
+        configs.extend(page)
+    return configs
+
+
+def _update_result(r, config_name, response_data):
+    response_data.update({
+        "status_code": r.status_code,
+        "response_text": r.text
+    })
+    r.raise_for_status()
+    response_data["message"] = f"UAT configuration '{config_name}' updated: {', '.join(response_data['diff'])}."
+    return True, response_data
+
+
+def _upsert_plan(current, body, response_data):
+    """Returns the PATCH body for current, or None if nothing changes (response_data is filled in)."""
+    changes = diff_uat_config(current, body)
+    response_data.update({"config_id": extract_config_id(current), "diff": changes})
+    if not changes:
+        response_data.update({"action": "unchanged", "message": f"UAT configuration '{body['name']}' is up to date."})
+        return None
+    response_data["action"] = "updated"
+    return {field: body[field] for field in changes}
+
+
+def upsert_uat_config_body(session_token, body, existing_configs=None, url=None):
+    """
+    Create the configuration described by body, or bring an existing one with
+    the same name up to date by PATCHing only the fields that differ. Nothing
+    is written when the config already matches.
+    existing_configs (a list from the configurations endpoint) saves the read.
+    Returns a tuple: (success, response_data) where response_data["action"]
+    is "created", "updated", "unchanged" or "exists" (409 on create).
+    """
+    url = url or os.getenv("CLOUD_MANAGER_UAT_CONFIGS_URL")
+    response_data = {"request_body_sent": body}
+    try:
+        if existing_configs is None:
+            existing_configs = fetch_uat_configs(session_token, url)
+
+        current = find_uat_config(existing_configs, body["name"])
+        if current is None:
+            r = transport.post(url, json=body, headers=_creation_headers(session_token))
+            success, response_data = _creation_result(r, body["name"], response_data)
+            response_data["action"] = "created" if success else "exists"
+            return success, response_data
+
+        patch = _upsert_plan(current, body, response_data)
+        if patch is None:
+            return True, response_data
+        r = transport.patch(f"{url}/{response_data['config_id']}", json=patch, headers=_creation_headers(session_token))
+        return _update_result(r, body["name"], response_data)
 
     except requests.exceptions.HTTPError as e:
         response_data["message"] = f"HTTP Error: {e}"
         return False, response_data
     except requests.exceptions.RequestException as e:
         response_data["message"] = f"Request Exception: {e}"
-        return False, response_data
\ No newline at end of file
+        return False, response_data
+
+
+async def upsert_uat_config_body_async(session_token, body, existing_configs=None, url=None):
+    """Async upsert_uat_config_body."""
+    url = url or os.getenv("CLOUD_MANAGER_UAT_CONFIGS_URL")
+    response_data = {"request_body_sent": body}
+    try:
+        if existing_configs is None:
+            existing_configs = await fetch_uat_configs_async(session_token, url)
+
+        current = find_uat_config(existing_configs, body["name"])
+        if current is None:
+            r = await async_transport.post(url, json=body, headers=_creation_headers(session_token))
+            success, response_data = _creation_result(r, body["name"], response_data)
+            response_data["action"] = "created" if success else "exists"
+            return success, response_data
+
+        patch = _upsert_plan(current, body, response_data)
+        if patch is None:
+            return True, response_data
+        r = await async_transport.patch(f"{url}/{response_data['config_id']}", json=patch, headers=_creation_headers(session_token))
+        return _update_result(r, body["name"], response_data)
+
+    except httpx.HTTPStatusError as e:
+        response_data["message"] = f"HTTP Error: {e}"
+        return False, response_data
+    except httpx.HTTPError as e:
+        response_data["message"] = f"Request Exception: {e}"
+        return False, response_data
+
+
+def upsert_uat_config(session_token, scopes, config_name, resource_ids=None, public_key=None, existing_configs=None):
+    """create_uat_config that updates an existing config of the same name instead of failing with a 409."""
+    if public_key is None:
+        try:
+            public_key = _read_public_key()
+        except FileNotFoundError:
+            return False, {"error": "Public key file not found. Did the key generation step fail?"}
+    body = build_uat_config_body(public_key, scopes, config_name, resource_ids)
+    return upsert_uat_config_body(session_token, body, existing_configs)
+
+
+async def upsert_uat_config_async(session_token, scopes, config_name, resource_ids=None, public_key=None, existing_configs=None):
+    """Async upsert_uat_config."""
+    if public_key is None:
+        try:
+            public_key = _read_public_key()
+        except FileNotFoundError:
+            return False, {"error": "Public key file not found. Did the key generation step fail?"}
+    body = build_uat_config_body(public_key, scopes, config_name, resource_ids)
+    return await upsert_uat_config_body_async(session_token, body, existing_configs)
@@ -0,0 +1,247 @@
+# auth/uat_provisioning.py
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from dotenv import load_dotenv
+
+from auth.cloud_manager_auth import session_cache
+from auth.keygen import KEY_DIR
+from auth.uat_config import (
+    _creation_headers, _creation_result, build_uat_config_body, extract_config_id,
+    fetch_uat_configs, upsert_uat_config_body
+)
+from utils import transport
+
+try:
+    import yaml
+except ImportError:  # YAML manifests are optional; JSON always works
+    yaml = None
+
+load_dotenv(override=True)
+
+# Manifest keys accepted for each config, with the API field names as aliases
+_FIELD_ALIASES = {
+    "publicKey": "public_key",
+    "publicKeyPath": "public_key_path",
+    "resourceIds": "resource_ids",
+}
+
+
+def _parse_manifest(text, suffix=""):
+    if suffix in (".yaml", ".yml") or (suffix != ".json" and not text.lstrip().startswith(("{", "["))):
+        if yaml is None:
+            raise ValueError("PyYAML is required for YAML manifests (pip install pyyaml)")
+        try:
+            return yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML: {e}")
+    return json.loads(text)
+
+
+def _public_key_path(value, base_dir):
+    """
+    Resolve a manifest public_key_path. Relative paths are looked up in the
+    manifest's directory, then in the working directory (so keys/... works for
+    uploaded manifests). The result must lie inside the manifest's directory or
+    keys/, so a manifest cannot read arbitrary files. Raises ValueError.
+    """
+    roots = [Path(KEY_DIR).resolve()] + ([Path(base_dir).resolve()] if base_dir else [])
+    path = Path(value)
+    if not path.is_absolute() and base_dir and (Path(base_dir) / path).exists():
+        path = Path(base_dir) / path
+    path = path.resolve()
+    if not any(path.is_relative_to(root) for root in roots):
+        raise ValueError(f"public_key_path '{value}' must be inside the manifest's directory or {KEY_DIR}/")
+    return str(path)
+
+
+def load_manifest(source, base_dir=None):
+    """
+    Read a YAML or JSON manifest of UAT configurations.
+
+    source is a file path or the manifest text itself. The manifest is either
+    a list of configs or {"defaults": {...}, "configs": [...]}; each config has
+    name, issuer, public_key (PEM) or public_key_path, resource_ids, scopes and
+    optionally enabled. public_key_path must point inside the manifest's
+    directory (or base_dir) or keys/; relative values are resolved against
+    that directory first. Raises ValueError for an invalid manifest.
+    Returns the list of configs with defaults applied.
+    """
+    path = Path(source) if isinstance(source, (str, Path)) and "\n" not in str(source) else None
+    try:
+        is_file = path is not None and path.is_file()
+    except OSError:  # one-line manifest text longer than a file name may be
+        is_file = False
+    if is_file:
+        data = _parse_manifest(path.read_text(), path.suffix.lower())
+        base_dir = base_dir or path.parent
+    else:
+        data = _parse_manifest(str(source))
+
+    if isinstance(data, dict):
+        defaults, configs = data.get("defaults") or {}, data.get("configs") or []
+    else:
+        defaults, configs = {}, data or []
+    if not isinstance(configs, list):
+        raise ValueError("Manifest 'configs' must be a list")
+    if not isinstance(defaults, dict):
+        raise ValueError("Manifest 'defaults' is not a mapping")
+
+    items = []
+    for number, config in enumerate(configs, 1):
+        if config is not None and not isinstance(config, dict):
+            raise ValueError(f"config {number} is not a mapping")
+        item = {_FIELD_ALIASES.get(k, k): v for k, v in {**defaults, **(config or {})}.items()}
+        if item.get("public_key_path"):
+            item["public_key_path"] = _public_key_path(item["public_key_path"], base_dir)
+        items.append(item)
+    return items
+
+
+def _item_body(item):
+    """Validate one manifest item and build its request body. Raises ValueError."""
+    name = item.get("name")
+    if not name:
+        raise ValueError("Missing 'name'")
+    public_key = item.get("public_key")
+    if not public_key and item.get("public_key_path"):
+        try:
+            public_key = Path(item["public_key_path"]).read_text()
+        except OSError as e:
+            raise ValueError(f"Cannot read public key: {e}")
+    if not public_key:
+        raise ValueError("Missing 'public_key' or 'public_key_path'")
+    scopes = item.get("scopes") or []
+    resource_ids = item.get("resource_ids")
+    if not isinstance(scopes, list) or (resource_ids is not None and not isinstance(resource_ids, list)):
+        raise ValueError("'scopes' and 'resource_ids' must be lists")
+    return build_uat_config_body(
+        public_key, scopes, name, resource_ids, issuer=item.get("issuer"), enabled=item.get("enabled", True)
+    )
+
+
+def _upsert_one(body, report, started, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, existing_configs):
+    try:
+        session_token = session_cache.get_session_token(cm_pat_login_url, cm_pat_secret)
+        success, data = upsert_uat_config_body(session_token, body, existing_configs, url=cm_uat_configs_url)
+        if data.get("status_code") == 401:
+            # Same as session_cache.request_with_session: replace the expired session (once across workers) and retry once
+            session_token = session_cache.get_session_token(
+                cm_pat_login_url, cm_pat_secret, force_refresh=True, stale_token=session_token
+            )
+            success, data = upsert_uat_config_body(session_token, body, existing_configs, url=cm_uat_configs_url)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        return {**report, "status": "failed", "message": str(e), "seconds": round(time.perf_counter() - started, 3)}
+    if data.get("action") == "created":
+        try:
+            data["config_id"] = extract_config_id(json.loads(data.get("response_text") or "{}"))
+        except ValueError:
+            data["config_id"] = ""
+    return {
+        **report,
+        "status": data.get("action", "failed") if success or data.get("action") == "exists" else "failed",
+        "status_code": data.get("status_code"),
+        "config_id": data.get("config_id", ""),
+        "changed_fields": sorted(data.get("diff") or []),
+        "message": data.get("message"),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def _provision_one(item, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, existing_configs=None):
+    started = time.perf_counter()
+    report = {"name": item.get("name")}
+    try:
+        body = _item_body(item)
+    except ValueError as e:
+        return {**report, "status": "invalid", "message": str(e)}
+
+    if existing_configs is not None:
+        return _upsert_one(body, report, started, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, existing_configs)
+
+    try:
+        response, _ = session_cache.request_with_session(
+            cm_pat_login_url,
+            cm_pat_secret,
+            lambda session_token: transport.post(cm_uat_configs_url, json=body, headers=_creation_headers(session_token))
+        )
+        success, data = _creation_result(response, body["name"], {})
+    except (requests.exceptions.RequestException, ValueError) as e:
+        return {**report, "status": "failed", "message": str(e), "seconds": round(time.perf_counter() - started, 3)}
+
+    if success:
+        try:
+            config_id = extract_config_id(response.json())
+        except ValueError:
+            config_id = ""
+        status = "created"
+    else:
+        config_id = ""
+        status = "exists"  # 409: keep going with the rest of the manifest
+    return {
+        **report,
+        "status": status,
+        "status_code": data["status_code"],
+        "config_id": config_id,
+        "message": data["message"],
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def provision_uat_configs(items, cm_pat_secret=None, cm_pat_login_url=None, cm_uat_configs_url=None, max_workers=None,
+                          upsert=False):
+    """
+    Create every config in items (see load_manifest) concurrently, at most
+    max_workers at a time, over one shared Cloud Manager session.
+    A 409 or a bad item is reported and the run continues.
+    With upsert=True the existing configs are read once up front and configs
+    that already exist are PATCHed with only their changed fields (or left
+    alone when nothing differs) instead of reported as existing.
+    Returns a tuple: (per-item reports in manifest order, summary counts)
+    """
+    cm_pat_secret = cm_pat_secret or os.getenv("CLOUD_MANAGER_PAT_SECRET")
+    cm_pat_login_url = cm_pat_login_url or os.getenv("CLOUD_MANAGER_PAT_LOGIN_URL")
+    cm_uat_configs_url = cm_uat_configs_url or os.getenv("CLOUD_MANAGER_UAT_CONFIGS_URL")
+    max_workers = max(1, int(max_workers or os.getenv("UAT_BULK_MAX_WORKERS", "4")))
+
+    started = time.perf_counter()
+    existing_configs = None
+    if upsert:
+        try:
+            session_token = session_cache.get_session_token(cm_pat_login_url, cm_pat_secret)
+            existing_configs = fetch_uat_configs(session_token, cm_uat_configs_url)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            reports = [{"name": item.get("name"), "status": "failed", "message": f"Could not read existing configs: {e}"} for item in items]
+            return reports, {"total": len(reports), "max_workers": max_workers, "failed": len(reports)}
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="uat-provision") as executor:
+        reports = list(executor.map(
+            lambda item: _provision_one(item, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, existing_configs), items
+        ))
+
+    summary = {"total": len(reports), "max_workers": max_workers, "seconds": round(time.perf_counter() - started, 3)}
+    for report in reports:
+        summary[report["status"]] = summary.get(report["status"], 0) + 1
+    return reports, summary
+
+
+def provision_from_manifest(source, **kwargs):
+    """load_manifest(source) then provision_uat_configs. Returns (reports, summary)."""
+    return provision_uat_configs(load_manifest(source), **kwargs)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Create UAT configurations from a YAML/JSON manifest")
+    parser.add_argument("manifest", help="Path to the manifest file")
+    parser.add_argument("--max-workers", type=int, default=None, help="Concurrent requests (default: UAT_BULK_MAX_WORKERS or 4)")
+    parser.add_argument("--upsert", action="store_true", help="Update existing configs instead of skipping them")
+    args = parser.parse_args()
+
+    reports, summary = provision_from_manifest(args.manifest, max_workers=args.max_workers, upsert=args.upsert)
+    print(json.dumps({"summary": summary, "results": reports}, indent=2))
@@ -0,0 +1,129 @@
+# auth/verifier.py
+import threading
+from pathlib import Path
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+
+from auth.jwks import KEY_DIR, KeySet, key_thumbprint, key_set
+from auth.jwt_builder import TENANT_ID_CLAIM
+from auth.key_cache import algorithm_for_key
+
+
+class TokenVerifier:
+    """
+    Verifies UAT JWTs locally, without a round trip to Cloud Manager or the pod.
+
+    Public keys are parsed once and cached, indexed by their thumbprint kid:
+    every public key in keys/ (re-read when the directory changes) plus any
+    keys registered from UAT configurations.
+    A token passes when its kid header names a cached key, its signature
+    matches, exp/iat are within leeway_seconds of now and it carries the
+    Tableau tenantId claim.
+    """
+    def __init__(self, key_dir=KEY_DIR, leeway_seconds=30):
+        self.key_set = key_set if Path(key_dir) == key_set.key_dir else KeySet(key_dir)
+        self.leeway_seconds = leeway_seconds
+        self._keys = {}  # kid -> public key
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _parse(pem):
+        if isinstance(pem, str):
+            pem = pem.encode("utf-8")
+        return serialization.load_pem_public_key(pem)
+
+    def add_public_key(self, pem, kid=None):
+        """Cache a PEM public key under kid (default: its thumbprint). Returns the kid."""
+        key = self._parse(pem)
+        kid = kid or key_thumbprint(key)
+        with self._lock:
+            self._keys[kid] = key
+        return kid
+
+    def load_uat_configs(self, configs):
+        """Cache the publicKey of every UAT configuration dict. Returns the number of keys added."""
+        added = 0
+        for config in configs or []:
+            pem = config.get("publicKey") if isinstance(config, dict) else None
+            if not pem:
+                continue
+            try:
+                self.add_public_key(pem)
+                added += 1
+            except ValueError:
+                continue
+        return added
+
+    def clear(self):
+        """Forget every registered key (keys in key_dir are always trusted)."""
+        with self._lock:
+            self._keys.clear()
+
+    def _candidate_keys(self, kid):
+        candidates = []
+        file_key = self.key_set.get(kid)
+        if file_key is not None:
+            candidates.append(file_key)
+        with self._lock:
+            registered = self._keys.get(kid)
+        if registered is not None and registered is not file_key:
+            candidates.append(registered)
+        return candidates
+
+    def verify(self, token, issuer=None, tenant_id=None):
+        """
+        Verify one token. Returns a tuple: (valid, claims) on success or
+        (False, {"error": message}) on failure.
+        """
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.InvalidTokenError as e:
+            return False, {"error": f"Malformed token: {e}"}
+
+        kid = header.get("kid")
+        if not kid:
+            return False, {"error": "Missing 'kid' header"}
+
+        candidates = self._candidate_keys(kid)
+        if not candidates:
+            return False, {"error": f"No public key cached for kid '{kid}'"}
+
+        last_error = None
+        for key in candidates:
+            try:
+                algorithm = algorithm_for_key(key)
+            except ValueError:
+                continue
+            if header.get("alg") != algorithm:
+                continue
+            try:
+                claims = jwt.decode(
+                    token,
+                    key,
+                    algorithms=[algorithm],
+                    issuer=issuer,
+                    leeway=self.leeway_seconds,
+                    options={"require": ["exp", "iat"], "verify_aud": False},
+                )
+            except jwt.InvalidSignatureError as e:
+                last_error = e
+                continue
+            except jwt.InvalidTokenError as e:
+                # Signature matched but a claim check failed
+                return False, {"error": str(e)}
+
+            if not claims.get(TENANT_ID_CLAIM):
+                return False, {"error": f"Missing '{TENANT_ID_CLAIM}' claim"}
+            if tenant_id is not None and claims[TENANT_ID_CLAIM] != tenant_id:
+                return False, {"error": "Tenant ID does not match"}
+            return True, claims
+
+        return False, {"error": f"Signature verification failed: {last_error or 'no key for ' + str(header.get('alg'))}"}
+
+    def verify_many(self, tokens, issuer=None, tenant_id=None):
+        """Verify a batch of tokens. Returns a list of (valid, claims_or_error) in input order."""
+        return [self.verify(token, issuer=issuer, tenant_id=tenant_id) for token in tokens]
+
+
+token_verifier = TokenVerifier()
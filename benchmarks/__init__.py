@@ -0,0 +1 @@
+"""Offline benchmarks for the Tableau UAT Configuration Tool."""
@@ -0,0 +1,212 @@
+"""Offline microbenchmarks for the auth package.
+
+Run from the repository root:
+    python -m benchmarks.bench_auth --output bench.json
+    python -m benchmarks.bench_auth --baseline bench.json --tolerance 0.10
+
+In baseline mode the run is compared against a previous JSON report and the
+process exits with status 1 if any benchmark's ops/sec dropped by more than
+the tolerance (e.g. after upgrading PyJWT or cryptography).
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from importlib.metadata import version, PackageNotFoundError
+
+import jwt as pyjwt
+
+from auth.jwt_builder import build_jwt
+from auth.key_cache import signing_key_cache
+from auth.keygen import generate_key_pair
+from auth.uat_config import build_uat_config_body
+
+
+JWT_ARGS = ("benchmark-issuer", 5, "tenant-id", "user@example.com", ["tableau:content:read", "tableau:projects:read"])
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_benchmark(name, fn, iterations, setup=None, warmup=1):
+    """
+    Time fn over iterations calls. setup (if given) runs before every call and
+    is excluded from the timings. Peak memory is measured in a separate pass
+    so tracemalloc's overhead does not skew the timings.
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+
+    timings = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter_ns()
+        fn()
+        timings.append(time.perf_counter_ns() - start)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    total_seconds = sum(timings) / 1e9
+    return {
+        "name": name,
+        "iterations": iterations,
+        "ops_per_sec": iterations / total_seconds if total_seconds else float("inf"),
+        "mean_ms": statistics.fmean(timings) / 1e6,
+        "p50_ms": _percentile(timings, 0.50) / 1e6,
+        "p99_ms": _percentile(timings, 0.99) / 1e6,
+        "peak_memory_kib": peak / 1024,
+    }
+
+
+def benchmark_suite(quick=False):
+    """Run every benchmark and return the list of result dicts. Must be run inside a scratch directory."""
+    scale = 10 if quick else 1
+    results = []
+
+    # Key generation at different sizes (slow, so few iterations)
+    for key_size, iterations in ((2048, 10), (3072, 5), (4096, 3)):
+        results.append(run_benchmark(
+            f"generate_key_pair[RS256-{key_size}]",
+            lambda key_size=key_size: generate_key_pair("RS256", key_size),
+            max(1, iterations // scale), warmup=0
+        ))
+    results.append(run_benchmark(
+        "generate_key_pair[ES256]", lambda: generate_key_pair("ES256"), max(1, 200 // scale)
+    ))
+
+    # JWT signing with the default key type
+    generate_key_pair()
+    results.append(run_benchmark(
+        "build_jwt[cold]", lambda: build_jwt(*JWT_ARGS), max(1, 200 // scale),
+        setup=signing_key_cache.invalidate
+    ))
+    results.append(run_benchmark("build_jwt[warm]", lambda: build_jwt(*JWT_ARGS), max(1, 1000 // scale)))
+
+    # Unverified decode, as done for debug_info in app.run_uat_workflow
+    token = build_jwt(*JWT_ARGS)
+    results.append(run_benchmark(
+        "jwt.decode[unverified]",
+        lambda: pyjwt.decode(token, options={"verify_signature": False}),
+        max(1, 5000 // scale)
+    ))
+
+    # Request body construction in create_uat_config
+    with open("keys/public_key.pem") as f:
+        public_key = f.read()
+    resource_ids = [f"00000000-0000-0000-0000-{i:012d}" for i in range(100)]
+    scopes = ["tableau:content:read"] * 100
+    results.append(run_benchmark(
+        "build_uat_config_body[100 resources]",
+        lambda: build_uat_config_body(public_key, scopes, "Benchmark-Config", resource_ids),
+        max(1, 20000 // scale)
+    ))
+    return results
+
+
+def _package_version(name):
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+
+def build_report(results):
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pyjwt": _package_version("PyJWT"),
+            "cryptography": _package_version("cryptography"),
+        },
+        "results": results,
+    }
+
+
+def compare_to_baseline(report, baseline, tolerance):
+    """Return (comparisons, regressions) comparing ops/sec per benchmark name."""
+    previous = {r["name"]: r for r in baseline.get("results", [])}
+    comparisons, regressions = [], []
+    for result in report["results"]:
+        old = previous.get(result["name"])
+        if not old or not old.get("ops_per_sec"):
+            continue
+        change = (result["ops_per_sec"] - old["ops_per_sec"]) / old["ops_per_sec"]
+        entry = {
+            "name": result["name"],
+            "baseline_ops_per_sec": old["ops_per_sec"],
+            "ops_per_sec": result["ops_per_sec"],
+            "change": change,
+        }
+        comparisons.append(entry)
+        if change < -tolerance:
+            regressions.append(entry)
+    return comparisons, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the auth package microbenchmarks")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare against a previous JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Allowed ops/sec drop vs the baseline before failing (default: 0.10)")
+    parser.add_argument("--quick", action="store_true", help="Run 10x fewer iterations")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    output = os.path.abspath(args.output) if args.output else None
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # generate_key_pair writes to ./keys, so keep the benchmark keys out of the repo
+        os.chdir(workdir)
+        try:
+            report = build_report(benchmark_suite(quick=args.quick))
+        finally:
+            os.chdir(cwd)
+
+    print(f"{'Benchmark':<40}{'ops/sec':>12}{'p50 ms':>10}{'p99 ms':>10}{'peak KiB':>10}")
+    for r in report["results"]:
+        print(f"{r['name']:<40}{r['ops_per_sec']:>12.1f}{r['p50_ms']:>10.3f}{r['p99_ms']:>10.3f}{r['peak_memory_kib']:>10.1f}")
+
+    exit_code = 0
+    if baseline is not None:
+        comparisons, regressions = compare_to_baseline(report, baseline, args.tolerance)
+        report["baseline_comparison"] = {"tolerance": args.tolerance, "comparisons": comparisons}
+        print(f"\nCompared with baseline ({baseline.get('environment', {})}):")
+        for c in comparisons:
+            marker = "❌" if c in regressions else "✅"
+            print(f"  {marker} {c['name']:<40}{c['change']:>+8.1%}")
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}")
+            exit_code = 1
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {output}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
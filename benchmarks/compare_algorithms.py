@@ -0,0 +1,60 @@
+"""Side-by-side keygen, signing and verification throughput for each supported algorithm.
+
+Run from the repository root:
+    python -m benchmarks.compare_algorithms
+"""
+
+import os
+import tempfile
+import time
+
+import jwt as pyjwt
+
+from auth.keygen import generate_key_pair, SUPPORTED_ALGORITHMS
+from auth.jwt_builder import build_jwt
+
+
+def _rate(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed if elapsed else float("inf")
+
+
+def compare_algorithms(keygen_iterations=5, sign_iterations=500):
+    """Return one result dict per algorithm with keygen/sign/verify ops per second."""
+    results = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # generate_key_pair writes to ./keys, so keep the benchmark keys out of the repo
+        os.chdir(workdir)
+        try:
+            for algorithm in SUPPORTED_ALGORITHMS:
+                keygen_rate = _rate(lambda: generate_key_pair(algorithm), keygen_iterations)
+
+                claims = ("benchmark-issuer", 5, "tenant-id", "user@example.com", ["tableau:content:read"])
+                token = build_jwt(*claims)
+                with open("keys/public_key.pem") as f:
+                    public_key = f.read()
+                decoded_key = pyjwt.algorithms.get_default_algorithms()[algorithm].prepare_key(public_key)
+
+                results.append({
+                    "algorithm": algorithm,
+                    "keygen_per_sec": keygen_rate,
+                    "sign_per_sec": _rate(lambda: build_jwt(*claims), sign_iterations),
+                    "verify_per_sec": _rate(
+                        lambda: pyjwt.decode(token, decoded_key, algorithms=[algorithm]), sign_iterations
+                    ),
+                    "token_bytes": len(token),
+                })
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+if __name__ == "__main__":
+    print(f"{'Algorithm':<10}{'Keygen/s':>12}{'Sign/s':>12}{'Verify/s':>12}{'Token bytes':>14}")
+    for row in compare_algorithms():
+        print(f"{row['algorithm']:<10}{row['keygen_per_sec']:>12.1f}{row['sign_per_sec']:>12.1f}"
+              f"{row['verify_per_sec']:>12.1f}{row['token_bytes']:>14}")
@@ -0,0 +1,143 @@
+"""Bulk import of site and resource LUIDs from CSV or JSON."""
+
+import io
+import json
+from pathlib import Path
+
+import pandas as pd
+from scope_data import SCOPE_DEFINITIONS, COMMON_ACTIONS
+
+IMPORT_COLUMNS = ["type", "luid", "scope", "site_id"]
+
+# Import row type -> SCOPE_DEFINITIONS key whose prefix its scopes must use
+TYPE_SCOPES = {
+    "site": "content",
+    "project": "projects",
+    "workbook": "workbooks",
+    "datasource": "datasources",
+    "flow": "flows",
+}
+
+_TYPE_ALIASES = {f"{t}s": t for t in TYPE_SCOPES}
+
+LUID_PATTERN = r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+
+
+def allowed_scopes(row_type):
+    """Scopes a row of this type may request: the definition's prefix with its own actions or COMMON_ACTIONS."""
+    definition = SCOPE_DEFINITIONS[TYPE_SCOPES[row_type]]
+    actions = dict.fromkeys(definition["actions"] + COMMON_ACTIONS)
+    return [f"{definition['prefix']}:{action}" for action in actions]
+
+
+def _is_file(source):
+    if not isinstance(source, (str, Path)) or "\n" in str(source):
+        return False
+    try:
+        return Path(source).is_file()
+    except OSError:  # e.g. one-line JSON text longer than a file name may be
+        return False
+
+
+def _read_rows(source):
+    # source: path, raw text or bytes; JSON is a list of objects or {"resources": [...]}
+    if _is_file(source):
+        path = Path(source)
+        text, suffix = path.read_text(), path.suffix.lower()
+    else:
+        text = source.decode("utf-8") if isinstance(source, bytes) else str(source)
+        suffix = ""
+    stripped = text.lstrip()
+    if suffix == ".json" or (suffix != ".csv" and stripped.startswith(("[", "{"))):
+        data = json.loads(text)
+        if isinstance(data, dict):
+            data = data.get("resources") or data.get("rows") or []
+        if not isinstance(data, list):
+            raise ValueError("JSON import must be a list of rows or {\"resources\": [...]}")
+        bad = next((i for i, row in enumerate(data, 1) if not isinstance(row, dict)), None)
+        if bad is not None:
+            raise ValueError(f"JSON import row {bad} is not an object")
+        return pd.DataFrame.from_records(data)
+    return pd.read_csv(io.StringIO(text), dtype=str, skipinitialspace=True)
+
+
+def load_luid_rows(source):
+    """
+    Read (type, luid, scope, site_id) rows from a CSV or JSON file path or text.
+    Missing columns are added empty. Raises ValueError on unreadable input.
+    """
+    try:
+        frame = _read_rows(source)
+    except (pd.errors.ParserError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read import file: {e}")
+    frame.columns = [str(c).strip().lower() for c in frame.columns]
+    for column in IMPORT_COLUMNS:
+        if column not in frame.columns:
+            frame[column] = ""
+    frame = frame[IMPORT_COLUMNS].fillna("").astype(str)
+    return frame.apply(lambda column: column.str.strip())
+
+
+def validate_luid_rows(frame):
+    """
+    Check every row in one pass over the columns: known type, LUID format,
+    scope allowed for the type (defaulting to <prefix>:read when empty),
+    site_id present for sites, and no repeated (type, LUID).
+    Returns a tuple: (valid rows as a DataFrame, rejected rows as dicts with "row" and "error")
+    """
+    frame = frame.copy()
+    frame["type"] = frame["type"].str.lower().replace(_TYPE_ALIASES)
+    known_type = frame["type"].isin(list(TYPE_SCOPES))
+
+    default_scope = frame["type"].map(lambda t: f"{SCOPE_DEFINITIONS[TYPE_SCOPES[t]]['prefix']}:read" if t in TYPE_SCOPES else "")
+    frame["scope"] = frame["scope"].where(frame["scope"] != "", default_scope)
+
+    allowed = {f"{row_type}|{scope}" for row_type in TYPE_SCOPES for scope in allowed_scopes(row_type)}
+    scope_ok = (frame["type"] + "|" + frame["scope"]).isin(allowed)
+    luid_ok = frame["luid"].str.fullmatch(LUID_PATTERN)
+    site_ok = (frame["type"] != "site") | (frame["site_id"] != "")
+    duplicate = frame.duplicated(subset=["type", "luid"], keep="first")
+    duplicate_site = (frame["type"] == "site") & (frame["site_id"] != "") & frame.duplicated(subset=["type", "site_id"], keep="first")
+
+    # First failing check wins
+    error = pd.Series("", index=frame.index)
+    for ok, message in [
+        (known_type, "Unknown type (use one of: " + ", ".join(TYPE_SCOPES) + ")"),
+        (luid_ok, "Invalid LUID format"),
+        (scope_ok, "Scope not allowed for this type"),
+        (site_ok, "site_id is required for sites"),
+        (~duplicate, "Duplicate LUID in file"),
+        (~duplicate_site, "Duplicate site_id in file"),
+    ]:
+        error = error.where((error != "") | ok, message)
+
+    rejected = [
+        {"row": int(index) + 1, **row, "error": row_error}
+        for index, row, row_error in zip(frame.index, frame[IMPORT_COLUMNS].to_dict("records"), error)
+        if row_error
+    ]
+    return frame[error == ""], rejected
+
+
+def import_luids(source, resource_managers, site_manager, views=None):
+    """
+    Load, validate and add LUIDs in bulk. resource_managers maps a type
+    ("project", "workbook", ...) to its ResourceManager; views optionally maps
+    a type to the session's view of its display. Each manager gets its rows
+    in one call, so displays are rendered once per manager.
+    Returns a tuple: (report dict, {type: (display, choices, status)} for the managers that received rows)
+    """
+    valid, rejected = validate_luid_rows(load_luid_rows(source))
+    report = {"total_rows": len(valid) + len(rejected), "rejected": rejected, "added": {}, "already_present": {}}
+    updates = {}
+    for row_type, rows in valid.groupby("type", sort=False):
+        view = (views or {}).get(row_type)
+        if row_type == "site":
+            result, added, skipped = site_manager.add_sites(rows[["site_id", "luid", "scope"]].itertuples(index=False), view)
+        else:
+            result, added, skipped = resource_managers[row_type].add_resources(rows[["luid", "scope"]].itertuples(index=False), view)
+        updates[row_type] = result
+        report["added"][row_type] = added
+        if skipped:
+            report["already_present"][row_type] = skipped
+    return report, updates
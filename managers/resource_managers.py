@@ -1,43 +1,129 @@
 """Resource manager classes for different Tableau resources."""
 
+from html import escape
+
+from utils.rendering import PagedView, RenderCache, page_note, row_fragment, stripe
+
+
+class _Resource:
+    __slots__ = ("luid", "scope")
+
+    def __init__(self, luid, scope):
+        self.luid = luid
+        self.scope = scope
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def as_dict(self):
+        return {"luid": self.luid, "scope": self.scope}
+
+
+@row_fragment
+def _resource_row(luid, scope, bg_color):
+    return f"""
+            <div style='display: flex; align-items: center; margin: 8px 0; padding: 12px; 
+                        border-left: 3px solid #0d6efd; border-radius: 4px; 
+                        background: {bg_color}; transition: all 0.2s;
+                        box-shadow: 0 1px 3px rgba(0,0,0,0.05);'
+                 onmouseover="this.style.backgroundColor='#e7f1ff'" 
+                 onmouseout="this.style.backgroundColor='{bg_color}'">
+                
+                <div style='flex: 3; padding-right: 15px;'>
+                    <div style='font-family: monospace; color: #495057; font-size: 0.85em;'>{escape(str(luid))}</div>
+                </div>
+                
+                <div style='flex: 2;'>
+                    <div style='color: #6c757d; font-size: 0.85em;'>{escape(str(scope))}</div>
+                </div>
+            </div>
+            """
+
 
 # --- Resource Manager class for Projects, Workbooks, Datasources, Flows ---
-class ResourceManager:
+class ResourceManager(PagedView):
     """Manages Tableau site configurations."""
     def __init__(self, resource_type):
         self.resource_type = resource_type  # 'project', 'workbook', 'datasource', 'flow'
-        self.resources = []
+        self._by_luid = {}  # LUID -> _Resource, in insertion order
+        self.version = 0  # bumped on every change; keys the cached display
+        self._display_cache = RenderCache()
+        self._records = self._by_luid
+        self._view_fields = ("luid", "scope")  # the filter matches LUID or scope
+        self._init_view()
+    
+    @property
+    def resources(self):
+        """Resources as a list of {"luid", "scope"} dicts, in the order they were added"""
+        return [res.as_dict() for res in self._by_luid.values()]
     
-    def add_resource(self, luid, scope):
+    def get(self, luid):
+        """Return the {"luid", "scope"} dict for a LUID, or None"""
+        res = self._by_luid.get(luid)
+        return res.as_dict() if res else None
+    
+    def __contains__(self, luid):
+        return luid in self._by_luid
+    
+    def __len__(self):
+        return len(self._by_luid)
+    
+    def add_resource(self, luid, scope, view=None):
         """Add a new resource"""
         if not luid:
-            return self.get_display(), self.get_choices(), f"Please enter {self.resource_type.title()} LUID"
+            return self.get_display(view), self.get_visible_choices(view), f"Please enter {self.resource_type.title()} LUID"
         
         # Check for duplicates
-        for res in self.resources:
-            if res["luid"] == luid:
-                return self.get_display(), self.get_choices(), f"{self.resource_type.title()} '{luid}' already exists"
+        if luid in self._by_luid:
+            return self.get_display(view), self.get_visible_choices(view), f"{self.resource_type.title()} '{luid}' already exists"
         
-        self.resources.append({"luid": luid, "scope": scope})
-        return self.get_display(), self.get_choices(), f"Added {self.resource_type}: {luid}"
+        self._by_luid[luid] = _Resource(luid, scope)
+        self.version += 1
+        return self.get_display(view), self.get_visible_choices(view), f"Added {self.resource_type}: {luid}"
+    
+    def add_resources(self, rows, view=None):
+        """
+        Add many (luid, scope) pairs, rendering the display once at the end.
+        LUIDs already present keep their existing scope.
+        Returns a tuple: ((display, choices, status), number added, LUIDs skipped)
+        """
+        added, skipped = 0, []
+        for luid, scope in rows:
+            if luid in self._by_luid:
+                skipped.append(luid)
+                continue
+            self._by_luid[luid] = _Resource(luid, scope)
+            added += 1
+        if added:
+            self.version += 1
+        status = f"Imported {added} {self.resource_type}(s)" + (f", {len(skipped)} already present" if skipped else "")
+        return (self.get_display(view), self.get_visible_choices(view), status), added, skipped
     
-    def delete_resource(self, luid):
+    def delete_resource(self, luid, view=None):
         """Delete selected resource"""
         if luid:
-            self.resources = [r for r in self.resources if r["luid"] != luid]
-        return self.get_display(), self.get_choices(), f"Deleted {self.resource_type}: {luid}"
+            if self._by_luid.pop(luid, None) is not None:
+                self.version += 1
+        return self.get_display(view), self.get_visible_choices(view), f"Deleted {self.resource_type}: {luid}"
     
-    def clear_resources(self):
+    def clear_resources(self, view=None):
         """Clear all resources"""
-        self.resources = []
-        return self.get_display(), self.get_choices(), f"All {self.resource_type}s cleared"
+        self._by_luid.clear()
+        self.version += 1
+        return self.get_display(view), self.get_visible_choices(view), f"All {self.resource_type}s cleared"
     
-    def get_display(self):
-        """Create HTML display"""
-        if not self.resources:
+    def get_display(self, view=None):
+        """Create HTML display of the visible page (re-rendered only after the resources or the view change)"""
+        view = self.shown_view(view)
+        return self._display_cache.render(self.view_key(view), lambda: self._render_display(view))
+    
+    _view_display = get_display
+    
+    def _render_display(self, view):
+        if not self._by_luid:
             return f"<div style='padding: 15px; background: #f8f9fa; border-radius: 8px; border: 2px dashed #dee2e6; text-align: center; color: #6c757d; font-style: italic;'>No {self.resource_type}s configured yet</div>"
         
-        html = """
+        header = """
         <div style='padding: 15px; background: #f8f9fa; border-radius: 8px; border: 1px solid #dee2e6;'>
             <div style='display: flex; align-items: center; margin-bottom: 12px; padding-bottom: 10px; border-bottom: 2px solid #adb5bd;'>
                 <div style='flex: 3; font-weight: bold; color: #495057; font-size: 0.95em;'>LUID</div>
@@ -45,38 +131,24 @@ class ResourceManager:
             </div>
         """
         
-        for idx, res in enumerate(self.resources):
-            bg_color = '#ffffff' if idx % 2 == 0 else '#f8f9fa'
-            html += f"""
-            <div style='display: flex; align-items: center; margin: 8px 0; padding: 12px; 
-                        border-left: 3px solid #0d6efd; border-radius: 4px; 
-                        background: {bg_color}; transition: all 0.2s;
-                        box-shadow: 0 1px 3px rgba(0,0,0,0.05);'
-                 onmouseover="this.style.backgroundColor='#e7f1ff'" 
-                 onmouseout="this.style.backgroundColor='{bg_color}'">
-                
-                <div style='flex: 3; padding-right: 15px;'>
-                    <div style='font-family: monospace; color: #495057; font-size: 0.85em;'>{res['luid']}</div>
-                </div>
-                
-                <div style='flex: 2;'>
-                    <div style='color: #6c757d; font-size: 0.85em;'>{res['scope']}</div>
-                </div>
-            </div>
-            """
-        
-        html += f"""
+        rows, page, page_count, matching = self.current_page(view)
+        note = page_note(rows, page, page_count, matching, len(self._by_luid))
+        footer = f"""
             <div style='margin-top: 12px; padding-top: 10px; border-top: 1px solid #dee2e6; 
                         color: #6c757d; font-size: 0.85em; text-align: right;'>
-                Total: {len(self.resources)}
+                Total: {len(self._by_luid)}{f" · {note}" if note else ""}
             </div>
         </div>
         """
-        return html
+        if not rows:
+            rows_html = [f"<div style='padding: 12px; color: #6c757d; font-style: italic;'>No {self.resource_type}s match '{escape(view['query'])}'</div>"]
+        else:
+            rows_html = [_resource_row(res.luid, res.scope, stripe(idx)) for idx, res in rows]
+        return "".join([header, *rows_html, footer])
     
     def get_choices(self):
         """Get LUIDs for radio selection"""
-        return [res["luid"] for res in self.resources]
+        return list(self._by_luid)
     
     def get_resources_list(self):
         """Get list of resources"""
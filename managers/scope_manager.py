@@ -1,13 +1,51 @@
 """Scope management for JWT tokens."""
 
+from html import escape
+
 import pandas as pd
 from scope_data import SCOPE_DEFINITIONS, COMMON_ACTIONS
+from utils.rendering import RenderCache, row_fragment, stripe
+
+
+@row_fragment
+def _scope_row(scope, description, bg_color):
+    return f"""
+            <div style='display: flex; align-items: center; margin: 8px 0; padding: 12px; 
+                        border-left: 3px solid #0d6efd; border-radius: 4px; 
+                        background: {bg_color}; transition: all 0.2s;
+                        box-shadow: 0 1px 3px rgba(0,0,0,0.05);'
+                 onmouseover="this.style.backgroundColor='#e7f1ff'; this.style.boxShadow='0 2px 5px rgba(0,0,0,0.1)'" 
+                 onmouseout="this.style.backgroundColor='{bg_color}'; this.style.boxShadow='0 1px 3px rgba(0,0,0,0.05)'">
+                
+                <div style='flex: 2; padding-right: 15px;'>
+                    <div style='font-weight: 500; color: #212529; font-family: monospace; font-size: 0.9em;'>
+                        {escape(str(scope))}
+                    </div>
+                </div>
+                
+                <div style='flex: 3; padding-left: 15px;'>
+                    <div style='color: #6c757d; font-size: 0.9em; line-height: 1.4;'>
+                        {escape(str(description))}
+                    </div>
+                </div>
+            </div>
+            """
 
 
 # --- ScopeManager class using radio button approach ---
 class ScopeManager:
     def __init__(self):
-        self.scopes = []  # List of dictionaries with "Scope" and "Description"
+        self._by_scope = {}  # scope -> description, in insertion order
+        self.version = 0  # bumped on every change; keys the cached display
+        self._display_cache = RenderCache()
+    
+    @property
+    def scopes(self):
+        """Scopes as a list of {"Scope", "Description"} dicts, in the order they were added"""
+        return [{"Scope": scope, "Description": description} for scope, description in self._by_scope.items()]
+    
+    def __len__(self):
+        return len(self._by_scope)
     
     def add_scope(self, resource, action):
         """Add a new scope with resource and action"""
@@ -19,28 +57,32 @@ class ScopeManager:
         description = SCOPE_DEFINITIONS.get(resource, {}).get("description", "N/A")
         
         # Check for duplicates
-        for scope_dict in self.scopes:
-            if scope_dict["Scope"] == new_scope:
-                return self.get_form_display(), self.get_radio_choices(), f"Scope '{new_scope}' already exists."
+        if new_scope in self._by_scope:
+            return self.get_form_display(), self.get_radio_choices(), f"Scope '{new_scope}' already exists."
         
-        self.scopes.append({"Scope": new_scope, "Description": description})
+        self._by_scope[new_scope] = description
+        self.version += 1
         return self.get_form_display(), self.get_radio_choices(), f"Added: {new_scope}"
     
     def delete_scope(self, selected_scope):
         """Delete selected scope"""
         if selected_scope:
-            # Find and remove the scope
-            self.scopes = [s for s in self.scopes if s["Scope"] != selected_scope]
+            if self._by_scope.pop(selected_scope, None) is not None:
+                self.version += 1
         return self.get_form_display(), self.get_radio_choices(), f"Deleted: {selected_scope}"
     
     def clear_scopes(self):
         """Clear all scopes"""
-        self.scopes = []
+        self._by_scope.clear()
+        self.version += 1
         return self.get_form_display(), self.get_radio_choices(), "All scopes cleared."
     
     def get_form_display(self):
-        """Create improved HTML display of current scopes"""
-        if not self.scopes:
+        """Create improved HTML display of current scopes (re-rendered only after the scopes change)"""
+        return self._display_cache.render(self.version, self._render_form_display)
+    
+    def _render_form_display(self):
+        if not self._by_scope:
             return """
             <div style='padding: 20px; color: #666; font-style: italic; text-align: center; 
                         background: #f8f9fa; border-radius: 8px; border: 2px dashed #dee2e6;'>
@@ -48,7 +90,7 @@ class ScopeManager:
             </div>
             """
         
-        html = """
+        header = """
         <div style='padding: 15px; background: #f8f9fa; border-radius: 8px; border: 1px solid #dee2e6;'>
             <div style='display: flex; align-items: center; margin-bottom: 12px; padding-bottom: 10px; 
                         border-bottom: 2px solid #adb5bd;'>
@@ -57,47 +99,23 @@ class ScopeManager:
             </div>
         """
         
-        for idx, scope_dict in enumerate(self.scopes):
-            # Alternate row colors for better readability
-            bg_color = '#ffffff' if idx % 2 == 0 else '#f8f9fa'
-            
-            html += f"""
-            <div style='display: flex; align-items: center; margin: 8px 0; padding: 12px; 
-                        border-left: 3px solid #0d6efd; border-radius: 4px; 
-                        background: {bg_color}; transition: all 0.2s;
-                        box-shadow: 0 1px 3px rgba(0,0,0,0.05);'
-                 onmouseover="this.style.backgroundColor='#e7f1ff'; this.style.boxShadow='0 2px 5px rgba(0,0,0,0.1)'" 
-                 onmouseout="this.style.backgroundColor='{bg_color}'; this.style.boxShadow='0 1px 3px rgba(0,0,0,0.05)'">
-                
-                <div style='flex: 2; padding-right: 15px;'>
-                    <div style='font-weight: 500; color: #212529; font-family: monospace; font-size: 0.9em;'>
-                        {scope_dict['Scope']}
-                    </div>
-                </div>
-                
-                <div style='flex: 3; padding-left: 15px;'>
-                    <div style='color: #6c757d; font-size: 0.9em; line-height: 1.4;'>
-                        {scope_dict['Description']}
-                    </div>
-                </div>
-            </div>
-            """
-        
-        html += """
+        footer = f"""
             <div style='margin-top: 12px; padding-top: 10px; border-top: 1px solid #dee2e6; 
                         color: #6c757d; font-size: 0.85em; text-align: right;'>
-                Total scopes: """ + str(len(self.scopes)) + """
+                Total scopes: {len(self._by_scope)}
             </div>
         </div>
         """
-        return html
+        # Alternate row colors for better readability
+        rows = [_scope_row(scope, description, stripe(idx)) for idx, (scope, description) in enumerate(self._by_scope.items())]
+        return "".join([header, *rows, footer])
     
     def get_radio_choices(self):
         """Get choices for radio button selection"""
-        return [scope_dict["Scope"] for scope_dict in self.scopes]
+        return list(self._by_scope)
     
     def get_scopes_df(self):
         """Convert to DataFrame for compatibility with existing code"""
-        if not self.scopes:
+        if not self._by_scope:
             return pd.DataFrame(columns=["Scope", "Description"])
         return pd.DataFrame(self.scopes)
\ No newline at end of file
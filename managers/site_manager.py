@@ -1,45 +1,141 @@
 """Scope management for JWT tokens."""
 
+from html import escape
+
+from utils.rendering import PagedView, RenderCache, page_note, row_fragment, stripe
+
+
+class _Site:
+    __slots__ = ("site_id", "site_luid", "scope")
+
+    def __init__(self, site_id, site_luid, scope):
+        self.site_id = site_id
+        self.site_luid = site_luid
+        self.scope = scope
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def as_dict(self):
+        return {"site_id": self.site_id, "site_luid": self.site_luid, "scope": self.scope}
+
+
+@row_fragment
+def _site_row(site_id, site_luid, scope, bg_color):
+    return f"""
+            <div style='display: flex; align-items: center; margin: 8px 0; padding: 12px; 
+                        border-left: 3px solid #0d6efd; border-radius: 4px; 
+                        background: {bg_color}; transition: all 0.2s;
+                        box-shadow: 0 1px 3px rgba(0,0,0,0.05);'
+                 onmouseover="this.style.backgroundColor='#e7f1ff'" 
+                 onmouseout="this.style.backgroundColor='{bg_color}'">
+                
+                <div style='flex: 2; padding-right: 15px;'>
+                    <div style='font-weight: 500; color: #212529;'>{escape(str(site_id))}</div>
+                </div>
+                
+                <div style='flex: 3; padding-right: 15px;'>
+                    <div style='font-family: monospace; color: #495057; font-size: 0.85em;'>{escape(str(site_luid))}</div>
+                </div>
+                
+                <div style='flex: 2;'>
+                    <div style='color: #6c757d; font-size: 0.85em;'>{escape(str(scope))}</div>
+                </div>
+            </div>
+            """
+
+
 # --- Site Manager class ---
-class SiteManager:
+class SiteManager(PagedView):
     def __init__(self):
-        self.sites = []  # List of dictionaries with site info
+        self._by_luid = {}  # site LUID -> _Site, in insertion order
+        self._luid_by_site_id = {}  # site ID (contentUrl) -> site LUID
+        self.version = 0  # bumped on every change; keys the cached display
+        self._display_cache = RenderCache()
+        self._records = self._by_luid
+        self._view_fields = ("site_id", "site_luid", "scope")  # the filter matches site ID, LUID or scope
+        self._init_view()
     
-    def add_site(self, site_id, site_luid, site_scope):
+    @property
+    def sites(self):
+        """Sites as a list of {"site_id", "site_luid", "scope"} dicts, in the order they were added"""
+        return [site.as_dict() for site in self._by_luid.values()]
+    
+    def get_site(self, site_id):
+        """Return the site dict for a site ID, or None"""
+        site_luid = self._luid_by_site_id.get(site_id)
+        return self._by_luid[site_luid].as_dict() if site_luid is not None else None
+    
+    def get_site_by_luid(self, site_luid):
+        """Return the site dict for a site LUID, or None"""
+        site = self._by_luid.get(site_luid)
+        return site.as_dict() if site else None
+    
+    def __len__(self):
+        return len(self._by_luid)
+    
+    def add_site(self, site_id, site_luid, site_scope, view=None):
         """Add a new site"""
         if not site_id or not site_luid:
-            return self.get_sites_display(), self.get_site_choices(), "Please enter both Site ID and Site LUID"
+            return self.get_sites_display(view), self.get_visible_choices(view), "Please enter both Site ID and Site LUID"
         
         # Check for duplicates
-        for site in self.sites:
-            if site["site_id"] == site_id or site["site_luid"] == site_luid:
-                return self.get_sites_display(), self.get_site_choices(), f"Site '{site_id}' already exists"
+        if site_id in self._luid_by_site_id or site_luid in self._by_luid:
+            return self.get_sites_display(view), self.get_visible_choices(view), f"Site '{site_id}' already exists"
         
-        self.sites.append({
-            "site_id": site_id,
-            "site_luid": site_luid,
-            "scope": site_scope
-        })
+        self._by_luid[site_luid] = _Site(site_id, site_luid, site_scope)
+        self._luid_by_site_id[site_id] = site_luid
+        self.version += 1
         
-        return self.get_sites_display(), self.get_site_choices(), f"Added site: {site_id}"
+        return self.get_sites_display(view), self.get_visible_choices(view), f"Added site: {site_id}"
+    
+    def add_sites(self, rows, view=None):
+        """
+        Add many (site_id, site_luid, scope) rows, rendering the display once at the end.
+        Rows whose site ID or LUID is already configured are skipped.
+        Returns a tuple: ((display, choices, status), number added, site IDs skipped)
+        """
+        added, skipped = 0, []
+        for site_id, site_luid, site_scope in rows:
+            if site_id in self._luid_by_site_id or site_luid in self._by_luid:
+                skipped.append(site_id)
+                continue
+            self._by_luid[site_luid] = _Site(site_id, site_luid, site_scope)
+            self._luid_by_site_id[site_id] = site_luid
+            added += 1
+        if added:
+            self.version += 1
+        status = f"Imported {added} site(s)" + (f", {len(skipped)} already present" if skipped else "")
+        return (self.get_sites_display(view), self.get_visible_choices(view), status), added, skipped
     
-    def delete_site(self, site_key):
+    def delete_site(self, site_key, view=None):
         """Delete selected site by key (site_id)"""
         if site_key:
-            self.sites = [s for s in self.sites if s["site_id"] != site_key]
-        return self.get_sites_display(), self.get_site_choices(), f"Deleted site: {site_key}"
+            site_luid = self._luid_by_site_id.pop(site_key, None)
+            if site_luid is not None:
+                del self._by_luid[site_luid]
+                self.version += 1
+        return self.get_sites_display(view), self.get_visible_choices(view), f"Deleted site: {site_key}"
     
-    def clear_sites(self):
+    def clear_sites(self, view=None):
         """Clear all sites"""
-        self.sites = []
-        return self.get_sites_display(), self.get_site_choices(), "All sites cleared"
+        self._by_luid.clear()
+        self._luid_by_site_id.clear()
+        self.version += 1
+        return self.get_sites_display(view), self.get_visible_choices(view), "All sites cleared"
     
-    def get_sites_display(self):
-        """Create HTML display of sites"""
-        if not self.sites:
+    def get_sites_display(self, view=None):
+        """Create HTML display of the visible page of sites (re-rendered only after the sites or the view change)"""
+        view = self.shown_view(view)
+        return self._display_cache.render(self.view_key(view), lambda: self._render_sites_display(view))
+    
+    _view_display = get_sites_display
+    
+    def _render_sites_display(self, view):
+        if not self._by_luid:
             return "<div style='padding: 15px; background: #f8f9fa; border-radius: 8px; border: 2px dashed #dee2e6; text-align: center; color: #6c757d; font-style: italic;'>No sites configured yet</div>"
         
-        html = """
+        header = """
         <div style='padding: 15px; background: #f8f9fa; border-radius: 8px; border: 1px solid #dee2e6;'>
             <div style='display: flex; align-items: center; margin-bottom: 12px; padding-bottom: 10px; border-bottom: 2px solid #adb5bd;'>
                 <div style='flex: 2; font-weight: bold; color: #495057; font-size: 0.95em;'>SITE ID</div>
@@ -48,42 +144,24 @@ class SiteManager:
             </div>
         """
         
-        for idx, site in enumerate(self.sites):
-            bg_color = '#ffffff' if idx % 2 == 0 else '#f8f9fa'
-            html += f"""
-            <div style='display: flex; align-items: center; margin: 8px 0; padding: 12px; 
-                        border-left: 3px solid #0d6efd; border-radius: 4px; 
-                        background: {bg_color}; transition: all 0.2s;
-                        box-shadow: 0 1px 3px rgba(0,0,0,0.05);'
-                 onmouseover="this.style.backgroundColor='#e7f1ff'" 
-                 onmouseout="this.style.backgroundColor='{bg_color}'">
-                
-                <div style='flex: 2; padding-right: 15px;'>
-                    <div style='font-weight: 500; color: #212529;'>{site['site_id']}</div>
-                </div>
-                
-                <div style='flex: 3; padding-right: 15px;'>
-                    <div style='font-family: monospace; color: #495057; font-size: 0.85em;'>{site['site_luid']}</div>
-                </div>
-                
-                <div style='flex: 2;'>
-                    <div style='color: #6c757d; font-size: 0.85em;'>{site['scope']}</div>
-                </div>
-            </div>
-            """
-        
-        html += f"""
+        rows, page, page_count, matching = self.current_page(view)
+        note = page_note(rows, page, page_count, matching, len(self._by_luid))
+        footer = f"""
             <div style='margin-top: 12px; padding-top: 10px; border-top: 1px solid #dee2e6; 
                         color: #6c757d; font-size: 0.85em; text-align: right;'>
-                Total sites: {len(self.sites)}
+                Total sites: {len(self._by_luid)}{f" · {note}" if note else ""}
             </div>
         </div>
         """
-        return html
+        if not rows:
+            rows_html = [f"<div style='padding: 12px; color: #6c757d; font-style: italic;'>No sites match '{escape(view['query'])}'</div>"]
+        else:
+            rows_html = [_site_row(site.site_id, site.site_luid, site.scope, stripe(idx)) for idx, site in rows]
+        return "".join([header, *rows_html, footer])
     
     def get_site_choices(self):
         """Get site IDs for radio selection"""
-        return [site["site_id"] for site in self.sites]
+        return list(self._luid_by_site_id)
     
     def get_sites_list(self):
         """Get list of sites for workflow"""
@@ -1,119 +1,359 @@
 """API testing functions for JWT tokens."""
 
 import requests
+import httpx
+from utils import transport
+from utils.transport import async_transport
 import jwt as pyjwt
+from auth.token_pool import token_pool
+from auth.verifier import token_verifier
+from auth.uat_config import DEFAULT_PAGE_SIZE, aiter_uat_config_pages, extract_config_id, iter_uat_config_pages
+from auth.cloud_manager_auth import session_cache
+from testing.config_mirror import config_mirror, mirror_source
+import asyncio
+from datetime import datetime
+
+# Configurations rendered per page of the list view
+CONFIGS_PAGE_SIZE = 50
+
+
+def _current_jwt(results):
+    """
+    Return a usable JWT for the identity minted by the workflow. The token
+    pool hands back the workflow's token while it is valid and a refreshed
+    one once it nears expiry, instead of replaying an expired token.
+    """
+    jwt_info = results.get("jwt", {})
+    jwt_token = jwt_info.get("token", "")
+    if not jwt_token:
+        return ""
+    claims = pyjwt.decode(jwt_token, options={"verify_signature": False})
+    return token_pool.get_token(
+        claims["iss"],
+        jwt_info.get("expiration_minutes", 5),
+        claims["https://tableau.com/tenantId"],
+        claims["email"],
+        claims.get("scp", [])
+    )
 
 
 def test_tcm_connection(cm_jwt_login_url, results):
     """Test connection to Tableau Cloud Manager API."""
-    jwt_token = results.get("jwt", {}).get("token", "")
-    if not jwt_token: 
+    if not results.get("jwt", {}).get("token", ""): 
         return "❌ Please run the workflow first."
     try:
-        r = requests.post(cm_jwt_login_url, json={"token": jwt_token})
+        jwt_token = _current_jwt(results)
+        r = transport.post(cm_jwt_login_url, json={"token": jwt_token})
         return "✅ TCM API connection successful!" if r.status_code == 200 else f"❌ Failed: {r.status_code} - {r.text}"
     except Exception as e: 
         return f"❌ Error: {str(e)}"
 
 
+def _tableau_site_id(results):
+    """Site contentUrl the workflow signed in to, or 'default'."""
+    # Get site_id from the JWT scopes or use the first configured site
+    site_id = "default"
+    
+    # Try to extract site_id from the workflow results
+    if "debug_info" in results and "request_body_sent" in results["debug_info"]:
+        site_id = results["debug_info"]["request_body_sent"]["credentials"]["site"]["contentUrl"]
+    return site_id
+
+
 def test_tableau_connection(tc_pod_url, results):
     """Test connection to Tableau Cloud REST API."""
     if results["tableau_login"]["status"] ==  "skipped":
         return "🌐 No sites configured"
 
-    jwt_token = results.get("jwt", {}).get("token", "")
-    if not jwt_token: 
+    if not results.get("jwt", {}).get("token", ""): 
         return "❌ Please run the workflow first."
     
-    # Get site_id from the JWT scopes or use the first configured site
-    scopes = results.get("jwt", {}).get("scopes", [])
-    site_id = "default"
-    
-    # Try to extract site_id from the workflow results
-    if "debug_info" in results and "request_body_sent" in results["debug_info"]:
-        site_id = results["debug_info"]["request_body_sent"]["credentials"]["site"]["contentUrl"]
+    site_id = _tableau_site_id(results)
     
     try:
+        jwt_token = _current_jwt(results)
         url = f"{tc_pod_url}/api/3.27/auth/signin"
         body = {"credentials": {"jwt": jwt_token, "isUat": True, "site": {"contentUrl": site_id}}}
-        r = requests.post(url, json=body)
+        r = transport.post(url, json=body)
         return "✅ Tableau REST API connection successful!" if r.status_code == 200 else f"❌ Failed: {r.status_code} - {r.text}"
     except Exception as e: 
         return f"❌ Error: {str(e)}"
 
 
+def _login_error(e):
+    """Format a failed PAT login the way the UI expects."""
+    if getattr(e, "response", None) is not None:
+        return {
+            "error": f"Failed to login to Cloud Manager: {e.response.status_code}",
+            "details": e.response.text
+        }
+    return {"error": str(e)}
+
+
+def _list_headers(session_token):
+    return {
+        'Accept': 'application/json',
+        'x-tableau-session-token': session_token
+    }
+
+
+def _page_getter(cm_pat_secret, cm_pat_login_url):
+    # One page per call over the shared Cloud Manager session (one PAT login, retried once on 401)
+    def get(url, params):
+        return session_cache.request_with_session(
+            cm_pat_login_url,
+            cm_pat_secret,
+            lambda session_token: transport.get(url, params=params, headers=_list_headers(session_token))
+        )[0]
+    return get
+
+
+def _async_page_getter(cm_pat_secret, cm_pat_login_url):
+    async def get(url, params):
+        response, _ = await session_cache.request_with_session_async(
+            cm_pat_login_url,
+            cm_pat_secret,
+            lambda session_token: async_transport.get(url, params=params, headers=_list_headers(session_token))
+        )
+        return response
+    return get
+
+
+def iter_uat_configurations(cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Generator over every UAT configuration, one page request at a time, so
+    callers can start on the first configs before the last page arrives.
+    Raises requests.exceptions.HTTPError if a page fails.
+    """
+    for response, page in iter_uat_config_pages(_page_getter(cm_pat_secret, cm_pat_login_url), cm_uat_configs_url, page_size):
+        response.raise_for_status()
+        yield from page
+
+
+async def aiter_uat_configurations(cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, page_size=DEFAULT_PAGE_SIZE):
+    """Async iter_uat_configurations. Raises httpx.HTTPStatusError if a page fails."""
+    pages = aiter_uat_config_pages(_async_page_getter(cm_pat_secret, cm_pat_login_url), cm_uat_configs_url, page_size)
+    async for response, page in pages:
+        response.raise_for_status()
+        for config in page:
+            yield config
+
+
+def _list_error(configs_response):
+    return {
+        "error": f"Failed to retrieve configurations: {configs_response.status_code}",
+        "details": configs_response.text
+    }
+
+
 def list_uat_configurations(cm_pat_secret, cm_pat_login_url, cm_uat_configs_url):
-    """List all UAT configurations from Cloud Manager."""
+    """List all UAT configurations from Cloud Manager (every page)."""
     if not cm_pat_secret or not cm_pat_login_url or not cm_uat_configs_url:
-        return {"error": "Please configure Cloud Manager settings first"}, ""
+        return {"error": "Please configure Cloud Manager settings first"}, "", []
     
     try:
-        # Step 1: Login with PAT to get session token
-        login_response = requests.post(
-            cm_pat_login_url,
-            headers={
-                'Content-Type': 'application/json',
-                'Accept': 'application/json'
-            },
-            json={"token": cm_pat_secret}
-        )
-        
-        if login_response.status_code != 200:
-            return {
-                "error": f"Failed to login to Cloud Manager: {login_response.status_code}",
-                "details": login_response.text
-            }, "", []
-        
-        session_token = login_response.json().get('sessionToken')
-        if not session_token:
-            return {"error": "No session token received from Cloud Manager"}, ""
+        configs_data = []
+        try:
+            pages = iter_uat_config_pages(_page_getter(cm_pat_secret, cm_pat_login_url), cm_uat_configs_url)
+            for configs_response, page in pages:
+                if configs_response.status_code != 200:
+                    return _list_error(configs_response), _list_curl_command(cm_uat_configs_url, "<session-token>"), []
+                configs_data.extend(page)
+            session_token = session_cache.get_session_token(cm_pat_login_url, cm_pat_secret)
+        except (requests.exceptions.HTTPError, ValueError) as e:
+            return _login_error(e), "", []
         
-        # Step 2: Get UAT configurations
-        configs_response = requests.get(
-            cm_uat_configs_url,
-            headers={
-                'Accept': 'application/json',
-                'x-tableau-session-token': session_token
-            }
-        )
+        return _list_result(configs_data, session_token, cm_uat_configs_url)
+            
+    except Exception as e:
+        return {"error": f"Exception occurred: {str(e)}"}, "", []
+
+
+def _list_result(configs_data, session_token, cm_uat_configs_url):
+    """Turn the fetched configurations into (result, curl_cmd, config_ids)."""
+    # Generate cURL command for display
+    curl_cmd = _list_curl_command(cm_uat_configs_url, session_token)
+    
+    # Extract config IDs for radio button choices
+    config_ids = []
+    for config in configs_data:
+        # Handle nested structure: config might have 'id' as an object with 'configId'
+        config_id = extract_config_id(config)
         
-        # Generate cURL command for display
-        curl_cmd = f"""curl --location '{cm_uat_configs_url}' \\
+        if config_id:
+            config_ids.append(config_id)
+    
+    # Trust these configs' public keys for local token verification
+    token_verifier.load_uat_configs(configs_data)
+
+    result = {
+        "total_configurations": len(configs_data),
+        "configurations": configs_data
+    }
+    return result, curl_cmd, config_ids
+
+
+def _list_curl_command(cm_uat_configs_url, session_token):
+    return f"""curl --location '{cm_uat_configs_url}' \\
 --header 'Accept: application/json' \\
 --header 'x-tableau-session-token: {session_token[:20]}...'"""
-        
-        if configs_response.status_code == 200:
-                    configs_data = configs_response.json()
-                    
-                    # Extract config IDs for radio button choices
-                    config_ids = []
-                    if isinstance(configs_data, list):
-                        for config in configs_data:
-                            # Handle nested structure: config might have 'id' as an object with 'configId'
-                            if isinstance(config.get('id'), dict):
-                                config_id = config['id'].get('configId', '')
-                            else:
-                                config_id = config.get('configId', config.get('id', ''))
-                            
-                            if config_id:
-                                config_ids.append(config_id)
-                        
-                        result = {
-                            "total_configurations": len(configs_data),
-                            "configurations": configs_data
-                        }
-                    else:
-                        result = configs_data
-                    
-                    return result, curl_cmd, config_ids
-        else:
-            return {
-                "error": f"Failed to retrieve configurations: {configs_response.status_code}",
-                "details": configs_response.text
-            }, curl_cmd, []
-            
+
+
+def _mirror_result(snapshot, page, page_size, changes=None):
+    refreshed_at = snapshot["refreshed_at"]
+    result = {
+        "total_configurations": snapshot["total"],
+        "page": page,
+        "total_pages": max(1, -(-snapshot["total"] // page_size)),
+        "last_refreshed": datetime.fromtimestamp(refreshed_at).isoformat(timespec="seconds") if refreshed_at else "never",
+        "configurations": snapshot["configurations"]
+    }
+    if changes is not None:
+        result["changes"] = changes
+    return result
+
+
+def _mirror_page(source, page, page_size):
+    page = max(1, int(page or 1))
+    return page, config_mirror.snapshot(source, offset=(page - 1) * page_size, limit=page_size)
+
+
+def uat_configurations_page(cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, page=1, page_size=CONFIGS_PAGE_SIZE):
+    """
+    One page of the configurations mirrored for this PAT. The PAT must have a
+    Cloud Manager session (normally cached, so no network call).
+    Returns a tuple: (result, config_ids)
+    """
+    if not cm_pat_secret or not cm_pat_login_url or not cm_uat_configs_url:
+        return {"error": "Please configure Cloud Manager settings first"}, []
+    try:
+        session_cache.get_session_token(cm_pat_login_url, cm_pat_secret)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        return _login_error(e), []
+
+    source = mirror_source(cm_uat_configs_url, cm_pat_secret)
+    page, snapshot = _mirror_page(source, page, page_size)
+    last_page = max(1, -(-snapshot["total"] // page_size))
+    if page > last_page:
+        page, snapshot = _mirror_page(source, last_page, page_size)
+    return _mirror_result(snapshot, page, page_size), snapshot["config_ids"]
+
+
+def search_uat_configurations(cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, value, field=None):
+    """
+    Find mirrored configs by issuer, resource ID, scope, public key (PEM or
+    SHA-256 fingerprint) or kid, using the in-memory index. field=None searches
+    every field. Like the listing, the PAT must have a Cloud Manager session.
+    Returns a result dict for display.
+    """
+    if not value or not value.strip():
+        return {"error": "Enter an issuer, resource LUID, scope, public key or fingerprint to search for"}
+    if not cm_pat_secret or not cm_pat_login_url or not cm_uat_configs_url:
+        return {"error": "Please configure Cloud Manager settings first"}
+    try:
+        session_cache.get_session_token(cm_pat_login_url, cm_pat_secret)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        return _login_error(e)
+
+    index = config_mirror.index(mirror_source(cm_uat_configs_url, cm_pat_secret))
+    try:
+        matches = index.search(value, field)
+    except ValueError as e:
+        return {"error": str(e)}
+    return {
+        "query": value.strip() if "-----BEGIN" not in value else "<public key>",
+        "indexed_configurations": index.stats()["configs"],
+        "total_matches": len({extract_config_id(c) for hits in matches.values() for c in hits}),
+        "matches": {
+            f: [{"config_id": extract_config_id(c), "name": c.get("name"), "issuer": c.get("issuer")} for c in hits]
+            for f, hits in matches.items()
+        }
+    }
+
+
+async def _stream_into_mirror(cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, source, page, page_size):
+    """
+    First listing for a PAT: yield (result, config_ids) for the requested page
+    each time another page_size configs have arrived, so the UI fills in as
+    the API pages come in. Every config is then stored in the mirror and the
+    final result (with the changes) is yielded.
+    Raises httpx.HTTPStatusError if an API page fails.
+    """
+    configs = []
+    start = (page - 1) * page_size
+    async for config in aiter_uat_configurations(cm_pat_secret, cm_pat_login_url, cm_uat_configs_url):
+        configs.append(config)
+        if len(configs) % page_size == 0:
+            visible = configs[start:start + page_size]
+            snapshot = {"configurations": visible, "total": len(configs), "refreshed_at": None}
+            config_ids = [c for c in map(extract_config_id, visible) if c]
+            yield {**_mirror_result(snapshot, page, page_size), "loading": True}, config_ids
+
+    changes = await asyncio.to_thread(config_mirror.apply, source, configs)
+    token_verifier.load_uat_configs(configs)
+    changes["not_modified"] = False
+    page, snapshot = _mirror_page(source, page, page_size)
+    last_page = max(1, -(-snapshot["total"] // page_size))
+    if page > last_page:
+        page, snapshot = _mirror_page(source, last_page, page_size)
+    yield _mirror_result(snapshot, page, page_size, changes), snapshot["config_ids"]
+
+
+async def list_uat_configurations_mirrored(cm_pat_secret, cm_pat_login_url, cm_uat_configs_url,
+                                           page=1, page_size=CONFIGS_PAGE_SIZE):
+    """
+    Async generator of (result, curl_cmd, config_ids) for one page of the
+    list. Once the PAT has a Cloud Manager session, yields the local mirror
+    for that PAT straight away, refreshes it from Cloud Manager in a worker
+    thread, and yields again only if something changed. The first listing
+    for a PAT (empty mirror) is streamed as the API pages arrive instead.
+    """
+    if not cm_pat_secret or not cm_pat_login_url or not cm_uat_configs_url:
+        yield {"error": "Please configure Cloud Manager settings first"}, "", []
+        return
+
+    # Nothing is shown from the mirror until the PAT is known to be valid
+    try:
+        session_token = await session_cache.get_session_token_async(cm_pat_login_url, cm_pat_secret)
+    except (httpx.HTTPError, ValueError) as e:
+        yield _login_error(e), "", []
+        return
+
+    source = mirror_source(cm_uat_configs_url, cm_pat_secret)
+    page, snapshot = _mirror_page(source, page, page_size)
+    curl_cmd = _list_curl_command(cm_uat_configs_url, session_token)
+
+    if snapshot["refreshed_at"] is None:
+        try:
+            async for result, config_ids in _stream_into_mirror(
+                cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, source, page, page_size
+            ):
+                yield result, curl_cmd, config_ids
+        except httpx.HTTPStatusError as e:
+            yield _list_error(e.response), curl_cmd, []
+        except Exception as e:
+            yield {"error": f"Exception occurred: {str(e)}"}, curl_cmd, []
+        return
+
+    yield _mirror_result(snapshot, page, page_size), curl_cmd, snapshot["config_ids"]
+
+    try:
+        changes, error = await asyncio.to_thread(config_mirror.refresh, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url)
+    except (requests.exceptions.HTTPError, ValueError) as e:
+        yield _login_error(e), curl_cmd, snapshot["config_ids"]
+        return
     except Exception as e:
-        return {"error": f"Exception occurred: {str(e)}"}, "", []
+        yield {"error": f"Exception occurred: {str(e)}"}, curl_cmd, snapshot["config_ids"]
+        return
+
+    if error:
+        yield error, curl_cmd, snapshot["config_ids"]
+        return
+    if changes["not_modified"]:
+        return  # the UI already shows the current list
+
+    page, snapshot = _mirror_page(source, page, page_size)
+    yield _mirror_result(snapshot, page, page_size, changes), curl_cmd, snapshot["config_ids"]
 
 
 def revoke_uat_configuration(config_id, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url):
@@ -125,56 +365,139 @@ def revoke_uat_configuration(config_id, cm_pat_secret, cm_pat_login_url, cm_uat_
         return {"error": "Please configure Cloud Manager settings first"}, ""
     
     try:
-        # Step 1: Login with PAT to get session token
-        login_response = requests.post(
-            cm_pat_login_url,
-            headers={
-                'Content-Type': 'application/json',
-                'Accept': 'application/json'
-            },
-            json={"token": cm_pat_secret}
-        )
-        
-        if login_response.status_code != 200:
-            return {
-                "error": f"Failed to login to Cloud Manager: {login_response.status_code}",
-                "details": login_response.text
-            }, ""
-        
-        session_token = login_response.json().get('sessionToken')
-        if not session_token:
-            return {"error": "No session token received from Cloud Manager"}, ""
-        
-        # Step 2: Delete UAT configuration
+        # Delete UAT configuration with the shared Cloud Manager session
         delete_url = f"{cm_uat_configs_url}/{config_id}"
-        delete_response = requests.delete(
-            delete_url,
-            headers={
-                'Accept': 'application/json',
-                'x-tableau-session-token': session_token
-            }
-        )
+        try:
+            delete_response, session_token = session_cache.request_with_session(
+                cm_pat_login_url,
+                cm_pat_secret,
+                lambda session_token: transport.delete(
+                    delete_url,
+                    headers={
+                        'Accept': 'application/json',
+                        'x-tableau-session-token': session_token
+                    }
+                )
+            )
+        except (requests.exceptions.HTTPError, ValueError) as e:
+            return _login_error(e), ""
         
-        # Generate cURL command for display
-        curl_cmd = f"""curl --location --request DELETE '{delete_url}' \\
+        return _revoke_result(delete_response, session_token, delete_url, config_id)
+            
+    except Exception as e:
+        return {"error": f"Exception occurred: {str(e)}"}, ""
+
+
+def _revoke_result(delete_response, session_token, delete_url, config_id):
+    """Turn a DELETE response (requests or httpx) into (result, curl_cmd)."""
+    # Generate cURL command for display
+    curl_cmd = f"""curl --location --request DELETE '{delete_url}' \\
 --header 'Accept: application/json' \\
 --header 'x-tableau-session-token: {session_token[:20]}...'"""
-        
-        if delete_response.status_code in [200, 204]:
-            return {
-                "success": True,
-                "message": f"Configuration '{config_id}' successfully revoked",
-                "status_code": delete_response.status_code
-            }, curl_cmd
-        else:
-            return {
-                "error": f"Failed to revoke configuration: {delete_response.status_code}",
-                "details": delete_response.text
-            }, curl_cmd
-            
+    
+    if delete_response.status_code in [200, 204]:
+        return {
+            "success": True,
+            "message": f"Configuration '{config_id}' successfully revoked",
+            "status_code": delete_response.status_code
+        }, curl_cmd
+    else:
+        return {
+            "error": f"Failed to revoke configuration: {delete_response.status_code}",
+            "details": delete_response.text
+        }, curl_cmd
+
+
+# --- Async versions (single shared httpx.AsyncClient) ---
+
+async def test_tcm_connection_async(cm_jwt_login_url, results):
+    """Async test_tcm_connection."""
+    if not results.get("jwt", {}).get("token", ""): 
+        return "❌ Please run the workflow first."
+    try:
+        # Minting/verifying is synchronous RSA work; keep it off the event loop
+        jwt_token = await asyncio.to_thread(_current_jwt, results)
+        r = await async_transport.post(cm_jwt_login_url, json={"token": jwt_token})
+        return "✅ TCM API connection successful!" if r.status_code == 200 else f"❌ Failed: {r.status_code} - {r.text}"
+    except Exception as e: 
+        return f"❌ Error: {str(e)}"
+
+
+async def test_tableau_connection_async(tc_pod_url, results):
+    """Async test_tableau_connection."""
+    if results["tableau_login"]["status"] ==  "skipped":
+        return "🌐 No sites configured"
+
+    if not results.get("jwt", {}).get("token", ""): 
+        return "❌ Please run the workflow first."
+    
+    site_id = _tableau_site_id(results)
+    
+    try:
+        # Minting/verifying is synchronous RSA work; keep it off the event loop
+        jwt_token = await asyncio.to_thread(_current_jwt, results)
+        url = f"{tc_pod_url}/api/3.27/auth/signin"
+        body = {"credentials": {"jwt": jwt_token, "isUat": True, "site": {"contentUrl": site_id}}}
+        r = await async_transport.post(url, json=body)
+        return "✅ Tableau REST API connection successful!" if r.status_code == 200 else f"❌ Failed: {r.status_code} - {r.text}"
+    except Exception as e: 
+        return f"❌ Error: {str(e)}"
+
+
+async def list_uat_configurations_async(cm_pat_secret, cm_pat_login_url, cm_uat_configs_url):
+    """Async list_uat_configurations."""
+    if not cm_pat_secret or not cm_pat_login_url or not cm_uat_configs_url:
+        return {"error": "Please configure Cloud Manager settings first"}, "", []
+
+    try:
+        configs_data = []
+        try:
+            pages = aiter_uat_config_pages(_async_page_getter(cm_pat_secret, cm_pat_login_url), cm_uat_configs_url)
+            async for configs_response, page in pages:
+                if configs_response.status_code != 200:
+                    return _list_error(configs_response), _list_curl_command(cm_uat_configs_url, "<session-token>"), []
+                configs_data.extend(page)
+            session_token = await session_cache.get_session_token_async(cm_pat_login_url, cm_pat_secret)
+        except (httpx.HTTPStatusError, ValueError) as e:
+            return _login_error(e), "", []
+
+        return _list_result(configs_data, session_token, cm_uat_configs_url)
+
+    except Exception as e:
+        return {"error": f"Exception occurred: {str(e)}"}, "", []
+
+
+async def revoke_uat_configuration_async(config_id, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url):
+    """Async revoke_uat_configuration."""
+    if not config_id:
+        return {"error": "Please select a configuration to revoke"}, ""
+    
+    if not cm_pat_secret or not cm_pat_login_url or not cm_uat_configs_url:
+        return {"error": "Please configure Cloud Manager settings first"}, ""
+
+    try:
+        delete_url = f"{cm_uat_configs_url}/{config_id}"
+        try:
+            delete_response, session_token = await session_cache.request_with_session_async(
+                cm_pat_login_url,
+                cm_pat_secret,
+                lambda session_token: async_transport.delete(
+                    delete_url,
+                    headers={
+                        'Accept': 'application/json',
+                        'x-tableau-session-token': session_token
+                    }
+                )
+            )
+        except (httpx.HTTPStatusError, ValueError) as e:
+            return _login_error(e), ""
+
+        return _revoke_result(delete_response, session_token, delete_url, config_id)
+
     except Exception as e:
         return {"error": f"Exception occurred: {str(e)}"}, ""
 
+
 def update_curl_commands(results):
     """Update cURL commands for display."""
     tcm_cmd, tc_cmd = "Run the workflow first to generate the cURL command", "Run the workflow first to generate the cURL command"
@@ -0,0 +1,181 @@
+"""Bulk revocation of UAT configurations."""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+from auth.uat_config import extract_config_id
+from testing.api_testing import revoke_uat_configuration, revoke_uat_configuration_async
+from testing.config_mirror import config_mirror, mirror_source
+
+# Fields a configuration's creation time may be reported under
+_CREATED_FIELDS = ("createdAt", "createdDate", "creationDate", "created")
+
+
+def _parse_datetime(value):
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, (int, float)):
+        # Epoch seconds or milliseconds
+        parsed = datetime.fromtimestamp(value / 1000 if value > 1e11 else value, tz=timezone.utc)
+    else:
+        parsed = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _created_at(config):
+    for field in _CREATED_FIELDS:
+        if config.get(field):
+            try:
+                return _parse_datetime(config[field])
+            except (TypeError, ValueError, OverflowError):
+                return None
+    return None
+
+
+def select_configs(configs, config_ids=None, name_prefix=None, issuer=None, created_before=None):
+    """
+    Return the configs matching every given criterion: an ID in config_ids,
+    a name starting with name_prefix, this issuer, created before
+    created_before (datetime or ISO date). With no criteria nothing matches,
+    so an empty filter can never select the whole tenant.
+    """
+    if not any([config_ids, name_prefix, issuer, created_before]):
+        return []
+    wanted_ids = set(config_ids or [])
+    cutoff = _parse_datetime(created_before) if created_before else None
+
+    selected = []
+    for config in configs:
+        if not isinstance(config, dict):
+            continue
+        if wanted_ids and extract_config_id(config) not in wanted_ids:
+            continue
+        if name_prefix and not str(config.get("name", "")).startswith(name_prefix):
+            continue
+        if issuer and config.get("issuer") != issuer:
+            continue
+        if cutoff is not None:
+            created = _created_at(config)
+            if created is None or created >= cutoff:
+                continue
+        selected.append(config)
+    return selected
+
+
+def resolve_targets(cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, config_ids=None, name_prefix=None,
+                    issuer=None, created_before=None):
+    """
+    Refresh the local mirror and pick the configs to revoke.
+    Explicit IDs that are not (or no longer) in the tenant are kept so the
+    DELETE reports them. Returns a tuple: (targets, error) where each target
+    is {"config_id", "name", "issuer"}.
+    """
+    _, error = config_mirror.refresh(cm_pat_secret, cm_pat_login_url, cm_uat_configs_url)
+    if error:
+        return [], error
+    configs = config_mirror.snapshot(mirror_source(cm_uat_configs_url, cm_pat_secret))["configurations"]
+    selected = select_configs(configs, config_ids, name_prefix, issuer, created_before)
+
+    targets = [
+        {"config_id": extract_config_id(config), "name": config.get("name"), "issuer": config.get("issuer")}
+        for config in selected
+    ]
+    if config_ids and not any([name_prefix, issuer, created_before]):
+        known = {target["config_id"] for target in targets}
+        targets += [{"config_id": c, "name": None, "issuer": None} for c in config_ids if c not in known]
+    return targets, None
+
+
+def _revoke_one(config_id, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url):
+    started = time.perf_counter()
+    result, _ = revoke_uat_configuration(config_id, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url)
+    return _revoke_report(config_id, result, started)
+
+
+async def _revoke_one_async(semaphore, config_id, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url):
+    async with semaphore:
+        started = time.perf_counter()
+        result, _ = await revoke_uat_configuration_async(config_id, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url)
+        return _revoke_report(config_id, result, started)
+
+
+def _revoke_report(config_id, result, started):
+    return {
+        "config_id": config_id,
+        "status": "revoked" if result.get("success") else "failed",
+        "status_code": result.get("status_code"),
+        "message": result.get("message") or result.get("error"),
+        "details": result.get("details"),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def iter_bulk_revoke(config_ids, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, max_workers=None, dry_run=False):
+    """
+    Generator of per-ID result dicts, yielded as each DELETE finishes.
+    At most max_workers DELETEs run at once, all on the shared Cloud Manager
+    session (one PAT login). With dry_run nothing is deleted and every ID is
+    reported as "would_revoke". Revoked IDs are dropped from the local mirror.
+    """
+    config_ids = list(dict.fromkeys(config_ids))  # de-duplicate, keep order
+    if dry_run:
+        for config_id in config_ids:
+            yield {"config_id": config_id, "status": "would_revoke"}
+        return
+
+    max_workers = max(1, int(max_workers or os.getenv("UAT_BULK_MAX_WORKERS", "4")))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="uat-revoke") as executor:
+        futures = [
+            executor.submit(_revoke_one, config_id, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url)
+            for config_id in config_ids
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            if result["status"] == "revoked":
+                config_mirror.remove(mirror_source(cm_uat_configs_url, cm_pat_secret), [result["config_id"]])
+            yield result
+
+
+async def aiter_bulk_revoke(config_ids, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, max_workers=None,
+                            dry_run=False):
+    """
+    Async iter_bulk_revoke: the DELETEs run on the shared async transport,
+    at most max_workers at once, without tying up a thread per request.
+    """
+    config_ids = list(dict.fromkeys(config_ids))  # de-duplicate, keep order
+    if dry_run:
+        for config_id in config_ids:
+            yield {"config_id": config_id, "status": "would_revoke"}
+        return
+
+    max_workers = max(1, int(max_workers or os.getenv("UAT_BULK_MAX_WORKERS", "4")))
+    semaphore = asyncio.Semaphore(max_workers)
+    tasks = [
+        asyncio.ensure_future(_revoke_one_async(semaphore, config_id, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url))
+        for config_id in config_ids
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            if result["status"] == "revoked":
+                await asyncio.to_thread(
+                    config_mirror.remove, mirror_source(cm_uat_configs_url, cm_pat_secret), [result["config_id"]]
+                )
+            yield result
+    finally:
+        # The caller stopped early (e.g. the UI request was cancelled): do not leave DELETEs running
+        for task in tasks:
+            task.cancel()
+
+
+def bulk_revoke(config_ids, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, max_workers=None, dry_run=False):
+    """Run iter_bulk_revoke to completion. Returns a tuple: (results, summary counts)."""
+    started = time.perf_counter()
+    results = list(iter_bulk_revoke(config_ids, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url, max_workers, dry_run))
+    summary = {"total": len(results), "dry_run": dry_run, "seconds": round(time.perf_counter() - started, 3)}
+    for result in results:
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+    return results, summary
@@ -0,0 +1,130 @@
+"""In-memory inverted index over UAT configurations."""
+
+import hashlib
+import threading
+
+from cryptography.hazmat.primitives import serialization
+
+from auth.jwks import key_thumbprint
+from auth.uat_config import extract_config_id
+
+INDEX_FIELDS = ("issuer", "resourceId", "scope", "keyFingerprint", "kid")
+
+
+def _load_public_key(pem):
+    return serialization.load_pem_public_key(pem.encode("utf-8") if isinstance(pem, str) else pem)
+
+
+def _der_fingerprint(key):
+    der = key.public_bytes(serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo)
+    return hashlib.sha256(der).hexdigest()
+
+
+def _text_fingerprint(pem):
+    return hashlib.sha256("".join(str(pem).split()).encode("utf-8")).hexdigest()
+
+
+def public_key_fingerprint(pem):
+    """
+    SHA-256 (hex) of a public key's DER SubjectPublicKeyInfo, so PEM line
+    wrapping does not matter. Unparseable text is hashed with whitespace removed.
+    """
+    try:
+        return _der_fingerprint(_load_public_key(pem))
+    except (TypeError, ValueError):
+        return _text_fingerprint(pem)
+
+
+def _key_terms(pem):
+    # Parse once for both the fingerprint and the kid
+    try:
+        key = _load_public_key(pem)
+        return [("keyFingerprint", _der_fingerprint(key)), ("kid", key_thumbprint(key))]
+    except (TypeError, ValueError):
+        return [("keyFingerprint", _text_fingerprint(pem))]
+
+
+def _terms(config):
+    terms = []
+    if config.get("issuer"):
+        terms.append(("issuer", config["issuer"]))
+    terms += [("resourceId", resource_id) for resource_id in config.get("resourceIds") or []]
+    terms += [("scope", scope) for scope in config.get("scopes") or []]
+    if config.get("publicKey"):
+        terms += _key_terms(config["publicKey"])
+    return terms
+
+
+class ConfigIndex:
+    """
+    Postings from (field, value) to config IDs for issuer, every resourceId,
+    every scope, the publicKey fingerprint and its JWK thumbprint (kid).
+    Lookups are a dict access; upsert()/remove() keep it current as configs
+    change, without rebuilding.
+    """
+    def __init__(self, configs=None):
+        self._postings = {}  # (field, value) -> set of config IDs
+        self._configs = {}   # config ID -> (config, its terms)
+        self._lock = threading.Lock()
+        for config in configs or []:
+            self.upsert(config)
+
+    def _unlink(self, config_id):
+        # Caller holds self._lock
+        _, terms = self._configs.pop(config_id, (None, ()))
+        for term in terms:
+            ids = self._postings.get(term)
+            if ids is not None:
+                ids.discard(config_id)
+                if not ids:
+                    del self._postings[term]
+
+    def upsert(self, config, config_id=None):
+        """Add or replace one config."""
+        config_id = config_id or extract_config_id(config)
+        terms = tuple(set(_terms(config)))
+        with self._lock:
+            self._unlink(config_id)
+            self._configs[config_id] = (config, terms)
+            for term in terms:
+                self._postings.setdefault(term, set()).add(config_id)
+
+    def remove(self, config_id):
+        """Drop one config."""
+        with self._lock:
+            self._unlink(config_id)
+
+    def query(self, field, value):
+        """Configs whose field (one of INDEX_FIELDS) has exactly this value."""
+        if field not in INDEX_FIELDS:
+            raise ValueError(f"Unknown index field '{field}'. Use one of: {', '.join(INDEX_FIELDS)}")
+        if field == "keyFingerprint" and "-----BEGIN" in str(value):
+            value = public_key_fingerprint(value)
+        with self._lock:
+            return [self._configs[config_id][0] for config_id in sorted(self._postings.get((field, value), ()))]
+
+    def by_issuer(self, issuer):
+        return self.query("issuer", issuer)
+
+    def by_resource_id(self, resource_id):
+        return self.query("resourceId", resource_id)
+
+    def by_scope(self, scope):
+        return self.query("scope", scope)
+
+    def by_public_key(self, pem_or_fingerprint):
+        return self.query("keyFingerprint", pem_or_fingerprint)
+
+    def search(self, value, field=None):
+        """Look value up in one field, or in every field. Returns {field: [configs]} for fields with hits."""
+        value = value.strip()
+        fields = [field] if field else INDEX_FIELDS
+        return {f: hits for f in fields if (hits := self.query(f, value))}
+
+    def stats(self):
+        """Return index sizes for monitoring."""
+        with self._lock:
+            per_field = {}
+            for field, _ in self._postings:
+                per_field[field] = per_field.get(field, 0) + 1
+            return {"configs": len(self._configs), "terms": len(self._postings), "distinct_values": per_field}
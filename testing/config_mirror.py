@@ -0,0 +1,243 @@
+"""Persisted local mirror of the tenant's UAT configurations."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+
+from auth.cloud_manager_auth import session_cache
+from auth.uat_config import extract_config_id, iter_uat_config_pages
+from auth.verifier import token_verifier
+from testing.config_index import ConfigIndex
+from utils import transport
+
+MIRROR_PATH = Path(os.getenv("UAT_MIRROR_PATH", "keys/uat_mirror.sqlite3"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS configs (
+    source TEXT NOT NULL,
+    config_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT,
+    content_hash TEXT NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (source, config_id)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    source TEXT PRIMARY KEY,
+    etag TEXT,
+    list_hash TEXT,
+    refreshed_at REAL
+);
+"""
+
+
+def _hash(data):
+    return hashlib.sha256(json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def mirror_source(cm_uat_configs_url, cm_pat_secret):
+    """
+    Mirror key for an endpoint as seen with one PAT: the URL plus a SHA-256 of
+    the secret (never the secret itself), so configs and ETags fetched with
+    one tenant's credentials are never served to another.
+    """
+    return f"{cm_uat_configs_url}#{hashlib.sha256((cm_pat_secret or '').encode('utf-8')).hexdigest()}"
+
+
+class ConfigMirror:
+    """
+    SQLite copy of the configurations endpoint, one row per config keyed by
+    (source, config ID), with the ID extracted once at write time. The source
+    is mirror_source(endpoint URL, PAT secret); refresh() computes it, the
+    read methods take it.
+
+    refresh() follows the endpoint's pagination. It sends If-None-Match with
+    the last ETag when the (single-page) list came with one; otherwise it
+    compares a hash of the whole list with the stored one.
+    Only configs whose content hash changed are rewritten, and the caller
+    gets back which IDs were added, updated or removed.
+    """
+    def __init__(self, db_path=MIRROR_PATH):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._ready = False
+        self._trusted = set()  # sources whose keys were handed to the verifier this process
+        self._indexes = {}  # source -> ConfigIndex, built on first use and then kept in step
+
+    def _connect(self):
+        if not self._ready:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(self.db_path)) as conn:
+                conn.executescript(_SCHEMA)
+            self._ready = True
+        return closing(sqlite3.connect(self.db_path))
+
+    def snapshot(self, source, offset=0, limit=None):
+        """
+        Return the mirrored state for a source (optionally one slice of it),
+        without any network call:
+        {"configurations": [...], "config_ids": [...], "total": n, "refreshed_at": epoch or None}
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT config_id, body FROM configs WHERE source = ? ORDER BY position LIMIT ? OFFSET ?",
+                (source, -1 if limit is None else limit, offset)
+            ).fetchall()
+            total = conn.execute("SELECT COUNT(*) FROM configs WHERE source = ?", (source,)).fetchone()[0]
+            state = conn.execute("SELECT refreshed_at FROM sync_state WHERE source = ?", (source,)).fetchone()
+        return {
+            "configurations": [json.loads(body) for _, body in rows],
+            "config_ids": [config_id for config_id, _ in rows if not config_id.startswith("#")],
+            "total": total,
+            "refreshed_at": state[0] if state else None,
+        }
+
+    def _state(self, conn, source):
+        row = conn.execute("SELECT etag, list_hash FROM sync_state WHERE source = ?", (source,)).fetchone()
+        return row if row else (None, None)
+
+    def apply(self, source, configs, etag=None):
+        """Store a freshly fetched list. Returns {"added", "updated", "removed"} config IDs."""
+        list_hash = _hash(configs)
+        changes = {"added": [], "updated": [], "removed": []}
+        with self._lock, self._connect() as conn, conn:
+            if self._state(conn, source)[1] == list_hash:
+                conn.execute(
+                    "UPDATE sync_state SET etag = ?, refreshed_at = ? WHERE source = ?", (etag, time.time(), source)
+                )
+                return changes
+
+            stored = dict(conn.execute("SELECT config_id, content_hash FROM configs WHERE source = ?", (source,)))
+            seen = set()
+            changed = []
+            for position, config in enumerate(configs):
+                config_id = extract_config_id(config) or f"#{position}"
+                seen.add(config_id)
+                content_hash = _hash(config)
+                if stored.get(config_id) == content_hash:
+                    conn.execute(
+                        "UPDATE configs SET position = ? WHERE source = ? AND config_id = ?", (position, source, config_id)
+                    )
+                    continue
+                changes["updated" if config_id in stored else "added"].append(config_id)
+                changed.append((config_id, config))
+                conn.execute(
+                    "INSERT OR REPLACE INTO configs (source, config_id, position, name, content_hash, body) VALUES (?, ?, ?, ?, ?, ?)",
+                    (source, config_id, position, config.get("name") if isinstance(config, dict) else None,
+                     content_hash, json.dumps(config))
+                )
+            changes["removed"] = [config_id for config_id in stored if config_id not in seen]
+            conn.executemany(
+                "DELETE FROM configs WHERE source = ? AND config_id = ?", [(source, c) for c in changes["removed"]]
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state (source, etag, list_hash, refreshed_at) VALUES (?, ?, ?, ?)",
+                (source, etag, list_hash, time.time())
+            )
+            # Under the same lock, so a concurrent apply/remove cannot interleave its index edits with these
+            self._update_index(source, changed, changes["removed"])
+        return changes
+
+    def _update_index(self, source, changed=(), removed=()):
+        index = self._indexes.get(source)
+        if index is None:
+            return
+        for config_id in removed:
+            index.remove(config_id)
+        for config_id, config in changed:
+            index.upsert(config, config_id)
+
+    def index(self, source):
+        """The ConfigIndex over the mirrored configs for a source (built from SQLite on first use)."""
+        with self._lock:
+            index = self._indexes.get(source)
+            if index is None:
+                # Built under the lock, so no apply/remove lands between the read and the index going live
+                with self._connect() as conn:
+                    rows = conn.execute("SELECT config_id, body FROM configs WHERE source = ?", (source,)).fetchall()
+                index = self._indexes[source] = ConfigIndex()
+                for config_id, body in rows:
+                    index.upsert(json.loads(body), config_id)
+            return index
+
+    def refresh(self, cm_pat_secret, cm_pat_login_url, cm_uat_configs_url):
+        """
+        Bring the mirror up to date with Cloud Manager.
+        Returns a tuple: (changes, error) where changes also has "not_modified"
+        and error is None or an error dict like list_uat_configurations returns.
+        """
+        source = mirror_source(cm_uat_configs_url, cm_pat_secret)
+        with self._connect() as conn:
+            etag, _ = self._state(conn, source)
+
+        def get(url, params):
+            conditional = etag and url == cm_uat_configs_url and not (params or {}).get("pageToken")
+
+            def send(session_token):
+                headers = {'Accept': 'application/json', 'x-tableau-session-token': session_token}
+                if conditional:
+                    headers['If-None-Match'] = etag
+                return transport.get(url, params=params, headers=headers)
+
+            return session_cache.request_with_session(cm_pat_login_url, cm_pat_secret, send)[0]
+
+        configs = []
+        new_etag = None
+        for page_number, (response, page) in enumerate(iter_uat_config_pages(get, cm_uat_configs_url)):
+            if response.status_code == 304:
+                with self._lock, self._connect() as conn, conn:
+                    conn.execute("UPDATE sync_state SET refreshed_at = ? WHERE source = ?", (time.time(), source))
+                self._trust(source)
+                return {"added": [], "updated": [], "removed": [], "not_modified": True}, None
+            if response.status_code != 200:
+                return None, {
+                    "error": f"Failed to retrieve configurations: {response.status_code}",
+                    "details": response.text
+                }
+            # A first-page ETag does not cover later pages, so only single-page lists are refreshed conditionally
+            new_etag = response.headers.get("ETag") if page_number == 0 else None
+            configs.extend(page)
+
+        changes = self.apply(source, configs, new_etag)
+
+        self._trust(source, configs, set(changes["added"]) | set(changes["updated"]))
+        changes["not_modified"] = not any(changes.values())
+        return changes, None
+
+    def _trust(self, source, configs=None, changed=None):
+        # Hand public keys to the local verifier: everything once per process, then only changed configs
+        if source not in self._trusted:
+            token_verifier.load_uat_configs(configs if configs is not None else self.snapshot(source)["configurations"])
+            self._trusted.add(source)
+        elif changed:
+            token_verifier.load_uat_configs([c for c in configs if extract_config_id(c) in changed])
+
+    def remove(self, source, config_ids):
+        """Drop configs known to be gone (e.g. just revoked) without waiting for the next refresh."""
+        with self._lock, self._connect() as conn, conn:
+            conn.executemany(
+                "DELETE FROM configs WHERE source = ? AND config_id = ?", [(source, c) for c in config_ids]
+            )
+            # The stored list hash / ETag no longer describe the mirror
+            conn.execute("UPDATE sync_state SET etag = NULL, list_hash = NULL WHERE source = ?", (source,))
+            self._update_index(source, removed=config_ids)
+
+    def clear(self, source=None):
+        """Forget the mirrored configs for one source, or for all of them."""
+        with self._lock, self._connect() as conn, conn:
+            if source is None:
+                self._indexes.clear()
+                conn.execute("DELETE FROM configs")
+                conn.execute("DELETE FROM sync_state")
+            else:
+                self._indexes.pop(source, None)
+                conn.execute("DELETE FROM configs WHERE source = ?", (source,))
+                conn.execute("DELETE FROM sync_state WHERE source = ?", (source,))
+
+
+config_mirror = ConfigMirror()
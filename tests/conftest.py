@@ -0,0 +1,27 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run the test in an empty directory, so keys/ and the mirror database are throwaway."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "keys").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def make_keys(workdir):
+    """generate_key_pair into the test's keys/ directory; returns the factory."""
+    from auth.key_cache import signing_key_cache
+    from auth.keygen import generate_key_pair
+
+    signing_key_cache.invalidate()
+    yield lambda algorithm="RS256": generate_key_pair(algorithm, 2048)
+    signing_key_cache.invalidate()
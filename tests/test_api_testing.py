@@ -0,0 +1,38 @@
+import asyncio
+import importlib
+import threading
+
+api_testing = importlib.import_module("testing.api_testing")
+
+
+class _Response:
+    status_code = 200
+    text = ""
+
+
+def test_async_connection_tests_mint_off_the_event_loop(monkeypatch):
+    minted_on = []
+
+    def current_jwt(results):
+        minted_on.append(threading.current_thread())
+        return "token"
+
+    async def post(url, **kwargs):
+        assert kwargs["json"] in ({"token": "token"}, {"credentials": {"jwt": "token", "isUat": True, "site": {"contentUrl": "default"}}})
+        return _Response()
+
+    monkeypatch.setattr(api_testing, "_current_jwt", current_jwt)
+    monkeypatch.setattr(api_testing.async_transport, "post", post)
+    results = {"jwt": {"token": "workflow-token"}, "tableau_login": {"status": "success"}}
+
+    async def run():
+        loop_thread = threading.current_thread()
+        tcm = await api_testing.test_tcm_connection_async("https://cm.example.com/login", results)
+        tableau = await api_testing.test_tableau_connection_async("https://pod.example.com", results)
+        return loop_thread, tcm, tableau
+
+    loop_thread, tcm, tableau = asyncio.run(run())
+
+    assert tcm.startswith("✅") and tableau.startswith("✅")
+    assert len(minted_on) == 2
+    assert all(thread is not loop_thread for thread in minted_on)
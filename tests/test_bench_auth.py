@@ -0,0 +1,51 @@
+import json
+
+from benchmarks import bench_auth
+
+
+def _report(**ops):
+    return {"results": [{"name": name, "ops_per_sec": value} for name, value in ops.items()]}
+
+
+def test_run_benchmark_counts_calls_and_excludes_setup():
+    calls = {"fn": 0, "setup": 0}
+
+    def fn():
+        calls["fn"] += 1
+
+    def setup():
+        calls["setup"] += 1
+
+    result = bench_auth.run_benchmark("noop", fn, 5, setup=setup, warmup=2)
+
+    # warmup + timed iterations + the tracemalloc pass
+    assert calls == {"fn": 8, "setup": 8}
+    assert result["iterations"] == 5
+    assert result["p50_ms"] <= result["p99_ms"]
+    assert result["ops_per_sec"] > 0
+
+
+def test_compare_flags_only_drops_beyond_tolerance():
+    baseline = _report(a=100.0, b=100.0, c=100.0)
+    report = _report(a=95.0, b=80.0, d=50.0)
+
+    comparisons, regressions = bench_auth.compare_to_baseline(report, baseline, 0.10)
+
+    assert [c["name"] for c in comparisons] == ["a", "b"]
+    assert [r["name"] for r in regressions] == ["b"]
+    assert round(regressions[0]["change"], 2) == -0.20
+
+
+def test_main_fails_on_regression_and_writes_report(tmp_path, monkeypatch):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(_report(build_jwt=1000.0)))
+    output = tmp_path / "report.json"
+    fake = {"name": "build_jwt", "iterations": 1, "ops_per_sec": 500.0, "mean_ms": 2.0,
+            "p50_ms": 2.0, "p99_ms": 2.0, "peak_memory_kib": 1.0}
+    monkeypatch.setattr(bench_auth, "benchmark_suite", lambda quick=False: [fake])
+
+    exit_code = bench_auth.main(["--baseline", str(baseline), "--output", str(output)])
+
+    assert exit_code == 1
+    report = json.loads(output.read_text())
+    assert report["baseline_comparison"]["comparisons"][0]["change"] == -0.5
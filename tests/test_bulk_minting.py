@@ -0,0 +1,60 @@
+import jwt
+
+from auth.jwt_builder import build_jwts, iter_jwts
+from auth.key_cache import load_signing_key
+
+
+def _claims(token):
+    return jwt.decode(token, load_signing_key().public_key(), algorithms=["RS256"])
+
+
+def test_tokens_come_back_in_request_order(make_keys):
+    make_keys()
+    requests = [(f"user{i}@example.com", [f"tableau:scope{i}:read"], 1 + i % 3) for i in range(6)]
+
+    tokens, stats = build_jwts("iss", "tenant", requests, max_workers=1)
+
+    assert [_claims(t)["email"] for t in tokens] == [r[0] for r in requests]
+    assert [_claims(t)["scp"] for t in tokens] == [r[1] for r in requests]
+    for token, (_, _, minutes) in zip(tokens, requests):
+        claims = _claims(token)
+        assert claims["exp"] - claims["iat"] == minutes * 60
+    assert stats["tokens"] == len(requests)
+
+
+def test_process_pool_matches_in_process_signing(make_keys):
+    make_keys()
+    requests = [(f"user{i}", ["tableau:content:read"], 5) for i in range(5)]
+
+    tokens, _ = build_jwts("iss", "tenant", requests, max_workers=2, chunksize=2)
+
+    assert [_claims(t)["email"] for t in tokens] == [f"user{i}" for i in range(5)]
+    assert len({_claims(t)["jti"] for t in tokens}) == 5
+
+
+def test_pool_reads_requests_as_tokens_are_consumed(make_keys):
+    make_keys()
+    consumed = []
+
+    def requests():
+        for i in range(1000):
+            consumed.append(i)
+            yield (f"user{i}", ["tableau:content:read"], 5)
+
+    tokens = iter_jwts("iss", "tenant", requests(), max_workers=2, chunksize=2)
+    assert _claims(next(tokens))["email"] == "user0"
+    tokens.close()
+
+    # At most two batches (of chunksize 2) per worker were submitted
+    assert len(consumed) <= 2 * 2 * 2
+
+
+def test_iter_jwts_updates_stats_as_it_goes(make_keys):
+    make_keys()
+    stats = {}
+    tokens = iter_jwts("iss", "tenant", [("a", [], 5), ("b", [], 5)], max_workers=1, stats=stats)
+
+    next(tokens)
+    assert stats["tokens"] == 1
+    next(tokens)
+    assert stats["tokens"] == 2
@@ -0,0 +1,93 @@
+import asyncio
+import importlib
+
+import httpx
+import pytest
+
+from auth.cloud_manager_auth import SessionCache
+from testing.bulk_revoke import aiter_bulk_revoke, select_configs
+from testing.config_mirror import ConfigMirror, mirror_source
+
+bulk_revoke_module = importlib.import_module("testing.bulk_revoke")
+api_testing = importlib.import_module("testing.api_testing")
+cloud_manager_auth = importlib.import_module("auth.cloud_manager_auth")
+
+URL = "https://cm.example.com/api/v1/uat-configs"
+LOGIN_URL = "https://cm.example.com/api/v1/pat/login"
+CONFIGS = [
+    {"id": {"configId": "1"}, "name": "test-a", "issuer": "iss-1", "createdAt": "2024-01-01T00:00:00Z"},
+    {"id": {"configId": "2"}, "name": "test-b", "issuer": "iss-2", "createdAt": 1735689600000},  # 2025-01-01 in ms
+    {"id": {"configId": "3"}, "name": "prod-a", "issuer": "iss-1"},
+]
+
+
+def _ids(configs):
+    return [config["id"]["configId"] for config in configs]
+
+
+@pytest.mark.parametrize("criteria, expected", [
+    ({}, []),
+    ({"config_ids": ["2", "3"]}, ["2", "3"]),
+    ({"name_prefix": "test-"}, ["1", "2"]),
+    ({"name_prefix": "test-", "issuer": "iss-1"}, ["1"]),
+    ({"created_before": "2024-06-01"}, ["1"]),  # a config without a creation time never matches
+])
+def test_select_configs_matches_every_criterion(criteria, expected):
+    assert _ids(select_configs(CONFIGS, **criteria)) == expected
+
+
+class _AsyncCloudManager:
+    """Fake async DELETE endpoint: tracks concurrency, 404s unknown IDs."""
+    def __init__(self, known_ids):
+        self.known_ids = set(known_ids)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def delete(self, url, headers=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        config_id = url.rsplit("/", 1)[-1]
+        status = 204 if config_id in self.known_ids else 404
+        return httpx.Response(status, request=httpx.Request("DELETE", url))
+
+
+@pytest.fixture
+def cloud_manager(workdir, monkeypatch):
+    fake = _AsyncCloudManager(["1", "2", "3"])
+    mirror = ConfigMirror(workdir / "mirror.sqlite3")
+    mirror.apply(mirror_source(URL, "pat"), CONFIGS)
+
+    async def login(login_url, pat_secret):
+        return "session"
+
+    monkeypatch.setattr(cloud_manager_auth, "_pat_login_async", login)
+    monkeypatch.setattr(api_testing, "session_cache", SessionCache(ttl_seconds=600))
+    monkeypatch.setattr(api_testing, "async_transport", fake)
+    monkeypatch.setattr(bulk_revoke_module, "config_mirror", mirror)
+    fake.mirror = mirror
+    return fake
+
+
+def _collect(config_ids, **kwargs):
+    async def collect():
+        return [r async for r in aiter_bulk_revoke(config_ids, "pat", LOGIN_URL, URL, **kwargs)]
+    return asyncio.run(collect())
+
+
+def test_async_bulk_revoke_is_bounded_and_updates_the_mirror(cloud_manager):
+    results = _collect(["1", "2", "1", "missing"], max_workers=2)
+
+    statuses = {r["config_id"]: r["status"] for r in results}
+    assert statuses == {"1": "revoked", "2": "revoked", "missing": "failed"}
+    assert cloud_manager.max_in_flight == 2
+    assert cloud_manager.mirror.snapshot(mirror_source(URL, "pat"))["config_ids"] == ["3"]
+
+
+def test_async_dry_run_deletes_nothing(cloud_manager):
+    results = _collect(["1", "2"], dry_run=True)
+
+    assert results == [{"config_id": "1", "status": "would_revoke"}, {"config_id": "2", "status": "would_revoke"}]
+    assert cloud_manager.max_in_flight == 0
+    assert cloud_manager.mirror.snapshot(mirror_source(URL, "pat"))["total"] == 3
@@ -0,0 +1,89 @@
+import importlib
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+
+from auth.cloud_manager_auth import SessionCache
+from auth.jwks import key_thumbprint
+from auth.keygen import generate_private_key
+from testing.config_index import ConfigIndex, public_key_fingerprint
+from testing.config_mirror import ConfigMirror, mirror_source
+
+api_testing = importlib.import_module("testing.api_testing")
+cloud_manager_auth = importlib.import_module("auth.cloud_manager_auth")
+
+URL = "https://cm.example.com/api/v1/uat-configs"
+LOGIN_URL = "https://cm.example.com/api/v1/pat/login"
+
+
+def _pem(key):
+    return key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+
+
+@pytest.fixture(scope="module")
+def key():
+    return generate_private_key("ES256")
+
+
+def _config(config_id, **fields):
+    return {"id": {"configId": config_id}, "name": config_id, **fields}
+
+
+def test_fingerprint_ignores_pem_wrapping(key):
+    pem = _pem(key)
+    rewrapped = pem.replace("\n", "\r\n")
+
+    assert public_key_fingerprint(pem) == public_key_fingerprint(rewrapped)
+    assert public_key_fingerprint("not a key") == public_key_fingerprint(" not a\nkey ")
+
+
+def test_every_field_is_indexed(key):
+    pem = _pem(key)
+    index = ConfigIndex([
+        _config("1", issuer="iss", resourceIds=["site-a", "site-b"], scopes=["tableau:content:read"], publicKey=pem),
+        _config("2", issuer="iss", resourceIds=["site-b"]),
+    ])
+
+    assert [c["name"] for c in index.by_issuer("iss")] == ["1", "2"]
+    assert [c["name"] for c in index.by_resource_id("site-b")] == ["1", "2"]
+    assert [c["name"] for c in index.by_scope("tableau:content:read")] == ["1"]
+    assert [c["name"] for c in index.by_public_key(pem)] == ["1"]
+    assert [c["name"] for c in index.query("kid", key_thumbprint(key.public_key()))] == ["1"]
+    assert set(index.search("site-a")) == {"resourceId"}
+
+
+def test_upsert_and_remove_keep_postings_current():
+    index = ConfigIndex([_config("1", issuer="old")])
+
+    index.upsert(_config("1", issuer="new"))
+    assert index.by_issuer("old") == []
+    assert [c["issuer"] for c in index.by_issuer("new")] == ["new"]
+
+    index.remove("1")
+    assert index.stats() == {"configs": 0, "terms": 0, "distinct_values": {}}
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(ValueError, match="Unknown index field"):
+        ConfigIndex().query("name", "x")
+
+
+def test_search_needs_a_logged_in_pat(workdir, monkeypatch):
+    def login(login_url, pat_secret):
+        if pat_secret != "pat":
+            raise ValueError("No session token received from Cloud Manager")
+        return "session"
+
+    mirror = ConfigMirror(workdir / "mirror.sqlite3")
+    mirror.apply(mirror_source(URL, "pat"), [_config("1", issuer="iss")])
+    monkeypatch.setattr(cloud_manager_auth, "_pat_login", login)
+    monkeypatch.setattr(api_testing, "session_cache", SessionCache(ttl_seconds=600))
+    monkeypatch.setattr(api_testing, "config_mirror", mirror)
+
+    assert api_testing.search_uat_configurations("pat", LOGIN_URL, URL, "iss")["total_matches"] == 1
+    assert api_testing.search_uat_configurations("revoked-pat", LOGIN_URL, URL, "iss") == {
+        "error": "No session token received from Cloud Manager"
+    }
+    assert "error" in api_testing.search_uat_configurations("", LOGIN_URL, URL, "iss")
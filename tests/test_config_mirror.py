@@ -0,0 +1,192 @@
+import asyncio
+import importlib
+import json
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from auth.cloud_manager_auth import SessionCache
+from testing.config_mirror import ConfigMirror, mirror_source
+
+config_mirror_module = importlib.import_module("testing.config_mirror")
+cloud_manager_auth = importlib.import_module("auth.cloud_manager_auth")
+api_testing = importlib.import_module("testing.api_testing")
+
+URL = "https://cm.example.com/api/v1/uat-configs"
+LOGIN_URL = "https://cm.example.com/api/v1/pat/login"
+
+
+def _config(config_id, **fields):
+    return {"id": {"configId": config_id}, "name": f"cfg-{config_id}", "issuer": "iss", **fields}
+
+
+class _Response:
+    def __init__(self, status_code, data=None, etag=None):
+        self.status_code = status_code
+        self._data = data
+        self.text = json.dumps(data)
+        self.headers = {"ETag": etag} if etag else {}
+        self.links = {}
+
+    def json(self):
+        return self._data
+
+
+class _Tenants:
+    """Fake Cloud Manager: each PAT belongs to a tenant with its own configs and ETag."""
+    def __init__(self, **configs_by_pat):
+        self.configs = configs_by_pat
+        self.requests = []
+
+    def login(self, login_url, pat_secret):
+        if pat_secret not in self.configs:
+            raise ValueError("No session token received from Cloud Manager")
+        return f"session-{pat_secret}"
+
+    async def login_async(self, login_url, pat_secret):
+        return self.login(login_url, pat_secret)
+
+    def get(self, url, params=None, headers=None):
+        pat = headers["x-tableau-session-token"].removeprefix("session-")
+        etag = f'"{pat}-{len(self.configs[pat])}"'
+        self.requests.append((pat, headers.get("If-None-Match")))
+        if headers.get("If-None-Match") == etag:
+            return _Response(304)
+        return _Response(200, self.configs[pat], etag)
+
+
+@pytest.fixture
+def tenants(workdir, monkeypatch):
+    fake = _Tenants(**{"pat-a": [_config("a1"), _config("a2")], "pat-b": [_config("b1")]})
+    sessions = SessionCache(ttl_seconds=600)
+    mirror = ConfigMirror(workdir / "mirror.sqlite3")
+    monkeypatch.setattr(cloud_manager_auth, "_pat_login", fake.login)
+    monkeypatch.setattr(cloud_manager_auth, "_pat_login_async", fake.login_async)
+    monkeypatch.setattr(config_mirror_module, "session_cache", sessions)
+    monkeypatch.setattr(config_mirror_module, "transport", types.SimpleNamespace(get=fake.get))
+    monkeypatch.setattr(api_testing, "session_cache", sessions)
+    monkeypatch.setattr(api_testing, "config_mirror", mirror)
+    fake.mirror = mirror
+    return fake
+
+
+def test_source_hides_the_pat():
+    source = mirror_source(URL, "secret-pat")
+
+    assert source.startswith(URL)
+    assert "secret-pat" not in source
+    assert source != mirror_source(URL, "other-pat")
+
+
+def test_apply_reports_changes_and_keeps_order(workdir):
+    mirror = ConfigMirror(workdir / "mirror.sqlite3")
+
+    assert mirror.apply("src", [_config("1"), _config("2")])["added"] == ["1", "2"]
+    changes = mirror.apply("src", [_config("2", name="renamed"), _config("3")])
+
+    assert changes == {"added": ["3"], "updated": ["2"], "removed": ["1"]}
+    snapshot = mirror.snapshot("src", offset=0, limit=1)
+    assert snapshot["config_ids"] == ["2"]
+    assert snapshot["total"] == 2
+
+    mirror.remove("src", ["2"])
+    assert mirror.snapshot("src")["config_ids"] == ["3"]
+
+
+def test_index_stays_in_step_with_concurrent_writes(workdir):
+    mirror = ConfigMirror(workdir / "mirror.sqlite3")
+    index = mirror.index("src")
+    lists = [[_config(str(n)) for n in range(start, start + 5)] for start in range(0, 40, 4)]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda configs: mirror.apply("src", configs), lists * 3))
+        list(pool.map(lambda n: mirror.remove("src", [str(n)]), range(0, 40, 8)))
+
+    assert index.stats()["configs"] == mirror.snapshot("src")["total"]
+    assert sorted(c["id"]["configId"] for c in index.by_issuer("iss")) == sorted(mirror.snapshot("src")["config_ids"])
+
+
+def test_each_pat_has_its_own_rows_and_etag(tenants):
+    mirror = tenants.mirror
+    mirror.refresh("pat-a", LOGIN_URL, URL)
+    mirror.refresh("pat-b", LOGIN_URL, URL)
+
+    assert mirror.snapshot(mirror_source(URL, "pat-a"))["config_ids"] == ["a1", "a2"]
+    assert mirror.snapshot(mirror_source(URL, "pat-b"))["config_ids"] == ["b1"]
+
+    changes, error = mirror.refresh("pat-b", LOGIN_URL, URL)
+    assert error is None and changes["not_modified"]
+    # pat-b's conditional request carried its own ETag, not pat-a's
+    assert tenants.requests == [("pat-a", None), ("pat-b", None), ("pat-b", '"pat-b-1"')]
+
+
+def test_mirrored_list_needs_a_valid_pat(tenants):
+    tenants.mirror.refresh("pat-a", LOGIN_URL, URL)
+
+    async def collect(pat):
+        return [result async for result in api_testing.list_uat_configurations_mirrored(pat, LOGIN_URL, URL)]
+
+    rejected = asyncio.run(collect("revoked-pat"))
+    assert rejected == [({"error": "No session token received from Cloud Manager"}, "", [])]
+
+    listed = asyncio.run(collect("pat-a"))
+    assert listed[0][2] == ["a1", "a2"]
+    assert len(listed) == 1  # refresh found nothing new
+
+
+def test_login_http_error_is_reported(tenants, monkeypatch):
+    request = httpx.Request("POST", LOGIN_URL)
+
+    async def unauthorized(login_url, pat_secret):
+        raise httpx.HTTPStatusError("401", request=request, response=httpx.Response(401, text="bad PAT", request=request))
+
+    monkeypatch.setattr(cloud_manager_auth, "_pat_login_async", unauthorized)
+
+    async def collect():
+        return [r async for r in api_testing.list_uat_configurations_mirrored("pat-a", LOGIN_URL, URL)]
+
+    [(result, _, config_ids)] = asyncio.run(collect())
+    assert result == {"error": "Failed to login to Cloud Manager: 401", "details": "bad PAT"}
+    assert config_ids == []
+
+
+class _PagedApi:
+    """Fake async configs endpoint serving configs in pages linked by a pageToken."""
+    def __init__(self, configs, per_page):
+        self.pages = [configs[i:i + per_page] for i in range(0, len(configs), per_page)]
+        self.requests = 0
+
+    async def get(self, url, params=None, headers=None):
+        self.requests += 1
+        index = int((params or {}).get("pageToken", 0))
+        data = {"configurations": self.pages[index]}
+        if index + 1 < len(self.pages):
+            data["nextPageToken"] = str(index + 1)
+        return httpx.Response(200, json=data, request=httpx.Request("GET", url))
+
+
+def test_first_listing_streams_pages_then_fills_the_mirror(tenants, monkeypatch):
+    api = _PagedApi([_config(f"c{i:02d}") for i in range(10)], per_page=4)
+    monkeypatch.setattr(api_testing, "async_transport", types.SimpleNamespace(get=api.get))
+
+    async def collect():
+        return [r async for r in api_testing.list_uat_configurations_mirrored("pat-a", LOGIN_URL, URL, 1, page_size=3)]
+
+    results = asyncio.run(collect())
+
+    loading = [result for result, _, _ in results if result.get("loading")]
+    assert [r["total_configurations"] for r in loading] == [3, 6, 9]
+    assert all(len(r["configurations"]) == 3 for r in loading)
+    final, _, config_ids = results[-1]
+    assert final["total_configurations"] == 10 and final["total_pages"] == 4
+    assert len(final["changes"]["added"]) == 10
+    assert config_ids == ["c00", "c01", "c02"]
+    assert api.requests == 3
+
+    # Later pages come from the mirror, for a logged-in PAT only
+    result, config_ids = api_testing.uat_configurations_page("pat-a", LOGIN_URL, URL, 9, page_size=3)
+    assert result["page"] == 4 and config_ids == ["c09"]
+    result, config_ids = api_testing.uat_configurations_page("revoked-pat", LOGIN_URL, URL, 1, page_size=3)
+    assert "error" in result and config_ids == []
@@ -0,0 +1,84 @@
+import base64
+import hashlib
+import json
+import urllib.error
+import urllib.request
+from threading import Thread
+
+import jwt
+import pytest
+
+from auth.jwks import KeySet, build_jwks, key_thumbprint, make_jwks_server
+from auth.jwt_builder import build_jwt
+from auth.keygen import generate_private_key
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _int_b64(value, length=None):
+    return _b64(value.to_bytes(length or (value.bit_length() + 7) // 8, "big"))
+
+
+def test_rsa_thumbprint_follows_rfc_7638():
+    public_key = generate_private_key("RS256").public_key()
+    numbers = public_key.public_numbers()
+    canonical = f'{{"e":"{_int_b64(numbers.e)}","kty":"RSA","n":"{_int_b64(numbers.n)}"}}'
+
+    assert key_thumbprint(public_key) == _b64(hashlib.sha256(canonical.encode()).digest())
+
+
+def test_ec_thumbprint_follows_rfc_7638():
+    public_key = generate_private_key("ES256").public_key()
+    numbers = public_key.public_numbers()
+    canonical = (f'{{"crv":"P-256","kty":"EC","x":"{_int_b64(numbers.x, 32)}",'
+                 f'"y":"{_int_b64(numbers.y, 32)}"}}')
+
+    assert key_thumbprint(public_key) == _b64(hashlib.sha256(canonical.encode()).digest())
+
+
+def test_jwks_lists_the_signing_key_under_the_token_kid(make_keys):
+    make_keys()
+    kid = jwt.get_unverified_header(build_jwt("iss", 5, "tenant", "user", []))["kid"]
+
+    document = build_jwks()
+
+    assert [key["kid"] for key in document["keys"]] == [kid]
+    assert document["keys"][0]["use"] == "sig"
+    assert document["keys"][0]["alg"] == "RS256"
+
+
+def test_key_set_picks_up_new_files_and_skips_private_keys(make_keys, workdir):
+    make_keys()
+    keys = KeySet(workdir / "keys")
+    body, etag = keys.document()
+    assert len(keys.keys()) == 1
+
+    make_keys("ES256")
+    (workdir / "keys" / "old_public_key.pem").write_bytes(b"not a key")
+
+    new_body, new_etag = keys.document()
+    assert new_etag != etag
+    assert [k["alg"] for k in json.loads(new_body)["keys"]] == ["ES256"]
+
+
+def test_server_answers_conditional_requests_with_304(make_keys, workdir):
+    make_keys()
+    server = make_jwks_server("127.0.0.1", 0, keys=KeySet(workdir / "keys"), max_age=60)
+    port = server.server_address[1]
+    Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{port}/.well-known/jwks.json"
+        with urllib.request.urlopen(url) as response:
+            etag = response.headers["ETag"]
+            assert response.headers["Cache-Control"] == "public, max-age=60"
+            assert len(json.load(response)["keys"]) == 1
+
+        request = urllib.request.Request(url, headers={"If-None-Match": etag})
+        with pytest.raises(urllib.error.HTTPError) as not_modified:
+            urllib.request.urlopen(request)
+        assert not_modified.value.code == 304
+    finally:
+        server.shutdown()
+        server.server_close()
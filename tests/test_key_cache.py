@@ -0,0 +1,38 @@
+import jwt
+
+from auth.jwt_builder import build_jwt
+from auth.key_cache import load_signing_key, signing_key_cache
+
+
+def test_signing_key_is_parsed_once(make_keys):
+    make_keys()
+    first = load_signing_key()
+    before = signing_key_cache.info()
+
+    assert load_signing_key() is first
+    build_jwt("iss", 5, "tenant", "user@example.com", ["tableau:content:read"])
+
+    after = signing_key_cache.info()
+    assert after["misses"] == before["misses"]
+    assert after["hits"] == before["hits"] + 2
+
+
+def test_rotated_key_file_is_reloaded(make_keys):
+    make_keys()
+    old_kid = jwt.get_unverified_header(build_jwt("iss", 5, "tenant", "u", []))["kid"]
+
+    make_keys()
+    new_kid = jwt.get_unverified_header(build_jwt("iss", 5, "tenant", "u", []))["kid"]
+
+    assert new_kid != old_kid
+
+
+def test_changed_file_is_reloaded_without_invalidate(make_keys, workdir):
+    make_keys()
+    first = load_signing_key()
+    path = workdir / "keys" / "private_key.pem"
+    path.write_bytes(path.read_bytes() + b"\n")  # same key, new size/mtime
+
+    reloaded = load_signing_key()
+    assert reloaded is not first
+    assert reloaded.private_numbers() == first.private_numbers()
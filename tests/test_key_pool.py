@@ -0,0 +1,56 @@
+import itertools
+import time
+
+from auth.key_pool import KeyPool
+
+
+class _Factory:
+    def __init__(self):
+        self.calls = []
+        self._ids = itertools.count()
+
+    def __call__(self, algorithm, key_size):
+        self.calls.append((algorithm, key_size))
+        return f"key-{next(self._ids)}"
+
+
+def _wait_for(pool, available, timeout=5):
+    deadline = time.monotonic() + timeout
+    while pool.stats()["available"] != available and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return pool.stats()["available"]
+
+
+def test_pool_fills_to_depth_and_hands_out_each_key_once():
+    factory = _Factory()
+    pool = KeyPool(factory, "RS256", 2048, depth=2).start()
+    try:
+        assert _wait_for(pool, 2) == 2
+        first, second = pool.take("RS256", 2048), pool.take("RS256", 2048)
+        assert first != second
+        assert _wait_for(pool, 2) == 2  # refilled in the background
+        assert set(factory.calls) == {("RS256", 2048)}
+        assert pool.stats()["hits"] == 2
+    finally:
+        pool.stop()
+    assert pool.stats()["available"] == 0
+    assert not pool.stats()["running"]
+
+
+def test_other_key_types_are_not_served():
+    pool = KeyPool(_Factory(), "RS256", 2048, depth=1).start()
+    try:
+        _wait_for(pool, 1)
+        assert pool.take("RS256", 4096) is None
+        assert pool.take("ES256", 2048) is None
+        assert pool.stats()["available"] == 1
+    finally:
+        pool.stop()
+
+
+def test_empty_pool_counts_a_miss():
+    pool = KeyPool(_Factory(), depth=0).start()
+
+    assert pool.take("RS256", 2048) is None
+    assert pool.stats()["misses"] == 1
+    assert not pool.stats()["running"]
@@ -0,0 +1,130 @@
+import importlib
+import json
+
+import pytest
+
+from auth.key_cache import load_signing_key
+from auth.jwks import key_thumbprint
+
+key_rotation = importlib.import_module("auth.key_rotation")
+
+
+class _CloudManager:
+    """Stands in for login/create/revoke; records calls and returns configurable responses."""
+    def __init__(self):
+        self.created = []
+        self.revoked = []
+        self.next_ids = []
+
+    def create(self, session_token, scopes, config_name, resource_ids, public_key=None):
+        self.created.append(config_name)
+        config_id = self.next_ids.pop(0) if self.next_ids else f"id-{len(self.created)}"
+        return True, {"response_text": json.dumps({"id": {"configId": config_id}} if config_id else {})}
+
+    def revoke(self, config_id, *_):
+        self.revoked.append(config_id)
+        return {"success": True}, "token"
+
+
+@pytest.fixture
+def cloud_manager(make_keys, monkeypatch):
+    make_keys()
+    fake = _CloudManager()
+    monkeypatch.setattr(key_rotation, "login_cloud_manager_pat", lambda: "session")
+    monkeypatch.setattr(key_rotation, "create_uat_config", fake.create)
+    monkeypatch.setattr(key_rotation, "revoke_uat_configuration", fake.revoke)
+    return fake
+
+
+def _rotator(**kwargs):
+    return key_rotation.KeyRotator("Embed", ["tableau:content:read"], max_token_lifetime_minutes=0,
+                                   leeway_seconds=0, **kwargs)
+
+
+def test_rotation_switches_signing_key_and_keeps_old_key_published(cloud_manager, workdir):
+    old_kid = key_thumbprint(load_signing_key().public_key())
+    rotator = _rotator(active_config_id="id-0")
+
+    success, details = rotator.rotate()
+
+    assert success
+    assert cloud_manager.created == ["Embed-v1"]
+    assert key_thumbprint(load_signing_key().public_key()) == details["kid"] != old_kid
+    assert (workdir / "keys" / f"public_key.{old_kid}.pem").exists()
+    assert rotator.status()["active_config_id"] == "id-1"
+    assert [entry["config_id"] for entry in rotator.status()["retiring"]] == ["id-0"]
+
+
+def test_old_config_is_revoked_once_due(cloud_manager, workdir):
+    old_kid = key_thumbprint(load_signing_key().public_key())
+    rotator = _rotator(active_config_id="id-0")
+    rotator.rotate()
+
+    rotator.retire_expired()
+
+    assert cloud_manager.revoked == ["id-0"]
+    assert rotator.status()["retiring"] == []
+    assert not (workdir / "keys" / f"public_key.{old_kid}.pem").exists()
+
+
+def test_missing_config_id_fails_the_rotation(cloud_manager):
+    signing_kid = key_thumbprint(load_signing_key().public_key())
+    rotator = _rotator(active_config_id="id-0")
+    cloud_manager.next_ids = [""]
+
+    success, details = rotator.rotate()
+
+    assert not success
+    assert "Embed-v1" in details["error"]
+    assert key_thumbprint(load_signing_key().public_key()) == signing_kid
+    state = rotator.status()
+    assert state["active_config_id"] == "id-0"
+    assert state["retiring"] == []
+
+    # The next attempt gets a fresh name
+    assert rotator.rotate()[0]
+    assert cloud_manager.created == ["Embed-v1", "Embed-v2"]
+
+
+def test_state_survives_a_restart(cloud_manager):
+    _rotator(active_config_id="id-0").rotate()
+
+    restarted = _rotator()
+
+    assert restarted.status()["version"] == 1
+    assert restarted.status()["active_config_id"] == "id-1"
+
+
+def test_rotator_from_env(workdir, monkeypatch):
+    monkeypatch.delenv("KEY_ROTATION_BASE_NAME", raising=False)
+    assert key_rotation.rotator_from_env() is None
+
+    monkeypatch.setenv("KEY_ROTATION_BASE_NAME", "Embed")
+    monkeypatch.setenv("KEY_ROTATION_SCOPES", "tableau:content:read, tableau:views:embed")
+    monkeypatch.setenv("KEY_ROTATION_INTERVAL_HOURS", "12")
+    rotator = key_rotation.rotator_from_env()
+
+    assert rotator.scopes == ["tableau:content:read", "tableau:views:embed"]
+    assert rotator.rotation_interval == 12 * 3600
+    assert key_rotation.rotation_enabled()
+
+
+def test_replaced_key_comes_from_the_rotation_state(cloud_manager, make_keys, workdir):
+    rotator = _rotator(active_config_id="id-0")
+    _, first = rotator.rotate()
+    make_keys()  # something else overwrites keys/public_key.pem under the rotator
+
+    rotator.rotate()
+
+    [_, replaced] = rotator.status()["retiring"]
+    assert replaced == {**replaced, "config_id": "id-1", "kid": first["kid"]}
+    assert (workdir / "keys" / f"public_key.{first['kid']}.pem").exists()
+
+
+def test_fresh_state_waits_an_interval_from_the_current_key(cloud_manager):
+    rotator = key_rotation.KeyRotator("Embed", ["tableau:content:read"], rotation_interval_hours=1)
+
+    rotation, _ = rotator.tick()
+
+    assert rotation is None
+    assert cloud_manager.created == []
@@ -0,0 +1,32 @@
+import jwt
+import pytest
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
+
+from auth.jwt_builder import build_jwt
+from auth.keygen import generate_private_key
+
+
+@pytest.mark.parametrize("algorithm", ["RS256", "ES256"])
+def test_token_is_signed_with_the_key_algorithm(make_keys, workdir, algorithm):
+    result = make_keys(algorithm)
+    assert result["algorithm"] == algorithm
+
+    token = build_jwt("iss", 5, "tenant", "user@example.com", ["tableau:content:read"])
+    public_key = load_pem_public_key((workdir / "keys" / "public_key.pem").read_bytes())
+
+    assert jwt.get_unverified_header(token)["alg"] == algorithm
+    assert jwt.decode(token, public_key, algorithms=[algorithm])["email"] == "user@example.com"
+
+
+def test_switching_algorithm_rewrites_both_files(make_keys, workdir):
+    make_keys("RS256")
+    make_keys("ES256")
+
+    token = build_jwt("iss", 5, "tenant", "user", [])
+    public_key = load_pem_public_key((workdir / "keys" / "public_key.pem").read_bytes())
+    jwt.decode(token, public_key, algorithms=["ES256"])
+
+
+def test_unsupported_algorithm_is_rejected():
+    with pytest.raises(ValueError, match="Unsupported algorithm"):
+        generate_private_key("HS256")
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from managers import ResourceManager, SiteManager
+from managers.luid_import import import_luids, load_luid_rows, validate_luid_rows
+from utils.helpers import generate_config_summary
+
+LUID = "0f1e2d3c-4b5a-6978-8796-a5b4c3d2e1f0"
+OTHER_LUID = "11111111-2222-3333-4444-555555555555"
+
+
+def _managers():
+    return {t: ResourceManager(t) for t in ("project", "workbook", "datasource", "flow")}
+
+
+def test_csv_and_json_rows_are_normalised():
+    csv_rows = load_luid_rows(f"Type, LUID, Scope\nProjects, {LUID} ,\n")
+    json_rows = load_luid_rows(json.dumps({"resources": [{"type": "projects", "luid": LUID}]}))
+
+    for frame in (csv_rows, json_rows):
+        assert frame.to_dict("records") == [{"type": frame["type"][0], "luid": LUID, "scope": "", "site_id": ""}]
+
+
+@pytest.mark.parametrize("text", ["[1, 2]", '{"resources": ["a"]}', "[{\"type\": \"flow\"}, null]"])
+def test_json_rows_must_be_objects(text):
+    with pytest.raises(ValueError, match="is not an object"):
+        load_luid_rows(text)
+
+
+def test_unreadable_json_is_a_value_error():
+    with pytest.raises(ValueError, match="Cannot read import file"):
+        load_luid_rows("[{")
+
+
+def test_each_row_reports_its_first_error():
+    frame = load_luid_rows(json.dumps([
+        {"type": "project", "luid": LUID},
+        {"type": "gadget", "luid": LUID},
+        {"type": "workbook", "luid": "not-a-luid"},
+        {"type": "flow", "luid": LUID, "scope": "tableau:content:read"},
+        {"type": "site", "luid": OTHER_LUID},
+        {"type": "project", "luid": LUID},
+    ]))
+
+    valid, rejected = validate_luid_rows(frame)
+
+    assert valid.to_dict("records") == [{"type": "project", "luid": LUID, "scope": "tableau:projects:read", "site_id": ""}]
+    assert [(r["row"], r["error"]) for r in rejected] == [
+        (2, "Unknown type (use one of: site, project, workbook, datasource, flow)"),
+        (3, "Invalid LUID format"),
+        (4, "Scope not allowed for this type"),
+        (5, "site_id is required for sites"),
+        (6, "Duplicate LUID in file"),
+    ]
+
+
+def test_import_adds_rows_to_each_manager():
+    managers, sites = _managers(), SiteManager()
+    managers["flow"].add_resource(OTHER_LUID, "tableau:flows:read")
+
+    report, updates = import_luids(json.dumps([
+        {"type": "site", "luid": LUID, "site_id": "marketing"},
+        {"type": "flow", "luid": OTHER_LUID},
+        {"type": "flow", "luid": LUID},
+    ]), managers, sites)
+
+    assert report["added"] == {"site": 1, "flow": 1}
+    assert report["already_present"] == {"flow": [OTHER_LUID]}
+    assert set(updates) == {"site", "flow"}
+    assert sites.get_site("marketing")["scope"] == "tableau:content:read"
+
+
+def test_imported_values_are_escaped_in_the_displays():
+    payload = "<img src=x onerror=alert(1)>"
+    managers, sites = _managers(), SiteManager()
+    sites.add_site(payload, LUID, "tableau:content:read")
+    managers["project"].add_resource(OTHER_LUID, payload)
+
+    for html in (sites.get_sites_display(), managers["project"].get_display(),
+                 generate_config_summary(sites, ResourceManager("tenant"), *managers.values())):
+        assert payload not in html
+        assert "&lt;img src=x onerror=alert(1)&gt;" in html
@@ -0,0 +1,85 @@
+from managers import ResourceManager, SiteManager
+
+
+def test_resources_keep_insertion_order_and_reject_duplicates():
+    manager = ResourceManager("project")
+
+    manager.add_resource("p-2", "read")
+    manager.add_resource("p-1", "write")
+    _, _, status = manager.add_resource("p-2", "other")
+
+    assert status == "Project 'p-2' already exists"
+    assert manager.resources == [{"luid": "p-2", "scope": "read"}, {"luid": "p-1", "scope": "write"}]
+    assert manager.get_choices() == ["p-2", "p-1"]
+    assert manager.get("p-1") == {"luid": "p-1", "scope": "write"}
+    assert "p-1" in manager and "p-3" not in manager
+    assert len(manager) == 2
+
+
+def test_resource_delete_and_clear():
+    manager = ResourceManager("workbook")
+    manager.add_resource("w-1", "s")
+    manager.add_resource("w-2", "s")
+
+    manager.delete_resource("w-1")
+    manager.delete_resource("missing")
+    assert manager.get_choices() == ["w-2"]
+
+    manager.clear_resources()
+    assert not manager
+    assert manager.get("w-2") is None
+
+
+def test_bulk_add_keeps_existing_scope_and_bumps_version_once():
+    manager = ResourceManager("flow")
+    manager.add_resource("f-1", "original")
+    version = manager.version
+
+    (_, _, status), added, skipped = manager.add_resources([("f-1", "new"), ("f-2", "s"), ("f-3", "s")])
+
+    assert (added, skipped) == (2, ["f-1"])
+    assert status == "Imported 2 flow(s), 1 already present"
+    assert manager.get("f-1")["scope"] == "original"
+    assert manager.version == version + 1
+
+    manager.add_resources([("f-1", "s")])
+    assert manager.version == version + 1  # nothing added, nothing to re-render
+
+
+def test_sites_are_found_by_id_and_luid():
+    manager = SiteManager()
+    manager.add_site("marketing", "luid-m", "read")
+    manager.add_site("finance", "luid-f", "write")
+
+    assert manager.get_site("finance") == {"site_id": "finance", "site_luid": "luid-f", "scope": "write"}
+    assert manager.get_site_by_luid("luid-m")["site_id"] == "marketing"
+    assert manager.get_site_choices() == ["marketing", "finance"]
+    assert manager.get_sites_list() == manager.sites
+    assert manager.get_site("missing") is None
+
+
+def test_duplicate_site_id_or_luid_is_rejected():
+    manager = SiteManager()
+    manager.add_site("marketing", "luid-m", "read")
+
+    assert manager.add_site("marketing", "luid-x", "read")[2] == "Site 'marketing' already exists"
+    assert manager.add_site("other", "luid-m", "read")[2] == "Site 'other' already exists"
+    assert manager.add_site("", "luid-y", "read")[2] == "Please enter both Site ID and Site LUID"
+    assert len(manager) == 1
+
+
+def test_deleting_a_site_frees_its_id_and_luid():
+    manager = SiteManager()
+    manager.add_site("marketing", "luid-m", "read")
+
+    manager.delete_site("marketing")
+    assert manager.get_site_by_luid("luid-m") is None
+
+    # Both keys can be used again
+    manager.add_site("marketing", "luid-m", "write")
+    assert manager.get_site("marketing")["scope"] == "write"
+
+    _, added, skipped = manager.add_sites([("marketing", "luid-n", "s"), ("sales", "luid-s", "s")])
+    assert (added, skipped) == (1, ["marketing"])
+    manager.clear_sites()
+    assert manager.sites == [] and manager.get_site("sales") is None
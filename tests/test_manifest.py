@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from auth.uat_provisioning import _item_body, load_manifest
+
+PEM = "-----BEGIN PUBLIC KEY-----\nMFkw\n-----END PUBLIC KEY-----\n"
+
+
+def _write(directory, name, text):
+    path = directory / name
+    path.write_text(text)
+    return path
+
+
+def test_defaults_and_aliases_are_applied(workdir):
+    manifest = _write(workdir, "manifest.yaml", (
+        "defaults:\n  issuer: https://issuer\n  scopes: [tableau:content:read]\n"
+        "configs:\n  - name: a\n    publicKey: |\n      key\n  - name: b\n    issuer: https://other\n"
+    ))
+
+    items = load_manifest(str(manifest))
+
+    assert [(i["name"], i["issuer"]) for i in items] == [("a", "https://issuer"), ("b", "https://other")]
+    assert items[0]["public_key"] == "key\n"
+    assert items[1]["scopes"] == ["tableau:content:read"]
+
+
+def test_key_path_is_resolved_against_the_manifest_directory(workdir):
+    manifests = workdir / "manifests"
+    manifests.mkdir()
+    _write(manifests, "prod.pem", PEM)
+    manifest = _write(manifests, "m.json", json.dumps([{"name": "a", "public_key_path": "prod.pem"}]))
+
+    item = load_manifest(str(manifest))[0]
+
+    assert item["public_key_path"] == str((manifests / "prod.pem").resolve())
+    assert _item_body({**item, "scopes": []})["publicKey"] == PEM
+
+
+def test_keys_directory_is_allowed_for_uploaded_manifests(workdir, tmp_path_factory):
+    _write(workdir / "keys", "public_key.pem", PEM)
+    upload = tmp_path_factory.mktemp("upload")
+    manifest = _write(upload, "m.yaml", "- name: a\n  public_key_path: keys/public_key.pem\n")
+
+    item = load_manifest(str(manifest))[0]
+
+    assert item["public_key_path"] == str((workdir / "keys" / "public_key.pem").resolve())
+
+
+@pytest.mark.parametrize("key_path", ["/etc/passwd", "../secret.pem", "keys/../../secret.pem"])
+def test_key_path_outside_the_allowed_directories_is_rejected(workdir, key_path):
+    manifests = workdir / "manifests"
+    manifests.mkdir()
+    manifest = _write(manifests, "m.json", json.dumps([{"name": "a", "public_key_path": key_path}]))
+
+    with pytest.raises(ValueError, match="must be inside"):
+        load_manifest(str(manifest))
+
+
+def test_invalid_yaml_raises_value_error(workdir):
+    manifest = _write(workdir, "m.yaml", "configs: [unclosed\n")
+
+    with pytest.raises(ValueError, match="Invalid YAML"):
+        load_manifest(str(manifest))
+
+
+@pytest.mark.parametrize("text, message", [
+    ('["foo"]', "config 1 is not a mapping"),
+    ('[1]', "config 1 is not a mapping"),
+    ('{"configs": [{"name": "a"}, "b"]}', "config 2 is not a mapping"),
+    ('{"defaults": "x", "configs": [{"name": "a"}]}', "'defaults' is not a mapping"),
+    ('{"configs": "a"}', "'configs' must be a list"),
+])
+def test_non_mapping_entries_are_an_invalid_manifest(text, message):
+    with pytest.raises(ValueError, match=message):
+        load_manifest(text)
+
+
+def test_long_one_line_manifest_text_is_parsed():
+    text = json.dumps([{"name": f"config-{i}", "public_key": PEM} for i in range(20)])
+
+    assert len(load_manifest(text)) == 20
+
+
+@pytest.mark.parametrize("item, message", [
+    ({"public_key": PEM}, "Missing 'name'"),
+    ({"name": "a"}, "Missing 'public_key'"),
+    ({"name": "a", "public_key": PEM, "scopes": "tableau:content:read"}, "must be lists"),
+])
+def test_invalid_items_are_reported(item, message):
+    with pytest.raises(ValueError, match=message):
+        _item_body(item)
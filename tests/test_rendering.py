@@ -0,0 +1,169 @@
+from managers import ResourceManager, ScopeManager, SiteManager
+from utils import helpers
+from utils.rendering import RenderCache, new_view, page_note, page_of, row_fragment
+
+
+class _Row:
+    __slots__ = ("luid", "scope")
+
+    def __init__(self, luid, scope):
+        self.luid = luid
+        self.scope = scope
+
+
+ROWS = [_Row(f"luid-{i}", "tableau:content:read" if i % 2 else "tableau:views:embed") for i in range(7)]
+
+
+def test_render_cache_rebuilds_only_when_the_key_changes():
+    cache = RenderCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return f"<html {len(builds)}>"
+
+    assert cache.render(1, build) == "<html 1>"
+    assert cache.render(1, build) == "<html 1>"
+    assert cache.render(2, build) == "<html 2>"
+    assert cache.stats() == {"hits": 1, "renders": 2}
+
+
+def test_row_fragment_renders_each_distinct_row_once():
+    calls = []
+
+    @row_fragment
+    def row(value, bg_color):
+        calls.append(value)
+        return f"<div style='background: {bg_color}'>{value}</div>"
+
+    row("a", "#fff"), row("a", "#fff"), row("b", "#fff")
+
+    assert calls == ["a", "b"]
+
+
+def test_scope_manager_keeps_its_api():
+    manager = ScopeManager()
+
+    manager.add_scope("content", "read")
+    _, choices, status = manager.add_scope("content", "read")
+    manager.add_scope("projects", "write")
+
+    assert status == "Scope 'tableau:content:read' already exists."
+    assert choices == ["tableau:content:read"]
+    assert manager.get_radio_choices() == ["tableau:content:read", "tableau:projects:write"]
+    assert list(manager.get_scopes_df()["Scope"]) == manager.get_radio_choices()
+    # The property hands out copies; the manager's own state cannot be changed through it
+    manager.scopes.append({"Scope": "x", "Description": "y"})
+    manager.scopes[0]["Scope"] = "x"
+    assert len(manager) == 2 and manager.scopes[0]["Scope"] == "tableau:content:read"
+
+    manager.delete_scope("tableau:content:read")
+    manager.clear_scopes()
+    assert list(manager.get_scopes_df().columns) == ["Scope", "Description"] and not len(manager)
+
+
+def test_scope_display_is_cached_until_the_scopes_change():
+    manager = ScopeManager()
+    manager.add_scope("content", "read")
+
+    first = manager.get_form_display()
+    assert manager.get_form_display() is first
+    version = manager.version
+    manager.delete_scope("not-configured")
+    assert manager.version == version  # nothing removed, cache still valid
+
+    manager.add_scope("content", "write")
+    assert "tableau:content:write" in manager.get_form_display()
+    assert manager._display_cache.stats()["renders"] == 2
+
+
+def test_manager_displays_are_cached_until_a_change():
+    sites, projects = SiteManager(), ResourceManager("project")
+    sites.add_site("marketing", "luid-m", "tableau:content:read")
+    projects.add_resource("luid-p", "tableau:projects:read")
+
+    assert sites.get_sites_display() is sites.get_sites_display()
+    assert projects.get_display() is projects.get_display()
+
+    projects.add_resource("luid-q", "tableau:projects:read")
+    assert "luid-q" in projects.get_display()
+
+
+def test_summary_is_rebuilt_only_after_a_manager_changes():
+    managers = [SiteManager(), ResourceManager("tenant"), ResourceManager("project"),
+                ResourceManager("workbook"), ResourceManager("datasource"), ResourceManager("flow")]
+    managers[2].add_resource("luid-p", "tableau:projects:read")
+
+    first = helpers.generate_config_summary(*managers)
+    assert helpers.generate_config_summary(*managers) is first
+
+    managers[0].add_site("marketing", "luid-m", "tableau:content:read")
+    refreshed = helpers.generate_config_summary(*managers)
+    assert "marketing" in refreshed and "luid-p" in refreshed
+
+
+def test_page_of_cuts_out_one_page():
+    rows, page, page_count, matching = page_of(ROWS, page=2, page_size=3)
+
+    assert [(idx, row.luid) for idx, row in rows] == [(3, "luid-3"), (4, "luid-4"), (5, "luid-5")]
+    assert (page, page_count, matching) == (2, 3, 7)
+    assert page_note(rows, page, page_count, matching, 7) == "Showing 4–6 of 7 · Page 2 of 3"
+
+
+def test_page_of_clamps_the_page_number():
+    assert page_of(ROWS, page=99, page_size=3)[1] == 3
+    assert page_of(ROWS, page=0, page_size=3)[1] == 1
+    assert page_of([], page=5, page_size=3)[:3] == ([], 1, 1)
+
+
+def test_page_of_filters_case_insensitively_on_the_given_fields():
+    rows, page, page_count, matching = page_of(ROWS, page_size=2, query=" VIEWS ", fields=("luid", "scope"))
+
+    assert [row.luid for _, row in rows] == ["luid-0", "luid-2"]
+    assert (page, page_count, matching) == (1, 2, 4)
+    assert page_note(rows, page, page_count, matching, 7) == "Showing 1–2 of 4 matching (of 7) · Page 1 of 2"
+
+
+def test_page_of_slices_a_lazy_iterator_with_a_count():
+    rows, _, page_count, matching = page_of(iter(ROWS), page=3, page_size=3, count=len(ROWS))
+
+    assert [row.luid for _, row in rows] == ["luid-6"]
+    assert (page_count, matching) == (3, 7)
+
+
+def test_sessions_page_the_same_manager_independently():
+    manager = ResourceManager("project")
+    manager.add_resources([(f"luid-{i:02d}", "tableau:projects:read") for i in range(5)])
+    first, second = new_view(page_size=2), new_view(page_size=2)
+
+    display, choices, first = manager.set_view(first, page=3)
+    assert first["page"] == 3 and choices == ["luid-04"]
+    assert manager.get_visible_choices(second) == ["luid-00", "luid-01"]
+    assert "luid-04" in display and "luid-04" not in manager.get_display(second)
+
+    _, choices, second = manager.set_view(second, query="luid-03")
+    assert second == {"page": 1, "page_size": 2, "query": "luid-03"} and choices == ["luid-03"]
+    assert manager.get_visible_choices(first) == ["luid-04"]
+
+
+def test_view_stays_on_the_last_page_when_rows_go_away():
+    manager = SiteManager()
+    manager.add_sites([(f"site-{i}", f"luid-{i}", "tableau:content:read") for i in range(3)])
+    _, _, view = manager.set_view(new_view(page_size=2), page=2)
+
+    _, choices, _ = manager.delete_site("site-2", view)
+
+    assert choices == ["site-0", "site-1"]
+    assert manager.shown_view(view)["page"] == 1
+
+
+def test_summary_view_starts_at_the_rows_per_page_value():
+    import gradio as gr
+    import app
+
+    demo = app.create_uat_config_tool()
+    components = demo.blocks.values()
+    [summary_state] = [c for c in components if isinstance(c, gr.State) and isinstance(c.value, dict) and "type_filter" in c.value]
+    [rows_per_page] = [c for c in components if isinstance(c, gr.Dropdown) and c.label == "Rows per page"]
+
+    assert summary_state.value["page_size"] == rows_per_page.value == app.SUMMARY_DEFAULT_PAGE_SIZE
@@ -0,0 +1,137 @@
+import asyncio
+import importlib
+import itertools
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import jwt
+import pytest
+
+from auth.tableau_auth import RestCredentialsCache
+
+tableau_auth = importlib.import_module("auth.tableau_auth")
+
+POD = "https://pod.example.com"
+
+
+def _token(**claims):
+    return jwt.encode({"iss": "issuer", "scp": ["tableau:content:read"], **claims}, "test-signing-secret-of-32-bytes!", algorithm="HS256")
+
+
+@pytest.fixture
+def signins(monkeypatch):
+    """Fake pod: records sign-ins and sign-outs."""
+    pod = types.SimpleNamespace(signins=[], signouts=[])
+    ids = itertools.count(1)
+
+    def sign_in(pod_url, site_id, jwt_token):
+        pod.signins.append(jwt.decode(jwt_token, options={"verify_signature": False}))
+        return tableau_auth._RestCredentials({"token": f"rest-{next(ids)}", "site": {"id": "site-luid"}})
+
+    def post(url, headers=None, **kwargs):
+        pod.signouts.append(headers["X-Tableau-Auth"])
+
+    monkeypatch.setattr(tableau_auth, "_sign_in", sign_in)
+    monkeypatch.setattr(tableau_auth, "transport", types.SimpleNamespace(post=post))
+    return pod
+
+
+def test_session_is_shared_by_tokens_for_the_same_user(signins):
+    cache = RestCredentialsCache(ttl_seconds=600)
+
+    first = cache.get_credentials(POD, "site", _token(email="a@example.com", jti="1"))
+    second = cache.get_credentials(POD, "site", _token(email="a@example.com", jti="2"))
+
+    assert first == second == {"token": "rest-1", "site_id": "site-luid", "user_id": None}
+    assert len(signins.signins) == 1
+
+
+def test_users_and_issuers_get_their_own_sessions(signins):
+    cache = RestCredentialsCache(ttl_seconds=600)
+
+    tokens = {
+        cache.get_credentials(POD, "site", _token(email="a@example.com"))["token"],
+        cache.get_credentials(POD, "site", _token(email="b@example.com"))["token"],
+        cache.get_credentials(POD, "site", _token(email="a@example.com", iss="other-issuer"))["token"],
+    }
+
+    assert len(tokens) == 3
+    assert cache.stats()["sessions"] == 3
+
+
+def test_token_without_a_user_is_not_cached(signins):
+    cache = RestCredentialsCache(ttl_seconds=600)
+
+    first = cache.get_credentials(POD, "site", _token())
+    second = cache.get_credentials(POD, "site", _token())
+
+    assert first["token"] != second["token"]
+    assert cache.stats()["sessions"] == 0
+
+
+def test_sub_claim_is_used_when_there_is_no_email(signins):
+    cache = RestCredentialsCache(ttl_seconds=600)
+
+    cache.get_credentials(POD, "site", _token(sub="user"))
+    cache.get_credentials(POD, "site", _token(sub="user"))
+
+    assert len(signins.signins) == 1
+
+
+def test_evicted_and_replaced_sessions_are_signed_out(signins):
+    cache = RestCredentialsCache(max_size=1, ttl_seconds=600)
+
+    cache.get_credentials(POD, "site", _token(email="a"))
+    cache.get_credentials(POD, "site", _token(email="b"))
+    cache.get_credentials(POD, "site", _token(email="b"), force_refresh=True)
+
+    assert signins.signouts == ["rest-1", "rest-2"]
+
+
+def test_401_signs_in_again_once(signins):
+    cache = RestCredentialsCache(ttl_seconds=600)
+    used = []
+
+    def send(credentials):
+        used.append(credentials["token"])
+        return types.SimpleNamespace(status_code=401 if len(used) == 1 else 200)
+
+    response, credentials = cache.request_with_credentials(POD, "site", _token(email="a"), send)
+
+    assert response.status_code == 200
+    assert used == ["rest-1", "rest-2"]
+
+
+def test_threads_and_event_loops_share_one_sign_in(signins, monkeypatch):
+    async def sign_in_async(pod_url, site_id, jwt_token):
+        await asyncio.sleep(0.05)
+        return tableau_auth._sign_in(pod_url, site_id, jwt_token)
+
+    monkeypatch.setattr(tableau_auth, "_sign_in_async", sign_in_async)
+    cache = RestCredentialsCache(ttl_seconds=600)
+    token = _token(email="a")
+
+    async def many():
+        return await asyncio.gather(*(cache.get_credentials_async(POD, "site", token) for _ in range(4)))
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        loop_results = [pool.submit(asyncio.run, many()) for _ in range(3)]
+        sync_results = [pool.submit(cache.get_credentials, POD, "site", token) for _ in range(3)]
+        tokens = {c["token"] for f in loop_results for c in f.result()} | {f.result()["token"] for f in sync_results}
+
+    assert tokens == {"rest-1"}
+    assert len(signins.signins) == 1
+
+
+def test_concurrent_401s_sign_in_again_once(signins):
+    cache = RestCredentialsCache(ttl_seconds=600)
+    token = _token(email="a")
+    expired = cache.get_credentials(POD, "site", token)["token"]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        tokens = {c["token"] for c in pool.map(
+            lambda _: cache.get_credentials(POD, "site", token, force_refresh=True, stale_token=expired), range(4)
+        )}
+
+    assert tokens == {"rest-2"}
+    assert signins.signouts == ["rest-1"]
@@ -0,0 +1,59 @@
+import random
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from utils.retry import HostRateLimiter, RetryPolicy, TokenBucket
+
+
+@pytest.mark.parametrize("method, headers, expected", [
+    ("GET", None, True),
+    ("delete", None, True),
+    ("POST", None, False),
+    ("PATCH", {}, False),
+    ("POST", {"idempotency-key": "abc"}, True),
+])
+def test_only_idempotent_requests_are_retried(method, headers, expected):
+    assert RetryPolicy().can_retry(method, headers) is expected
+
+
+def test_retry_statuses_and_budget():
+    policy = RetryPolicy(max_retries=2)
+
+    assert policy.should_retry(0, 503)
+    assert policy.should_retry(1, 429)
+    assert not policy.should_retry(2, 503)
+    assert not policy.should_retry(0, 404)
+
+
+def test_backoff_uses_full_jitter_under_the_cap(monkeypatch):
+    monkeypatch.setattr(random, "uniform", lambda low, high: high)
+    policy = RetryPolicy(base_delay=0.5, max_delay=3)
+
+    assert [policy.delay(attempt) for attempt in range(5)] == [0.5, 1.0, 2.0, 3, 3]
+
+
+def test_retry_after_header_wins_and_is_capped():
+    policy = RetryPolicy(max_delay=10)
+    in_five_seconds = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=5), usegmt=True)
+
+    assert policy.delay(0, "2") == 2.0
+    assert policy.delay(0, "120") == 10
+    assert 3 <= policy.delay(0, in_five_seconds) <= 5
+    assert 0 <= policy.delay(0, "not a date") <= 0.5
+
+
+def test_token_bucket_allows_a_burst_then_paces():
+    bucket = TokenBucket(rate=10, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert TokenBucket(rate=0).reserve() == 0.0
+
+
+def test_rate_limiter_keeps_one_bucket_per_host():
+    limiter = HostRateLimiter(rate=5, burst=1)
+
+    assert limiter.bucket("https://a") is limiter.bucket("https://a")
+    assert limiter.bucket("https://a") is not limiter.bucket("https://b")
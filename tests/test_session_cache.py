@@ -0,0 +1,141 @@
+import asyncio
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from auth.cloud_manager_auth import SessionCache
+
+cloud_manager_auth = importlib.import_module("auth.cloud_manager_auth")
+
+LOGIN_URL = "https://cm.example.com/api/v1/pat/login"
+
+
+class _Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+@pytest.fixture
+def logins(monkeypatch):
+    """Replace the PAT login with a counter; returns the list of (url, secret) logins made."""
+    calls = []
+    lock = threading.Lock()
+
+    def login(login_url, pat_secret):
+        time.sleep(0.01)
+        with lock:
+            calls.append((login_url, pat_secret))
+            return f"session-{len(calls)}"
+
+    async def login_async(login_url, pat_secret):
+        return login(login_url, pat_secret)
+
+    monkeypatch.setattr(cloud_manager_auth, "_pat_login", login)
+    monkeypatch.setattr(cloud_manager_auth, "_pat_login_async", login_async)
+    return calls
+
+
+def test_session_is_reused_per_pat(logins):
+    cache = SessionCache(ttl_seconds=600)
+
+    assert cache.get_session_token(LOGIN_URL, "pat-a") == "session-1"
+    assert cache.get_session_token(LOGIN_URL, "pat-a") == "session-1"
+    assert cache.get_session_token(LOGIN_URL, "pat-b") == "session-2"
+    assert cache.stats() == {"sessions": 2, "logins": 2, "hits": 1}
+    assert all("pat-a" not in str(key) for key in cache._entries)
+
+
+def test_concurrent_callers_share_one_login(logins):
+    cache = SessionCache(ttl_seconds=600)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        tokens = list(pool.map(lambda _: cache.get_session_token(LOGIN_URL, "pat"), range(16)))
+
+    assert set(tokens) == {"session-1"}
+    assert len(logins) == 1
+
+
+def test_old_session_is_renewed(logins, monkeypatch):
+    cache = SessionCache(ttl_seconds=100, renew_fraction=0.5)
+    cache.get_session_token(LOGIN_URL, "pat")
+
+    later = time.time() + 60
+    monkeypatch.setattr(cloud_manager_auth, "time", type("Clock", (), {"time": staticmethod(lambda: later)}))
+
+    assert cache.get_session_token(LOGIN_URL, "pat") == "session-2"
+
+
+def test_401_relogs_in_and_retries_once(logins):
+    cache = SessionCache(ttl_seconds=600)
+    seen = []
+
+    def send(session_token):
+        seen.append(session_token)
+        return _Response(401)
+
+    response, session_token = cache.request_with_session(LOGIN_URL, "pat", send)
+
+    assert response.status_code == 401
+    assert seen == ["session-1", "session-2"]
+    assert session_token == "session-2"
+
+
+def test_async_path_shares_the_cache(logins):
+    cache = SessionCache(ttl_seconds=600)
+    cache.get_session_token(LOGIN_URL, "pat")
+    attempts = iter([401, 200])
+
+    async def send(session_token):
+        return _Response(next(attempts))
+
+    response, session_token = asyncio.run(cache.request_with_session_async(LOGIN_URL, "pat", send))
+
+    assert response.status_code == 200
+    assert session_token == "session-2"
+    assert len(logins) == 2
+
+
+def test_event_loops_and_threads_share_one_login(monkeypatch):
+    calls = []
+
+    async def slow_login_async(login_url, pat_secret):
+        await asyncio.sleep(0.05)
+        calls.append("async")
+        return f"session-{len(calls)}"
+
+    def slow_login(login_url, pat_secret):
+        time.sleep(0.05)
+        calls.append("sync")
+        return f"session-{len(calls)}"
+
+    monkeypatch.setattr(cloud_manager_auth, "_pat_login_async", slow_login_async)
+    monkeypatch.setattr(cloud_manager_auth, "_pat_login", slow_login)
+    cache = SessionCache(ttl_seconds=600)
+
+    async def many():
+        return await asyncio.gather(*(cache.get_session_token_async(LOGIN_URL, "pat") for _ in range(4)))
+
+    # Several loops contend for the same key at once, alongside plain threads
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        loop_results = [pool.submit(asyncio.run, many()) for _ in range(3)]
+        sync_results = [pool.submit(cache.get_session_token, LOGIN_URL, "pat") for _ in range(3)]
+        tokens = {t for f in loop_results for t in f.result()} | {f.result() for f in sync_results}
+
+    assert tokens == {"session-1"}
+    assert len(calls) == 1
+
+
+def test_concurrent_401s_replace_the_session_once(logins):
+    cache = SessionCache(ttl_seconds=600)
+    expired = cache.get_session_token(LOGIN_URL, "pat")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        tokens = list(pool.map(
+            lambda _: cache.get_session_token(LOGIN_URL, "pat", force_refresh=True, stale_token=expired), range(4)
+        ))
+
+    assert set(tokens) == {"session-2"}
+    assert len(logins) == 2
@@ -0,0 +1,89 @@
+import importlib
+from concurrent.futures import Future
+
+import jwt
+
+from auth.token_pool import TokenPool
+
+token_pool_module = importlib.import_module("auth.token_pool")
+
+
+class _Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+class _InlineExecutor:
+    """Runs the job before submit() returns, so the refresh future is already done."""
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+def _get(pool, expiration=10, username="user@example.com", scopes=("tableau:content:read",)):
+    return pool.get_token("iss", expiration, "tenant", username, list(scopes))
+
+
+def test_second_request_is_served_from_the_pool(make_keys):
+    make_keys()
+    pool = TokenPool()
+
+    first = _get(pool)
+    assert _get(pool, scopes=("tableau:content:read",)) == first
+    assert pool.stats()["hits"] == 1
+    assert pool.stats()["misses"] == 1
+
+
+def test_expiration_is_part_of_the_key(make_keys):
+    make_keys()
+    pool = TokenPool()
+
+    long_lived = _get(pool, expiration=10)
+    short_lived = _get(pool, expiration=1)
+
+    assert short_lived != long_lived
+    claims = jwt.decode(short_lived, options={"verify_signature": False})
+    assert claims["exp"] - claims["iat"] == 60
+
+
+def test_token_is_refreshed_after_refresh_fraction(make_keys, monkeypatch):
+    make_keys()
+    clock = _Clock()
+    monkeypatch.setattr(token_pool_module, "time", clock)
+    pool = TokenPool(refresh_fraction=0.5)
+    pool._executor = _InlineExecutor()
+
+    first = _get(pool, expiration=10)
+    clock.now += 6 * 60
+    # Still valid, so the old token is returned while the replacement is minted
+    assert _get(pool, expiration=10) == first
+    assert pool.stats()["refreshes"] == 1
+
+    assert _get(pool, expiration=10) != first
+
+
+def test_rotated_signing_key_forces_a_new_token(make_keys):
+    make_keys()
+    pool = TokenPool()
+    first = _get(pool)
+
+    make_keys()
+    assert _get(pool) != first
+    assert pool.stats()["misses"] == 2
+
+
+def test_least_recently_used_entry_is_evicted(make_keys):
+    make_keys()
+    pool = TokenPool(max_size=2)
+    _get(pool, username="a")
+    _get(pool, username="b")
+    _get(pool, username="a")
+    _get(pool, username="c")
+
+    assert pool.stats()["evictions"] == 1
+    _get(pool, username="a")
+    assert pool.stats()["misses"] == 3
@@ -0,0 +1,58 @@
+import calendar
+import importlib
+import uuid
+from datetime import datetime
+
+import jwt
+
+from auth.jwt_builder import TokenTemplate, build_jwt
+from auth.key_cache import load_signing_key
+
+jwt_builder = importlib.import_module("auth.jwt_builder")
+
+ISSUED = datetime(2026, 1, 1, 12, 0, 0)
+JTI = "0b6f8c2e-3f0a-4d55-9c43-2a1f4b7e9d10"
+
+
+class _FrozenDatetime(datetime):
+    @classmethod
+    def utcnow(cls):
+        return ISSUED
+
+
+def _frozen_build_jwt(monkeypatch, *args):
+    monkeypatch.setattr(jwt_builder, "datetime", _FrozenDatetime)
+    monkeypatch.setattr(jwt_builder.uuid, "uuid4", lambda: uuid.UUID(JTI))
+    return build_jwt(*args)
+
+
+def test_template_matches_build_jwt_byte_for_byte(make_keys, monkeypatch):
+    make_keys()
+    args = ("issuer-id", 10, "tenant-id", "user@example.com", ["tableau:content:read", "tableau:views:embed"])
+
+    expected = _frozen_build_jwt(monkeypatch, *args)
+    minted = TokenTemplate(*args).mint(now=calendar.timegm(ISSUED.utctimetuple()), jti=JTI)
+
+    assert minted == expected
+
+
+def test_template_tokens_verify_and_get_fresh_jti(make_keys):
+    make_keys()
+    template = TokenTemplate("iss", 5, "tenant", "user", ["tableau:content:read"])
+
+    first, second = template.mint(), template.mint()
+    public_key = load_signing_key().public_key()
+    claims = jwt.decode(first, public_key, algorithms=["RS256"])
+
+    assert claims["exp"] - claims["iat"] == 300
+    assert claims["email"] == "user"
+    assert claims["jti"] != jwt.decode(second, public_key, algorithms=["RS256"])["jti"]
+
+
+def test_template_picks_up_a_rotated_key(make_keys):
+    make_keys()
+    template = TokenTemplate("iss", 5, "tenant", "user", [])
+    old_kid = jwt.get_unverified_header(template.mint())["kid"]
+
+    make_keys()
+    assert jwt.get_unverified_header(template.mint())["kid"] != old_kid
@@ -0,0 +1,149 @@
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+
+import pytest
+
+from utils.retry import RetryPolicy
+from utils.transport import AsyncTransport, Transport
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    statuses = []  # statuses to answer with, in order; then 200
+
+    def do_GET(self):
+        status = self.statuses.pop(0) if self.statuses else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    do_POST = do_GET
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    """HTTP/1.1 server on a free port; set server.statuses to script the responses."""
+    handler = type("Handler", (_Handler,), {"statuses": []})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/"
+    server.statuses = handler.statuses
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _settings_in_fresh_tree(tmp_path, dotenv, expression):
+    """
+    Copy the app into tmp_path with the given .env, import auth.cloud_manager_auth
+    in a new interpreter (as app.py does) and return repr(eval(expression)).
+    """
+    tree = tmp_path / "tree"
+    shutil.copytree(ROOT, tree, ignore=shutil.ignore_patterns(".git", ".env", "keys", "tests", "__pycache__", "*.db"))
+    (tree / ".env").write_text(dotenv)
+    env = {name: value for name, value in os.environ.items() if not name.startswith("HTTP_")}
+    code = f"import auth.cloud_manager_auth\nfrom utils import transport as t\nprint(repr({expression}))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=tree, env=env, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def test_pool_and_timeouts_come_from_dotenv(tmp_path):
+    dotenv = "HTTP_POOL_MAXSIZE=3\nHTTP_CONNECT_TIMEOUT=2\nHTTP_READ_TIMEOUT=9\n"
+
+    settings = _settings_in_fresh_tree(
+        tmp_path, dotenv, "(t.transport.pool_maxsize, t.transport.timeout, t.async_transport.pool_maxsize)"
+    )
+
+    assert settings == "(3, (2.0, 9.0), 3)"
+
+
+def test_requests_to_one_host_reuse_a_connection(local_server):
+    client = Transport(pool_maxsize=2, retry_policy=RetryPolicy(max_retries=0))
+
+    for _ in range(5):
+        assert client.get(local_server.url).status_code == 200
+
+    host_metrics = client.metrics()[local_server.url.rstrip("/")]
+    client.close()
+    assert host_metrics["requests"] == 5
+    assert host_metrics["connections_opened"] == 1
+    assert host_metrics["connections_reused"] == 4
+
+
+def test_async_client_is_replaced_and_closed_when_the_loop_changes(local_server):
+    client = AsyncTransport(retry_policy=RetryPolicy(max_retries=0))
+
+    async def fetch():
+        response = await client.get(local_server.url)
+        return response.status_code, client.client()
+
+    first_loop = asyncio.new_event_loop()
+    try:
+        status, first_client = first_loop.run_until_complete(fetch())
+        assert status == 200
+
+        status, second_client = asyncio.run(fetch())
+        assert status == 200
+        assert second_client is not first_client
+        assert first_client.is_closed
+    finally:
+        first_loop.close()
+
+
+def test_concurrent_loops_each_keep_their_client(local_server):
+    client = AsyncTransport(retry_policy=RetryPolicy(max_retries=0))
+    background = asyncio.new_event_loop()
+    Thread(target=background.run_forever, daemon=True).start()
+    try:
+        async def fetch():
+            await client.get(local_server.url)
+            return client.client()
+
+        background_client = asyncio.run_coroutine_threadsafe(fetch(), background).result(timeout=5)
+        asyncio.run(fetch())
+
+        assert not background_client.is_closed
+        assert asyncio.run_coroutine_threadsafe(fetch(), background).result(timeout=5) is background_client
+    finally:
+        background.call_soon_threadsafe(background.stop)
+
+
+def test_retry_and_rate_limit_settings_come_from_dotenv(tmp_path):
+    dotenv = "HTTP_MAX_RETRIES=7\nHTTP_BACKOFF_BASE=0.25\nHTTP_BACKOFF_MAX=4\nHTTP_RATE_LIMIT=2.5\nHTTP_RATE_BURST=6\n"
+
+    settings = _settings_in_fresh_tree(tmp_path, dotenv, (
+        "(t.retry_policy.max_retries, t.retry_policy.base_delay, t.retry_policy.max_delay,"
+        " t.rate_limiter.rate, t.rate_limiter.burst, t.async_transport.retry_policy is t.retry_policy)"
+    ))
+
+    assert settings == "(7, 0.25, 4.0, 2.5, 6, True)"
+
+
+def test_idempotent_request_is_retried_after_5xx(local_server, monkeypatch):
+    monkeypatch.setattr("utils.transport.time.sleep", lambda seconds: None)
+    local_server.statuses.extend([503, 502])
+    client = Transport(retry_policy=RetryPolicy(max_retries=3))
+
+    assert client.get(local_server.url).status_code == 200
+    assert client.metrics()[local_server.url.rstrip("/")]["retries"] == 2
+    client.close()
+
+
+def test_post_without_idempotency_key_is_not_retried(local_server):
+    local_server.statuses.append(503)
+    client = Transport(retry_policy=RetryPolicy(max_retries=3))
+
+    assert client.post(local_server.url).status_code == 503
+    client.close()
@@ -0,0 +1,105 @@
+import importlib
+import json
+import types
+
+import pytest
+import requests
+
+from auth.cloud_manager_auth import SessionCache
+from auth.uat_config import build_uat_config_body, diff_uat_config, upsert_uat_config_body
+
+uat_config = importlib.import_module("auth.uat_config")
+uat_provisioning = importlib.import_module("auth.uat_provisioning")
+cloud_manager_auth = importlib.import_module("auth.cloud_manager_auth")
+
+URL = "https://cm.example.com/api/v1/tenants/t/uat-configs"
+PEM = "-----BEGIN PUBLIC KEY-----\nMFkwEwYH\nKoZIzj0C\n-----END PUBLIC KEY-----\n"
+
+
+class _Response:
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self.text = json.dumps(data or {})
+        self._data = data or {}
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error", response=self)
+
+
+class _CloudManager:
+    """Fake uat-configs endpoint: answers 401 to expired sessions, records writes."""
+    def __init__(self, valid_sessions):
+        self.valid_sessions = valid_sessions
+        self.calls = []
+
+    def _send(self, method, url, json=None, headers=None, **kwargs):
+        self.calls.append((method, url, json))
+        if headers["x-tableau-session-token"] not in self.valid_sessions:
+            return _Response(401)
+        return _Response(201 if method == "POST" else 200, {"id": {"configId": "new-id"}})
+
+    def post(self, url, **kwargs):
+        return self._send("POST", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self._send("PATCH", url, **kwargs)
+
+
+def _body(**overrides):
+    body = build_uat_config_body(PEM, ["tableau:content:read"], "cfg", ["site-luid"], issuer="iss")
+    return {**body, **overrides}
+
+
+def _existing(**overrides):
+    return {**_body(), "id": {"configId": "cfg-1"}, **overrides}
+
+
+def test_diff_ignores_order_and_pem_wrapping():
+    existing = _existing(scopes=["b", "a"], publicKey=PEM.replace("\n", "\r\n"))
+
+    assert diff_uat_config(existing, _body(scopes=["a", "b"])) == {}
+    assert diff_uat_config(existing, _body(scopes=["a"], enabled=False)) == {
+        "scopes": {"current": ["b", "a"], "desired": ["a"]},
+        "enabled": {"current": True, "desired": False},
+    }
+
+
+@pytest.mark.parametrize("existing, action, method", [
+    ([], "created", "POST"),
+    ([_existing()], "unchanged", None),
+    ([_existing(scopes=["tableau:views:embed"])], "updated", "PATCH"),
+])
+def test_upsert_writes_only_what_changed(monkeypatch, existing, action, method):
+    cloud_manager = _CloudManager({"session"})
+    monkeypatch.setattr(uat_config, "transport", cloud_manager)
+
+    success, data = upsert_uat_config_body("session", _body(), existing, url=URL)
+
+    assert success
+    assert data["action"] == action
+    assert [call[0] for call in cloud_manager.calls] == ([method] if method else [])
+    if method == "PATCH":
+        assert cloud_manager.calls[0][1] == f"{URL}/cfg-1"
+        assert cloud_manager.calls[0][2] == {"scopes": ["tableau:content:read"]}
+
+
+def test_bulk_upsert_logs_in_again_after_a_401(monkeypatch):
+    logins = iter(["expired", "fresh"])
+    monkeypatch.setattr(cloud_manager_auth, "_pat_login", lambda url, secret: next(logins))
+    monkeypatch.setattr(uat_provisioning, "session_cache", SessionCache(ttl_seconds=600))
+    cloud_manager = _CloudManager({"fresh"})
+    monkeypatch.setattr(uat_config, "transport", cloud_manager)
+    existing = [_existing(scopes=["tableau:views:embed"])]
+
+    report = uat_provisioning._provision_one(
+        {"name": "cfg", "public_key": PEM, "scopes": ["tableau:content:read"], "resource_ids": ["site-luid"], "issuer": "iss"},
+        "pat", "https://cm.example.com/login", URL, existing
+    )
+
+    assert report["status"] == "updated"
+    assert report["changed_fields"] == ["scopes"]
+    assert [call[0] for call in cloud_manager.calls] == ["PATCH", "PATCH"]
@@ -0,0 +1,79 @@
+import time
+
+import jwt
+
+from auth.jwks import key_thumbprint
+from auth.jwt_builder import TENANT_ID_CLAIM, TokenTemplate, build_jwt
+from auth.keygen import generate_private_key, serialize_key_pair
+from auth.verifier import TokenVerifier
+
+
+def _external_token(private_key, kid, tenant="tenant"):
+    now = int(time.time())
+    claims = {"iss": "iss", "iat": now, "exp": now + 300, TENANT_ID_CLAIM: tenant, "email": "user"}
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+def test_token_from_the_local_key_is_valid(make_keys):
+    make_keys()
+    verifier = TokenVerifier()
+
+    valid, claims = verifier.verify(build_jwt("iss", 5, "tenant", "user", ["tableau:content:read"]),
+                                    issuer="iss", tenant_id="tenant")
+
+    assert valid
+    assert claims["email"] == "user"
+
+
+def test_wrong_tenant_and_issuer_are_rejected(make_keys):
+    make_keys()
+    verifier = TokenVerifier()
+    token = build_jwt("iss", 5, "tenant", "user", [])
+
+    assert verifier.verify(token, tenant_id="other") == (False, {"error": "Tenant ID does not match"})
+    valid, details = verifier.verify(token, issuer="other-issuer")
+    assert not valid and "issuer" in details["error"].lower()
+
+
+def test_expired_token_is_rejected(make_keys):
+    make_keys()
+    token = TokenTemplate("iss", 5, "tenant", "user", []).mint(now=time.time() - 3600)
+
+    valid, details = TokenVerifier().verify(token)
+
+    assert not valid
+    assert "expired" in details["error"].lower()
+
+
+def test_unknown_kid_is_rejected(make_keys):
+    make_keys()
+    outsider = generate_private_key()
+
+    valid, details = TokenVerifier().verify(_external_token(outsider, "not-a-known-kid"))
+
+    assert not valid
+    assert "not-a-known-kid" in details["error"]
+
+
+def test_key_from_a_uat_configuration_is_trusted(make_keys):
+    make_keys()
+    outsider = generate_private_key()
+    _, public_pem = serialize_key_pair(outsider)
+    token = _external_token(outsider, key_thumbprint(outsider.public_key()))
+    verifier = TokenVerifier()
+
+    assert not verifier.verify(token)[0]
+    assert verifier.load_uat_configs([{"publicKey": public_pem.decode()}, {"publicKey": "not a key"}, {}]) == 1
+    assert verifier.verify(token)[0]
+
+    verifier.clear()
+    assert not verifier.verify(token)[0]
+
+
+def test_verify_many_keeps_input_order(make_keys):
+    make_keys()
+    good = build_jwt("iss", 5, "tenant", "user", [])
+
+    results = TokenVerifier().verify_many([good, "garbage", good])
+
+    assert [valid for valid, _ in results] == [True, False, True]
@@ -1,80 +1,91 @@
 """Helper functions for the Tableau UAT Configuration Tool."""
 
-    
-def generate_config_summary(site_manager=None, tenant_manager=None, project_manager=None, 
-                           workbook_manager=None, datasource_manager=None, flow_manager=None):
-    """Generate a summary table of the current configuration"""
-    
-    # Collect all resources
-    all_resources = []
-    
-    # Add tenants from tenant manager
-    for tenant in tenant_manager.resources:
-        all_resources.append({
-            "type": "🏢 Tenant",
-            "identifier": "Tenant",
-            "luid": tenant['luid'],
-            "scope": tenant['scope']
-        })
-    
-    # Add sites
-    for site in site_manager.sites:
-        all_resources.append({
-            "type": "🌐 Site",
-            "identifier": site['site_id'],
-            "luid": site['site_luid'],
-            "scope": site['scope']
-        })
-    
-    # Add projects
-    for project in project_manager.resources:
-        all_resources.append({
-            "type": "📁 Project",
-            "identifier": "Project",
-            "luid": project['luid'],
-            "scope": project['scope']
-        })
-    
-    # Add workbooks
-    for workbook in workbook_manager.resources:
-        all_resources.append({
-            "type": "📊 Workbook",
-            "identifier": "Workbook",
-            "luid": workbook['luid'],
-            "scope": workbook['scope']
-        })
-    
-    # Add datasources
-    for datasource in datasource_manager.resources:
-        all_resources.append({
-            "type": "🗄️ Datasource",
-            "identifier": "Datasource",
-            "luid": datasource['luid'],
-            "scope": datasource['scope']
-        })
-    
-    # Add flows
-    for flow in flow_manager.resources:
-        all_resources.append({
-            "type": "🔄 Flow",
-            "identifier": "Flow",
-            "luid": flow['luid'],
-            "scope": flow['scope']
-        })
-    
-    if not all_resources:
+from html import escape
+
+from utils.rendering import RenderCache, page_note, page_of, row_fragment, stripe
+
+_summary_cache = RenderCache()
+
+
+@row_fragment
+def _summary_row(type_label, identifier, luid, scope, bg_color):
+    return f"""
+        <tr style='background: {bg_color}; transition: background 0.2s;' 
+            onmouseover="this.style.backgroundColor='#e7f1ff'" 
+            onmouseout="this.style.backgroundColor='{bg_color}'">
+            <td style='padding: 12px; border-bottom: 1px solid #e9ecef;'>
+                <strong>{type_label}</strong>
+            </td>
+            <td style='padding: 12px; border-bottom: 1px solid #e9ecef; color: #495057;'>
+                {escape(str(identifier))}
+            </td>
+            <td style='padding: 12px; border-bottom: 1px solid #e9ecef; font-family: monospace; font-size: 0.85em; color: #6c757d;'>
+                {escape(str(luid))}
+            </td>
+            <td style='padding: 12px; border-bottom: 1px solid #e9ecef;'>
+                <span style='background: #e7f1ff; padding: 4px 8px; border-radius: 4px; font-size: 0.85em; color: #0d6efd;'>
+                    {escape(str(scope))}
+                </span>
+            </td>
+        </tr>
+        """
+
+
+# Summary sections in display order: (type filter key, type label, identifier column; sites show their site ID)
+SUMMARY_TYPES = [
+    ("tenant", "🏢 Tenant", "Tenant"),
+    ("site", "🌐 Site", None),
+    ("project", "📁 Project", "Project"),
+    ("workbook", "📊 Workbook", "Workbook"),
+    ("datasource", "🗄️ Datasource", "Datasource"),
+    ("flow", "🔄 Flow", "Flow"),
+]
+
+
+class _SummaryRow:
+    __slots__ = ("type", "identifier", "luid", "scope")
+
+    def __init__(self, type_label, identifier, luid, scope):
+        self.type = type_label
+        self.identifier = identifier
+        self.luid = luid
+        self.scope = scope
+
+
+def _summary_records(managers, type_filter):
+    # managers are in SUMMARY_TYPES order; sites use their site ID as the identifier
+    for (key, label, identifier), manager in zip(SUMMARY_TYPES, managers):
+        if type_filter and key != type_filter:
+            continue
+        for record in manager.iter_records():
+            if key == "site":
+                yield _SummaryRow(label, record.site_id, record.site_luid, record.scope)
+            else:
+                yield _SummaryRow(label, identifier, record.luid, record.scope)
+
+
+def _render_config_summary(managers, page, page_size, query, type_filter):
+    total = sum(len(manager) for manager in managers)
+    if not total:
         return """
         <div style='padding: 20px; background: #f8f9fa; border-radius: 8px; border: 2px dashed #dee2e6; text-align: center;'>
             <em style='color: #6c757d;'>No resources configured yet. Add resources above to see the configuration summary.</em>
         </div>
-        """
+        """, 1
+    
+    in_type = sum(len(m) for (key, _, _), m in zip(SUMMARY_TYPES, managers) if not type_filter or key == type_filter)
+    rows, page, page_count, matching = page_of(
+        _summary_records(managers, type_filter), page, page_size, query, ("identifier", "luid", "scope"), count=in_type
+    )
+    note = page_note(rows, page, page_count, matching, total)
+    note_html = f"<div style='margin-top: 10px; color: #6c757d; font-size: 0.85em; text-align: right;'>{note}</div>" if note else ""
     
     # Create table
-    html = """
+    header = f"""
     <div style='padding: 15px; background: #f8f9fa; border-radius: 8px; border: 1px solid #dee2e6;'>
         <div style='display: flex; align-items: center; margin-bottom: 15px;'>
             <strong style='color: #0d6efd; font-size: 1.1em;'>📋 Configuration Summary</strong>
-            <span style='margin-left: auto; color: #6c757d; font-size: 0.9em;'>Total: """ + str(len(all_resources)) + """ resource(s)</span>
+            <span style='margin-left: auto; color: #6c757d; font-size: 0.9em;'>Total: {total} resource(s)</span>
         </div>
         <div style='overflow-x: auto;'>
             <table style='width: 100%; border-collapse: collapse; background: white; border-radius: 6px; overflow: hidden;'>
@@ -89,34 +100,45 @@ def generate_config_summary(site_manager=None, tenant_manager=None, project_mana
                 <tbody>
     """
     
-    for idx, res in enumerate(all_resources):
-        bg_color = '#ffffff' if idx % 2 == 0 else '#f8f9fa'
-        html += f"""
-        <tr style='background: {bg_color}; transition: background 0.2s;' 
-            onmouseover="this.style.backgroundColor='#e7f1ff'" 
-            onmouseout="this.style.backgroundColor='{bg_color}'">
-            <td style='padding: 12px; border-bottom: 1px solid #e9ecef;'>
-                <strong>{res['type']}</strong>
-            </td>
-            <td style='padding: 12px; border-bottom: 1px solid #e9ecef; color: #495057;'>
-                {res['identifier']}
-            </td>
-            <td style='padding: 12px; border-bottom: 1px solid #e9ecef; font-family: monospace; font-size: 0.85em; color: #6c757d;'>
-                {res['luid']}
-            </td>
-            <td style='padding: 12px; border-bottom: 1px solid #e9ecef;'>
-                <span style='background: #e7f1ff; padding: 4px 8px; border-radius: 4px; font-size: 0.85em; color: #0d6efd;'>
-                    {res['scope']}
-                </span>
-            </td>
-        </tr>
-        """
-    
-    html += """
+    footer = f"""
                 </tbody>
             </table>
-        </div>
+        </div>{note_html}
     </div>
     """
     
-    return html
\ No newline at end of file
+    rows_html = [
+        _summary_row(res.type, res.identifier, res.luid, res.scope, stripe(idx))
+        for idx, res in rows
+    ] or ["<tr><td colspan='4' style='padding: 12px; color: #6c757d; font-style: italic;'>No resources match this filter</td></tr>"]
+    return "".join([header, *rows_html, footer]), page
+
+
+def config_summary_page(site_manager=None, tenant_manager=None, project_manager=None, 
+                           workbook_manager=None, datasource_manager=None, flow_manager=None,
+                           page=1, page_size=None, query="", type_filter=None):
+    """
+    Render one page of the configuration summary.
+    query filters on identifier, LUID or scope; type_filter is one of the
+    SUMMARY_TYPES keys ("site", "project", ...) or None for all.
+    The table is rebuilt only when one of the managers' versions or the view
+    changed since the last call; otherwise the previous HTML is returned as is.
+    Returns a tuple: (html, page shown, clamped to the pages that exist)
+    """
+    managers = (tenant_manager, site_manager, project_manager, workbook_manager, datasource_manager, flow_manager)
+    query = (query or "").strip()
+    type_filter = type_filter if type_filter in {key for key, _, _ in SUMMARY_TYPES} else None
+    return _summary_cache.render(
+        (tuple((id(manager), manager.version) for manager in managers), page, page_size, query, type_filter),
+        lambda: _render_config_summary(managers, page, page_size, query, type_filter)
+    )
+
+
+def generate_config_summary(site_manager=None, tenant_manager=None, project_manager=None, 
+                           workbook_manager=None, datasource_manager=None, flow_manager=None,
+                           page=1, page_size=None, query="", type_filter=None):
+    """Generate a summary table of the current configuration (one page of it, see config_summary_page)"""
+    return config_summary_page(
+        site_manager, tenant_manager, project_manager, workbook_manager, datasource_manager, flow_manager,
+        page, page_size, query, type_filter
+    )[0]
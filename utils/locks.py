@@ -0,0 +1,56 @@
+"""Per-key locks shared by threads and coroutines."""
+
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+
+
+class KeyedLocks:
+    """
+    One threading.Lock per key, so a cache runs one login per key whether its
+    callers are threads or coroutines. Async callers first queue on an
+    asyncio.Lock of their own event loop (an asyncio.Lock only works on the
+    loop that first used it, so one is kept per running loop, like
+    AsyncTransport's clients), then take the same threading.Lock without
+    blocking the loop.
+    """
+    def __init__(self, poll_seconds=0.005):
+        self.poll_seconds = poll_seconds
+        self._locks = {}  # key -> threading.Lock
+        self._async_locks = {}  # event loop -> {key: asyncio.Lock}
+        self._lock = threading.Lock()
+
+    def lock(self, key):
+        """The threading.Lock for key (use as `with locks.lock(key):`)."""
+        with self._lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def _loop_lock(self, key):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            locks = self._async_locks.get(loop)
+            if locks is None:
+                # Locks of loops that have stopped can never be awaited again
+                for other in [other for other in self._async_locks if not other.is_running()]:
+                    del self._async_locks[other]
+                locks = self._async_locks[loop] = {}
+            lock = locks.get(key)
+            if lock is None:
+                lock = locks[key] = asyncio.Lock()
+            return lock
+
+    @asynccontextmanager
+    async def lock_async(self, key):
+        """Hold key's lock from a coroutine (use as `async with locks.lock_async(key):`)."""
+        thread_lock = self.lock(key)
+        async with self._loop_lock(key):
+            # Poll rather than wait in a worker thread, so a cancelled caller never leaves the lock held
+            while not thread_lock.acquire(blocking=False):
+                await asyncio.sleep(self.poll_seconds)
+            try:
+                yield
+            finally:
+                thread_lock.release()
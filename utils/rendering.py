@@ -0,0 +1,149 @@
+"""Memoised HTML rendering for the manager displays and the configuration summary."""
+
+import os
+import threading
+from functools import lru_cache
+from itertools import islice
+
+ROW_CACHE_SIZE = int(os.getenv("UI_ROW_CACHE_SIZE", "8192"))
+PAGE_SIZE = int(os.getenv("UI_PAGE_SIZE", "50"))
+
+
+def row_fragment(render_row):
+    """
+    Decorator for a pure function that renders one row's HTML from plain
+    values (LUID, scope, background colour, ...). Each distinct row is
+    rendered once and then served from an LRU cache of ROW_CACHE_SIZE entries.
+    """
+    return lru_cache(maxsize=ROW_CACHE_SIZE)(render_row)
+
+
+def stripe(idx):
+    """Alternating row background used by every table in the UI."""
+    return '#ffffff' if idx % 2 == 0 else '#f8f9fa'
+
+
+def page_of(records, page=1, page_size=None, query="", fields=(), count=None):
+    """
+    Filter records to those where query is a case-insensitive substring of
+    any of fields (attribute names), then cut out one page. The page number
+    is clamped to the pages that exist. Without a query the slice is taken
+    straight from the iterable, so only the visible page is touched (pass
+    count when records is a lazy iterator).
+    Returns a tuple: ([(absolute index, record), ...], page, page count, matching count)
+    """
+    page_size = max(1, int(page_size or PAGE_SIZE))
+    query = (query or "").strip().lower()
+    if query:
+        records = [r for r in records if any(query in str(getattr(r, f)).lower() for f in fields)]
+    matching = len(records) if query or count is None else count
+    page_count = max(1, -(-matching // page_size))
+    page = min(max(1, int(page or 1)), page_count)
+    start = (page - 1) * page_size
+    rows = list(enumerate(islice(records, start, start + page_size), start))
+    return rows, page, page_count, matching
+
+
+def page_note(rows, page, page_count, matching, total):
+    """'Showing 51–100 of 230 · Page 2 of 5' (plus 'matching, of N' when filtered); empty when everything fits."""
+    if page_count == 1 and matching == total:
+        return ""
+    shown = f"{rows[0][0] + 1}–{rows[-1][0] + 1}" if rows else "0"
+    filtered = f" matching (of {total})" if matching != total else ""
+    return f"Showing {shown} of {matching}{filtered} · Page {page} of {page_count}"
+
+
+def new_view(page_size=None):
+    """Page / page size / filter of one display for one session (kept in a gr.State)."""
+    return {"page": 1, "page_size": max(1, int(page_size or PAGE_SIZE)), "query": ""}
+
+
+class PagedView:
+    """
+    Paging and filtering for a manager display. Subclasses set _records (a
+    dict of slotted records in display order), _view_fields (the record
+    attributes the filter searches) and version, and call _init_view().
+    The page / page size / filter are not kept here: each session passes its
+    own view dict (see new_view), so sessions never move each other's pages.
+    Only the visible page is filtered out and rendered.
+    """
+    _view_fields = ()
+
+    def _init_view(self):
+        self._page_cache = (None, None)
+        self._page_cache_lock = threading.Lock()
+
+    def set_view(self, view, page=None, page_size=None, query=None):
+        """
+        Apply a page, page size or filter change to a session's view; a new
+        filter starts again at page 1.
+        Returns a tuple: (display, visible choices, the updated view with the page shown)
+        """
+        view = dict(view or new_view())
+        if query is not None and query.strip() != view["query"]:
+            view.update(query=query.strip(), page=1)
+        elif page is not None:
+            view["page"] = int(page)
+        if page_size:
+            view["page_size"] = max(1, int(page_size))
+        view = self.shown_view(view)
+        return self._view_display(view), self.get_visible_choices(view), view
+
+    def current_page(self, view=None):
+        """The page a view shows: ([(index, record), ...], page, page count, matching count)"""
+        view = view or new_view()
+        key = (self.version, view["page"], view["page_size"], view["query"])
+        with self._page_cache_lock:
+            if self._page_cache[0] == key:
+                return self._page_cache[1]
+        current = page_of(self._records.values(), view["page"], view["page_size"], view["query"], self._view_fields)
+        with self._page_cache_lock:
+            self._page_cache = (key, current)
+        return current
+
+    def shown_view(self, view=None):
+        """The view with its page clamped to the pages that exist (stay on the last page when rows go away)"""
+        view = view or new_view()
+        return {**view, "page": self.current_page(view)[1]}
+
+    def view_key(self, view=None):
+        """Cache key for the rendered page: data version plus the page actually shown."""
+        view = self.shown_view(view)
+        return (self.version, view["page"], view["page_size"], view["query"])
+
+    def iter_records(self):
+        """Every record in display order, without building dicts"""
+        return iter(self._records.values())
+
+    def get_visible_choices(self, view=None):
+        """Keys of the records on the view's page, for the delete selector"""
+        return [getattr(record, self._view_fields[0]) for _, record in self.current_page(view)[0]]
+
+
+class RenderCache:
+    """
+    The last HTML rendered for one view, keyed by the version counters of the
+    managers it was built from. render() only calls build when a version
+    changed; otherwise the previous HTML is returned without walking any rows.
+    """
+    def __init__(self):
+        self._key = None
+        self._html = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.renders = 0
+
+    def render(self, key, build):
+        with self._lock:
+            if self._html is not None and key == self._key:
+                self.hits += 1
+                return self._html
+        html = build()
+        with self._lock:
+            self._key, self._html = key, html
+            self.renders += 1
+        return html
+
+    def stats(self):
+        """Return counters for monitoring."""
+        return {"hits": self.hits, "renders": self.renders}
@@ -0,0 +1,115 @@
+"""Retry/backoff policy and per-host rate limiting for outbound HTTP calls."""
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+def _retry_after_seconds(value):
+    """Parse a Retry-After header (delta-seconds or HTTP-date). Returns None if unusable."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is retried and how long to wait first.
+
+    Only idempotent methods are retried, plus any request that carries an
+    Idempotency-Key header (so the server can de-duplicate a replayed POST).
+    Waits use exponential backoff with full jitter, and a Retry-After header
+    on the response takes precedence (capped at max_delay).
+    """
+    def __init__(self, max_retries=3, base_delay=0.5, max_delay=30.0, retry_statuses=RETRY_STATUSES):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def can_retry(self, method, headers=None):
+        """True if a request with this method/headers is safe to send again."""
+        if method.upper() in IDEMPOTENT_METHODS:
+            return True
+        return any(name.lower() == IDEMPOTENCY_HEADER.lower() for name in (headers or {}))
+
+    def should_retry(self, attempt, status_code):
+        """True if attempt (0-based) may be followed by another one for this status."""
+        return attempt < self.max_retries and status_code in self.retry_statuses
+
+    def delay(self, attempt, retry_after=None):
+        """Seconds to wait before retry number attempt + 1."""
+        server_delay = _retry_after_seconds(retry_after)
+        if server_delay is not None:
+            return min(server_delay, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class TokenBucket:
+    """
+    Classic token bucket: rate tokens per second, up to burst banked.
+    reserve() takes a token and returns how long the caller must wait for it,
+    so the sleep happens outside the lock (time.sleep or asyncio.sleep).
+    A rate of 0 disables limiting.
+    """
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until a token is available. Returns the seconds waited."""
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self):
+        """Await until a token is available. Returns the seconds waited."""
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """One TokenBucket per scheme+host, created on first use."""
+    def __init__(self, rate=10.0, burst=20):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host):
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return bucket
@@ -0,0 +1,294 @@
+"""Shared HTTP transport with per-host keep-alive connection pools."""
+
+import asyncio
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from utils.retry import HostRateLimiter, RetryPolicy
+
+
+class Transport:
+    """
+    Owns one requests.Session (and so one urllib3 connection pool) per
+    scheme+host, so repeated calls to cloudmanager.tableau.com or the pod
+    reuse open TCP/TLS connections instead of handshaking every time.
+    Every request gets a default timeout unless the caller passes one.
+
+    Requests pass through the host's token bucket (when a rate_limiter is
+    set) and are retried per retry_policy on 429/5xx or connection errors.
+    """
+    def __init__(self, pool_maxsize=10, timeout=(5, 30), retry_policy=None, rate_limiter=None):
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self._sessions = {}
+        self._requests = {}
+        self._retries = {}
+        self._throttled = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host(url):
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _count(self, counters, host, amount=1):
+        with self._lock:
+            counters[host] = counters.get(host, 0) + amount
+
+    def session_for(self, url):
+        """Return the pooled session for url's host, creating it on first use."""
+        host = self._host(url)
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+                self._requests[host] = 0
+            self._requests[host] += 1
+        return session
+
+    def request(self, method, url, **kwargs):
+        """Same arguments as requests.request, sent over the host's pooled session."""
+        kwargs.setdefault("timeout", self.timeout)
+        host = self._host(url)
+        policy = self.retry_policy
+        retryable = policy.can_retry(method, kwargs.get("headers"))
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                waited = self.rate_limiter.bucket(host).acquire()
+                if waited:
+                    self._count(self._throttled, host, waited)
+            try:
+                response = self.session_for(url).request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if not retryable or attempt >= policy.max_retries:
+                    raise
+                delay = policy.delay(attempt)
+            else:
+                if not retryable or not policy.should_retry(attempt, response.status_code):
+                    return response
+                delay = policy.delay(attempt, response.headers.get("Retry-After"))
+                response.close()
+            self._count(self._retries, host)
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def metrics(self):
+        """Per-host request and connection counts; reused = requests served without a new connection."""
+        with self._lock:
+            sessions = dict(self._sessions)
+            request_counts = dict(self._requests)
+            retries = dict(self._retries)
+            throttled = dict(self._throttled)
+
+        metrics = {}
+        for host, session in sessions.items():
+            connections = 0
+            for adapter in {id(a): a for a in session.adapters.values()}.values():
+                pools = adapter.poolmanager.pools
+                for key in list(pools.keys()):
+                    pool = pools.get(key)
+                    if pool is not None:
+                        connections += pool.num_connections
+            requests_sent = request_counts.get(host, 0)
+            metrics[host] = {
+                "requests": requests_sent,
+                "connections_opened": connections,
+                "connections_reused": max(0, requests_sent - connections),
+                "reuse_ratio": round(1 - connections / requests_sent, 3) if requests_sent else 0.0,
+                "retries": retries.get(host, 0),
+                "throttled_seconds": round(throttled.get(host, 0.0), 3),
+            }
+        return metrics
+
+    def close(self):
+        """Close every pooled connection."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            session.close()
+
+
+class AsyncTransport:
+    """
+    Asyncio counterpart of Transport: an httpx.AsyncClient with a bounded
+    keep-alive pool, shared by every async Cloud Manager / Tableau call. An
+    AsyncClient only works on the event loop that opened it, so one is created
+    lazily per running loop; when a call arrives on a new loop, clients of
+    loops that have stopped are closed (or dropped if the loop is already
+    closed). Retries and rate limiting follow the same policy objects as Transport.
+    """
+    def __init__(self, pool_maxsize=10, timeout=(5, 30), retry_policy=None, rate_limiter=None):
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self._clients = {}  # event loop -> AsyncClient
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+        self._throttled = 0.0
+
+    def _new_client(self):
+        connect_timeout, read_timeout = self.timeout
+        return httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.pool_maxsize * 4,
+                                max_keepalive_connections=self.pool_maxsize),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        )
+
+    @staticmethod
+    def _retire(loop, client):
+        """
+        Close a client whose loop has stopped. It can only be closed on its own
+        loop, so that loop is run once more on a helper thread (this thread is
+        already running the new one). A client whose loop was closed first can
+        no longer be shut down cleanly and is just dropped.
+        """
+        if loop.is_closed():
+            return
+        closer = threading.Thread(target=loop.run_until_complete, args=(client.aclose(),), name="async-transport-close")
+        closer.start()
+        closer.join(timeout=5)
+
+    def client(self):
+        """Return the AsyncClient for the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is not None:
+                return client
+            stale = [(other, c) for other, c in self._clients.items() if not other.is_running()]
+            for other, _ in stale:
+                del self._clients[other]
+            client = self._clients[loop] = self._new_client()
+        for other, old_client in stale:
+            self._retire(other, old_client)
+        return client
+
+    async def request(self, method, url, **kwargs):
+        """Same arguments as httpx.AsyncClient.request."""
+        host = Transport._host(url)
+        policy = self.retry_policy
+        retryable = policy.can_retry(method, kwargs.get("headers"))
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self._throttled += await self.rate_limiter.bucket(host).acquire_async()
+            self._requests += 1
+            try:
+                response = await self.client().request(method, url, **kwargs)
+            except httpx.TransportError:
+                if not retryable or attempt >= policy.max_retries:
+                    raise
+                delay = policy.delay(attempt)
+            else:
+                if not retryable or not policy.should_retry(attempt, response.status_code):
+                    return response
+                delay = policy.delay(attempt, response.headers.get("Retry-After"))
+                await response.aclose()
+            self._retries += 1
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url, **kwargs):
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url, **kwargs):
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url, **kwargs):
+        return await self.request("DELETE", url, **kwargs)
+
+    def metrics(self):
+        """Request count and the connections currently held by the clients' pools."""
+        with self._lock:
+            clients = list(self._clients.values())
+        connections = 0
+        for client in clients:
+            pool = getattr(getattr(client, "_transport", None), "_pool", None)
+            connections += len(getattr(pool, "connections", []) or [])
+        return {
+            "requests": self._requests,
+            "open_connections": connections,
+            "pool_maxsize": self.pool_maxsize,
+            "retries": self._retries,
+            "throttled_seconds": round(self._throttled, 3),
+        }
+
+    async def aclose(self):
+        """Close the running loop's client and its pooled connections."""
+        with self._lock:
+            client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+# The settings below are read at import, which can come before the importing module's own load_dotenv
+load_dotenv(override=True)
+
+# One policy and one set of per-host buckets, shared by the sync and async clients
+retry_policy = RetryPolicy(
+    max_retries=int(os.getenv("HTTP_MAX_RETRIES", "3")),
+    base_delay=float(os.getenv("HTTP_BACKOFF_BASE", "0.5")),
+    max_delay=float(os.getenv("HTTP_BACKOFF_MAX", "30"))
+)
+rate_limiter = HostRateLimiter(
+    rate=float(os.getenv("HTTP_RATE_LIMIT", "10")),
+    burst=int(os.getenv("HTTP_RATE_BURST", "20"))
+)
+
+transport = Transport(
+    pool_maxsize=int(os.getenv("HTTP_POOL_MAXSIZE", "10")),
+    timeout=(float(os.getenv("HTTP_CONNECT_TIMEOUT", "5")), float(os.getenv("HTTP_READ_TIMEOUT", "30"))),
+    retry_policy=retry_policy,
+    rate_limiter=rate_limiter
+)
+async_transport = AsyncTransport(
+    pool_maxsize=transport.pool_maxsize,
+    timeout=transport.timeout,
+    retry_policy=retry_policy,
+    rate_limiter=rate_limiter
+)
+
+get = transport.get
+post = transport.post
+put = transport.put
+patch = transport.patch
+delete = transport.delete
+request = transport.request
+metrics = transport.metrics